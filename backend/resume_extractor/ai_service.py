@@ -1,7 +1,15 @@
 import os
 import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 import google.generativeai as genai
 
+from resume_extractor.llm_cache import get_llm_cache, normalize_prompt
+from resume_extractor.provider_health import ProviderHealth, is_timeout
+from resume_extractor.llm_limits import SingleFlight, TokenBucket, backoff_delay
+from resume_extractor.prompt_budget import count_tokens
+
 # Try to import openai, handle missing dependency
 try:
     from openai import OpenAI
@@ -10,79 +18,494 @@ except ImportError:
     OPENAI_AVAILABLE = False
     print("[WARN] 'openai' package not found. OpenRouter/OpenAI fallback will not work. Run 'pip install openai'")
 
-def get_ai_client():
+try:
+    import httpx
+    HTTPX_AVAILABLE = True
+except ImportError:
+    HTTPX_AVAILABLE = False
+
+OPENROUTER_BASE_URL = "https://openrouter.ai/api/v1"
+PROVIDER_NAMES = ("openrouter", "openai", "gemini")
+SYSTEM_PROMPT = "You are a helpful AI assistant that extracts structured data from resumes."
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return int(os.getenv(name, default))
+    except ValueError:
+        return default
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return float(os.getenv(name, default))
+    except ValueError:
+        return default
+
+
+class ProviderRegistry:
     """
-    Determines which AI provider to use based on env vars.
-    Priority: OpenRouter > OpenAI > Gemini
+    Process-wide LLM clients, built once and shared by every thread.
+
+    OpenAI/OpenRouter clients get their own httpx.Client, so TLS sessions
+    and keep-alive connections survive across calls (both SDK clients are
+    thread-safe). Pool sizing comes from the environment:
+
+      AI_HTTP_MAX_CONNECTIONS   (default 20)  concurrent connections per provider
+      AI_HTTP_MAX_KEEPALIVE     (default 10)  idle connections kept open
+      AI_HTTP_TIMEOUT_S         (default 60)
+
+    Clients are keyed by (provider, api key, base url), so rotating a key
+    in the environment builds a fresh client on the next call.
+    OPENROUTER_BASE_URL / OPENAI_BASE_URL / GEMINI_BASE_URL point a
+    provider at another endpoint, e.g. scripts/stub_llm_server.py.
+
+    Every configured provider is a failover candidate (see candidates()),
+    each with its own ProviderHealth (latency history, circuit breaker) and
+    TokenBucket (request rate, see llm_limits.py). The SDK's own retries
+    are off: 429/5xx are retried here, within the call deadline, and other
+    failures fail over.
     """
-    openrouter_key = os.getenv("OPENROUTER_API_KEY")
-    openai_key = os.getenv("OPENAI_API_KEY")
-    gemini_key = os.getenv("GEMINI_API_KEY")
 
-    if openrouter_key and OPENAI_AVAILABLE:
-        print("[INFO] Using OpenRouter AI Provider")
-        return {
-            "type": "openrouter",
-            "client": OpenAI(
-                base_url="https://openrouter.ai/api/v1",
-                api_key=openrouter_key,
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self._providers = {}
+        self._gemini_models = {}
+        self.health = {name: ProviderHealth(name) for name in PROVIDER_NAMES}
+        self.limiters = {name: TokenBucket.from_env(name) for name in PROVIDER_NAMES}
+        self.stats = {"created": 0, "reused": 0}
+
+    def _http_client(self):
+        if not HTTPX_AVAILABLE:
+            return None  # SDK default client (still reused, default pool)
+        return httpx.Client(
+            limits=httpx.Limits(
+                max_connections=_env_int("AI_HTTP_MAX_CONNECTIONS", 20),
+                max_keepalive_connections=_env_int("AI_HTTP_MAX_KEEPALIVE", 10),
             ),
-            "model": "google/gemini-2.0-flash-001" # Or 'openai/gpt-4o-mini', customizable
-        }
-    
-    if openai_key and OPENAI_AVAILABLE:
-        print("[INFO] Using OpenAI Provider")
-        return {
-            "type": "openai",
-            "client": OpenAI(api_key=openai_key),
-            "model": "gpt-4o"
-        }
+            timeout=float(os.getenv("AI_HTTP_TIMEOUT_S", "60")),
+        )
+
+    def _resolve_all(self):
+        # Priority: OpenRouter > OpenAI > Gemini
+        openrouter_key = os.getenv("OPENROUTER_API_KEY")
+        openai_key = os.getenv("OPENAI_API_KEY")
+        gemini_key = os.getenv("GEMINI_API_KEY")
+
+        keys = []
+        if openrouter_key and OPENAI_AVAILABLE:
+            keys.append(("openrouter", openrouter_key, os.getenv("OPENROUTER_BASE_URL", OPENROUTER_BASE_URL)))
+        if openai_key and OPENAI_AVAILABLE:
+            # OpenAI() itself honours OPENAI_BASE_URL when base_url is None
+            keys.append(("openai", openai_key, os.getenv("OPENAI_BASE_URL")))
+        if gemini_key:
+            keys.append(("gemini", gemini_key, os.getenv("GEMINI_BASE_URL")))
+        return keys
+
+    def _create(self, p_type: str, api_key: str, base_url):
+        if p_type == "openrouter":
+            print("[INFO] Using OpenRouter AI Provider")
+            return {
+                "type": "openrouter",
+                "client": OpenAI(base_url=base_url, api_key=api_key, max_retries=0,
+                                 http_client=self._http_client()),
+                "model": "google/gemini-2.0-flash-001" # Or 'openai/gpt-4o-mini', customizable
+            }
+
+        if p_type == "openai":
+            print("[INFO] Using OpenAI Provider")
+            return {
+                "type": "openai",
+                "client": OpenAI(api_key=api_key, base_url=base_url, max_retries=0,
+                                 http_client=self._http_client()),
+                "model": "gpt-4o"
+            }
 
-    if gemini_key:
         print("[INFO] Using Google Gemini Provider")
-        genai.configure(api_key=gemini_key)
+        # genai.configure is process-global: only ever redo it on key change
+        if base_url:
+            # e.g. a local stand-in server: REST, since it speaks no gRPC
+            genai.configure(api_key=api_key, transport="rest",
+                            client_options={"api_endpoint": base_url})
+        else:
+            genai.configure(api_key=api_key)
         return {
             "type": "gemini",
             "client": genai,
             "model": "gemini-2.0-flash"
         }
 
-    return None
+    def get(self):
+        """
+        The highest-priority configured provider (None if no keys).
+        """
+        keys = self._resolve_all()
+        return self._get(keys[0]) if keys else None
+
+    def candidates(self):
+        """
+        Every configured provider, in failover order.
+        """
+        return [self._get(key) for key in self._resolve_all()]
+
+    def _get(self, key):
+        provider = self._providers.get(key)
+        if provider is None:
+            with self._lock:
+                provider = self._providers.get(key)
+                if provider is None:
+                    if key[0] == "gemini":
+                        # One genai configuration at a time
+                        self._drop_gemini()
+                    provider = self._create(*key)
+                    self._providers[key] = provider
+                    self.stats["created"] += 1
+                    return provider
+
+        with self._stats_lock:
+            self.stats["reused"] += 1
+        return provider
+
+    def gemini_model(self, model_name: str):
+        model = self._gemini_models.get(model_name)
+        if model is None:
+            with self._lock:
+                model = self._gemini_models.get(model_name)
+                if model is None:
+                    model = genai.GenerativeModel(model_name)
+                    self._gemini_models[model_name] = model
+        return model
+
+    def _drop_gemini(self):
+        for key in [k for k in self._providers if k[0] == "gemini"]:
+            del self._providers[key]
+        self._gemini_models.clear()
+
+    def health_stats(self):
+        return {
+            name: dict(h.stats(), rate_limit=self.limiters[name].stats())
+            for name, h in self.health.items()
+        }
+
+    def close(self):
+        """
+        Close pooled connections (app shutdown); clients rebuild on next use.
+        """
+        with self._lock:
+            for provider in self._providers.values():
+                close = getattr(provider["client"], "close", None)
+                if provider["type"] != "gemini" and close is not None:
+                    close()
+            self._providers.clear()
+            self._gemini_models.clear()
+
+
+registry = ProviderRegistry()
+
+
+def get_ai_client():
+    """
+    Determines which AI provider to use based on env vars.
+    Priority: OpenRouter > OpenAI > Gemini
+
+    Returns the shared, pooled client for it (see ProviderRegistry).
+    """
+    return registry.get()
+
+def _call_provider(provider, prompt: str, timeout_s: float) -> str:
+    p_type = provider["type"]
+    client = provider["client"]
+    model_name = provider["model"]
+
+    if p_type in ["openrouter", "openai"]:
+        response = client.chat.completions.create(
+            model=model_name,
+            messages=[
+                {"role": "system", "content": SYSTEM_PROMPT},
+                {"role": "user", "content": prompt}
+            ],
+            timeout=timeout_s
+        )
+        # Standard OpenAI response structure
+        return response.choices[0].message.content
+
+    # Gemini Native
+    model = registry.gemini_model(model_name)
+    response = model.generate_content(prompt, request_options={"timeout": timeout_s})
+    return response.text
+
+
+class _Throttled(Exception):
+    pass
+
+
+def _status_of(exc) -> int:
+    # openai.APIStatusError.status_code; google.api_core exceptions carry .code
+    status = getattr(exc, "status_code", None)
+    if status is None and isinstance(getattr(exc, "code", None), int):
+        status = exc.code
+    return status
+
+
+def _retry_after_s(exc):
+    headers = getattr(getattr(exc, "response", None), "headers", None)
+    try:
+        return float(headers.get("retry-after")) if headers is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+def _call_with_retries(provider, prompt: str, timeout_s: float):
+    """
+    One failover attempt, everything within timeout_s: wait for a rate
+    limit token, call, and retry 429/5xx with jittered exponential backoff
+    (AI_RETRY_MAX_ATTEMPTS requests at most, default 4).
 
-def generate_ai_content(prompt: str) -> str:
+    Returns (content, latency of the request that succeeded). Raises
+    _Throttled when rate limiting used up the budget, else the last error.
+    """
+    limiter = registry.limiters[provider["type"]]
+    end = time.monotonic() + timeout_s
+    max_attempts = _env_int("AI_RETRY_MAX_ATTEMPTS", 4)
+
+    for attempt in range(max_attempts):
+        if not limiter.acquire(end - time.monotonic()):
+            raise _Throttled("local rate limit: no request slot before the deadline")
+
+        t0 = time.monotonic()
+        try:
+            return _call_provider(provider, prompt, end - t0), time.monotonic() - t0
+        except Exception as e:
+            status = _status_of(e)
+            if status != 429 and (status is None or status < 500):
+                raise
+
+            delay = backoff_delay(attempt, _retry_after_s(e))
+            if status == 429:
+                limiter.pause(delay)    # every caller backs off, not just this one
+            if attempt + 1 == max_attempts or time.monotonic() + delay >= end:
+                if status == 429:
+                    raise _Throttled(f"HTTP 429 after {attempt + 1} attempt(s)") from e
+                raise
+            time.sleep(delay)
+
+
+def _failover_order(providers, deadline_s: float):
+    # Priority order, except a provider whose recent p90 would not even
+    # fit in the whole deadline goes last
+    def too_slow(p):
+        p90 = registry.health[p["type"]].p90_s()
+        return p90 is not None and p90 > deadline_s
+    return sorted(providers, key=too_slow)
+
+
+_inflight = SingleFlight()
+
+
+def generate_ai_content(prompt: str, use_cache: bool = True,
+                        deadline_s: float = None, validate=None) -> str:
     """
     Unified interface to generate text from any provider.
     Returns the raw string content (candidate for JSON parsing).
+
+    Responses are served from / saved to the LLM response cache (see
+    llm_cache.py) unless use_cache is False. validate (reply text → bool)
+    is the caller's parse check: a reply it rejects is still returned but
+    never cached, and a cached reply it rejects is dropped and refetched.
+
+    The whole call, failover included, finishes within deadline_s
+    (AI_CALL_DEADLINE_S, default 30). Configured providers are tried in
+    order: OpenRouter → OpenAI → Gemini. Providers with an open circuit
+    are skipped. Every attempt but the last is cut off early, based on the
+    provider's recent latency (see provider_health.py).
+
+    Requests go through the provider's rate limiter, and 429/5xx are
+    retried with backoff (see llm_limits.py). Identical prompts with the
+    same deadline in flight at the same time share one upstream call, so a
+    caller never waits past its own deadline. The first caller's validate
+    decides what is cached; the others get the same reply, and their own
+    validate applies the next time they read it from the cache.
     """
-    provider = get_ai_client()
+    if deadline_s is None:
+        deadline_s = _env_float("AI_CALL_DEADLINE_S", 30.0)
+    key = (normalize_prompt(prompt), use_cache, deadline_s)
+    return _inflight.do(key, lambda: _generate(prompt, use_cache, deadline_s, validate))
+
+
+def _generate(prompt: str, use_cache: bool, deadline_s: float, validate=None) -> str:
+    providers = registry.candidates()
     
-    if not provider:
+    if not providers:
         print("[ERROR] No AI API keys found (OpenRouter, OpenAI, or Gemini).")
         return None
 
-    try:
+    deadline = time.monotonic() + deadline_s
+    cache = get_llm_cache() if use_cache else None
+
+    ordered = _failover_order(providers, deadline_s)
+    attempted = False
+    for i, provider in enumerate(ordered):
         p_type = provider["type"]
-        client = provider["client"]
         model_name = provider["model"]
+        health = registry.health[p_type]
 
-        if p_type in ["openrouter", "openai"]:
-            response = client.chat.completions.create(
-                model=model_name,
-                messages=[
-                    {"role": "system", "content": "You are a helpful AI assistant that extracts structured data from resumes."},
-                    {"role": "user", "content": prompt}
-                ]
-            )
-            # Standard OpenAI response structure
-            content = response.choices[0].message.content
-            return content
-
-        elif p_type == "gemini":
-            # Gemini Native
-            model = client.GenerativeModel(model_name)
-            response = model.generate_content(prompt)
-            return response.text
-
-    except Exception as e:
-        print(f"[ERROR] AI Generation Failed ({p_type}): {e}")
+        if cache is not None:
+            # Cached answers are served even while the provider's circuit is open
+            cached = cache.get(p_type, model_name, prompt, SYSTEM_PROMPT)
+            if cached is not None and validate is not None and not validate(cached):
+                cache.invalidate(p_type, model_name, prompt, SYSTEM_PROMPT)
+                cached = None
+            if cached is not None:
+                return cached
+
+        # Deadline first: allow() may make this call the half-open probe,
+        # and a probe that never records would keep the circuit half open
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            print(f"[ERROR] AI Generation Failed: {deadline_s}s deadline exceeded")
+            return None
+
+        if not health.allow():
+            continue
+
+        fallback_left = any(registry.health[p["type"]].available() for p in ordered[i + 1:])
+        timeout_s = health.attempt_timeout(remaining, last_candidate=not fallback_left)
+        attempted = True
+        t0 = time.monotonic()
+        try:
+            content, latency_s = _call_with_retries(provider, prompt, timeout_s)
+        except _Throttled as e:
+            health.record(False, time.monotonic() - t0, throttled=True)
+            print(f"[ERROR] AI Generation Failed ({p_type}): {e}")
+            continue
+        except Exception as e:
+            timed_out = is_timeout(e)
+            health.record(False, time.monotonic() - t0, timed_out=timed_out)
+            reason = f"timed out after {timeout_s:.1f}s" if timed_out else str(e)
+            print(f"[ERROR] AI Generation Failed ({p_type}): {reason}")
+            continue
+
+        # Latency of the answering request (not rate-limit waits or retries)
+        health.record(True, latency_s)
+        if cache is not None and content and (validate is None or validate(content)):
+            cache.put(p_type, model_name, prompt, content, SYSTEM_PROMPT)
+        return content
+
+    if not attempted:
+        print("[ERROR] AI Generation Failed: circuit open for every configured provider")
+    return None
+
+
+# ---------------- BATCH MODE ----------------
+BATCH_ITEM_FRAMING_TOKENS = 8   # "### Item 12" header and separators
+
+
+def _pack_batches(costs, overhead: int, token_budget: int, max_items: int):
+    # Greedy, in order: start a new prompt when the next item would exceed
+    # the budget or the item cap. An item over budget on its own goes alone.
+    batches, current, used = [], [], overhead
+    for i, cost in enumerate(costs):
+        if current and (used + cost > token_budget or len(current) == max_items):
+            batches.append(current)
+            current, used = [], overhead
+        current.append(i)
+        used += cost
+    if current:
+        batches.append(current)
+    return batches
+
+
+def build_batch_prompt(instructions: str, snippets) -> str:
+    items = "\n".join(f"### Item {i}\n{snippet}\n" for i, snippet in enumerate(snippets))
+    return f"""
+    {instructions}
+
+    There are {len(snippets)} items, numbered 0 to {len(snippets) - 1}.
+
+{items}
+    Return ONLY valid JSON: one object keyed by item number ("0", "1", ...),
+    each value being the JSON object for that item.
+    """
+
+
+# generate_ai_batch slot whose prompt got no usable reply at all
+BATCH_FAILED = object()
+
+
+def parse_batch_response(response_text, count: int):
+    """
+    Demultiplex an indexed reply: [slot 0, ..., slot count-1], None for
+    every slot that is missing. The reply as a whole is unusable (empty,
+    not JSON, not an indexed object): None instead of a list.
+    """
+    if not response_text:
+        return None
+    text = response_text.replace("```json", "").replace("```", "").strip()
+    try:
+        data = json.loads(text)
+    except ValueError:
         return None
+
+    if isinstance(data, list) and len(data) == count:
+        data = {str(i): v for i, v in enumerate(data)}
+    if not isinstance(data, dict):
+        return None
+    return [data.get(str(i)) for i in range(count)]
+
+
+def generate_ai_batch(snippets, instructions: str, token_budget: int = None,
+                      max_items: int = None, use_cache: bool = True,
+                      validate_slot=None):
+    """
+    One task (instructions) applied to many inputs (snippets) with as few
+    requests as possible, for bulk runs where per-request overhead and
+    latency dominate.
+
+    Snippets are packed in order into prompts of at most token_budget
+    input tokens (AI_BATCH_TOKEN_BUDGET, default 6000, counted with
+    prompt_budget.count_tokens) and max_items items (AI_BATCH_MAX_ITEMS,
+    default 8). The model answers
+    with JSON keyed by item number, and the replies are split back out.
+    Prompts run concurrently, through generate_ai_content (cache, rate
+    limits, failover).
+
+    Returns the decoded JSON value for each snippet, in order; None for a
+    slot the reply did not contain, BATCH_FAILED for every slot of a
+    prompt that got no usable reply. Callers validate slots and retry bad
+    ones on their own. A reply is cached only when every slot is present
+    and passes validate_slot(snippet index, slot), when given.
+    """
+    if token_budget is None:
+        token_budget = _env_int("AI_BATCH_TOKEN_BUDGET", 6000)
+    if max_items is None:
+        max_items = _env_int("AI_BATCH_MAX_ITEMS", 8)
+
+    overhead = count_tokens(build_batch_prompt(instructions, []))
+    costs = [count_tokens(s) + BATCH_ITEM_FRAMING_TOKENS for s in snippets]
+    batches = _pack_batches(costs, overhead, token_budget, max(1, max_items))
+
+    def run(batch):
+        prompt = build_batch_prompt(instructions, [snippets[i] for i in batch])
+
+        def complete(text):
+            slots = parse_batch_response(text, len(batch))
+            return slots is not None and all(
+                slot is not None and (validate_slot is None or validate_slot(i, slot))
+                for i, slot in zip(batch, slots)
+            )
+
+        reply = generate_ai_content(prompt, use_cache=use_cache, validate=complete)
+        slots = parse_batch_response(reply, len(batch))
+        return [BATCH_FAILED] * len(batch) if slots is None else slots
+
+    results = [None] * len(snippets)
+    if not batches:
+        return results
+    workers = max(1, min(len(batches), _env_int("AI_BATCH_CONCURRENCY", 4)))
+    with ThreadPoolExecutor(max_workers=workers,
+                            thread_name_prefix="ai-batch") as pool:
+        for batch, slots in zip(batches, pool.map(run, batches)):
+            for i, slot in zip(batch, slots):
+                results[i] = slot
+    return results
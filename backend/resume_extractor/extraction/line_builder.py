@@ -1,5 +1,10 @@
-from typing import List, Dict
+from typing import List, Dict, Iterable, Iterator, Tuple
 from itertools import groupby
+from bisect import bisect_right
+
+import numpy as np
+
+from extraction.word_table import WordTable
 
 def build_lines(words: List[Dict], y_threshold: float = 3.0) -> List[Dict]:
     """
@@ -10,31 +15,55 @@ def build_lines(words: List[Dict], y_threshold: float = 3.0) -> List[Dict]:
     words.sort(key=lambda w: (w["page"], w["top"], w["x0"]))
 
     lines = []
-    line_id = 0
 
     for page, page_words in groupby(words, key=lambda w: w["page"]):
-        page_words = list(page_words)
-
-        current_line = []
-        current_top = None
-
-        for w in page_words:
-            if current_top is None:
-                current_top = w["top"]
-                current_line.append(w)
-                continue
-
-            if abs(w["top"] - current_top) <= y_threshold:
-                current_line.append(w)
-            else:
-                lines.append(_finalize_line(current_line, page, line_id))
-                line_id += 1
-                current_line = [w]
-                current_top = w["top"]
-
-        if current_line:
+        lines.extend(_group_page(list(page_words), page, len(lines), y_threshold))
+
+    return lines
+
+
+def iter_lines(pages: Iterable[Tuple[int, List[Dict]]],
+               y_threshold: float = 3.0) -> Iterator[Dict]:
+    """
+    Streaming variant of build_lines.
+
+    Consumes (page_num, words) pairs as produced by
+    extraction.pdf_digital.iter_pdf_pages and yields lines page by page.
+    Line ids continue across pages exactly like build_lines.
+    """
+    line_id = 0
+
+    for page, page_words in pages:
+        page_words.sort(key=lambda w: (w["top"], w["x0"]))
+
+        for line in _group_page(page_words, page, line_id, y_threshold):
+            line_id += 1
+            yield line
+
+
+def _group_page(page_words: List[Dict], page: int, line_id: int,
+                y_threshold: float) -> List[Dict]:
+    lines = []
+
+    current_line = []
+    current_top = None
+
+    for w in page_words:
+        if current_top is None:
+            current_top = w["top"]
+            current_line.append(w)
+            continue
+
+        if abs(w["top"] - current_top) <= y_threshold:
+            current_line.append(w)
+        else:
             lines.append(_finalize_line(current_line, page, line_id))
             line_id += 1
+            current_line = [w]
+            current_top = w["top"]
+
+    if current_line:
+        lines.append(_finalize_line(current_line, page, line_id))
 
     return lines
 
@@ -52,3 +81,80 @@ def _finalize_line(words: List[Dict], page: int, line_id: int) -> Dict:
         "top": min(w["top"] for w in words),
         "bottom": max(w["bottom"] for w in words)
     }
+
+
+def build_lines_from_table(table: WordTable, y_threshold: float = 3.0) -> List[Dict]:
+    """
+    Columnar build_lines: same lines, same ids, computed on a WordTable.
+
+    A new line starts when a word's top is more than y_threshold below the
+    top of the line's FIRST word. Any consecutive gap > y_threshold (np.diff)
+    is therefore always a break; only runs whose total top-span exceeds the
+    threshold need the sequential anchor walk.
+    """
+    n = len(table)
+    if n == 0:
+        return []
+
+    # Sort by page → top → x0 (lexsort is stable, like list.sort)
+    order = np.lexsort((table.x0, table.top, table.page))
+    page = table.page[order]
+    top = table.top[order]
+    x0 = table.x0[order]
+    x1 = table.x1[order]
+    bottom = table.bottom[order]
+
+    forced = np.flatnonzero((np.diff(page) != 0) | (np.diff(top) > y_threshold)) + 1
+    bounds = np.concatenate(([0], forced, [n]))
+
+    seg_start = bounds[:-1]
+    seg_last = bounds[1:] - 1
+    drifting = np.flatnonzero(top[seg_last] - top[seg_start] > y_threshold)
+
+    if len(drifting):
+        top_list = top.tolist()
+        starts = seg_start.tolist()
+        for k in drifting.tolist():
+            a, end = int(bounds[k]), int(bounds[k + 1])
+            while True:
+                anchor = top_list[a]
+                b = bisect_right(top_list, anchor + y_threshold, a + 1, end)
+                # settle the edge with the exact `top - anchor` test the
+                # scalar loop uses (anchor + threshold may round differently)
+                while b < end and top_list[b] - anchor <= y_threshold:
+                    b += 1
+                while b > a + 1 and top_list[b - 1] - anchor > y_threshold:
+                    b -= 1
+                if b >= end:
+                    break
+                starts.append(b)
+                a = b
+        starts = np.array(sorted(starts), dtype=np.int64)
+    else:
+        starts = seg_start
+
+    # Per-line x0 order for text (stable within equal x0)
+    line_of_word = np.repeat(np.arange(len(starts)), np.diff(np.append(starts, n)))
+    by_x = np.lexsort((x0, line_of_word))
+    texts = [table.text[i] for i in order[by_x].tolist()]
+
+    line_x0 = np.minimum.reduceat(x0, starts).tolist()
+    line_x1 = np.maximum.reduceat(x1, starts).tolist()
+    line_top = np.minimum.reduceat(top, starts).tolist()
+    line_bottom = np.maximum.reduceat(bottom, starts).tolist()
+    line_page = page[starts].tolist()
+
+    ends = np.append(starts[1:], n).tolist()
+    lines = []
+    for i, (s, e) in enumerate(zip(starts.tolist(), ends)):
+        lines.append({
+            "line_id": f"l{i}",
+            "page": line_page[i],
+            "text": " ".join(texts[s:e]).strip(),
+            "x0": line_x0[i],
+            "x1": line_x1[i],
+            "top": line_top[i],
+            "bottom": line_bottom[i]
+        })
+
+    return lines
@@ -0,0 +1,158 @@
+# extraction/pdf_backends.py
+"""
+Pluggable PDF word extractors.
+
+Every backend streams (page_num, words) pairs where each word follows the
+extract_pdf_words contract:
+
+    {"page", "text", "x0", "x1", "top", "bottom"}
+
+with top/bottom measured from the top of the page (pdfplumber convention).
+The rest of the pipeline only ever sees that contract, so backends can be
+swapped per deployment with PDF_BACKEND or extract_resume(..., backend=...).
+"""
+import os
+from typing import List, Dict, Iterator, Tuple, Optional, Protocol
+
+from extraction.pdf_digital import iter_pdf_pages, count_pdf_pages
+
+DEFAULT_PDF_BACKEND = "pdfplumber"
+
+
+class PdfBackend(Protocol):
+    name: str
+
+    def iter_pages(self, pdf_path: str,
+                   pages: Optional[List[int]] = None) -> Iterator[Tuple[int, List[Dict]]]:
+        ...
+
+    def count_pages(self, pdf_path: str) -> int:
+        ...
+
+
+class PdfplumberBackend:
+    """
+    Reference backend: pdfplumber extract_words(use_text_flow=True).
+    """
+    name = "pdfplumber"
+
+    def iter_pages(self, pdf_path, pages=None):
+        return iter_pdf_pages(pdf_path, pages=pages)
+
+    def count_pages(self, pdf_path):
+        return count_pdf_pages(pdf_path)
+
+
+class PdfminerBackend:
+    """
+    Drives pdfminer.six's layout engine directly and builds words from
+    LTTextLine / LTChar, skipping pdfplumber's per-char dict objects.
+
+    Word splitting mirrors extract_words(x_tolerance=1, y_tolerance=2):
+    a word ends at whitespace, at a horizontal gap > x_tolerance, or when
+    the baseline jumps by more than y_tolerance.
+    """
+    name = "pdfminer"
+
+    def __init__(self, x_tolerance: float = 1.0, y_tolerance: float = 2.0):
+        self.x_tolerance = x_tolerance
+        self.y_tolerance = y_tolerance
+
+    def iter_pages(self, pdf_path, pages=None):
+        from pdfminer.high_level import extract_pages
+        from pdfminer.layout import LAParams
+
+        # boxes_flow=None skips hierarchical text-box grouping — we only
+        # need lines, and the line builder re-sorts by position anyway.
+        # all_texts=True also groups text drawn inside form XObjects (LTFigure).
+        laparams = LAParams(boxes_flow=None, all_texts=True)
+        page_numbers = None if pages is None else sorted(p - 1 for p in pages)
+
+        for idx, lt_page in enumerate(extract_pages(pdf_path, page_numbers=page_numbers, laparams=laparams)):
+            page_num = page_numbers[idx] + 1 if page_numbers is not None else idx + 1
+            yield page_num, self._page_words(lt_page, page_num)
+
+    def count_pages(self, pdf_path):
+        from pdfminer.pdfpage import PDFPage
+
+        with open(pdf_path, "rb") as f:
+            return sum(1 for _ in PDFPage.get_pages(f))
+
+    def _page_words(self, lt_page, page_num: int) -> List[Dict]:
+        from pdfminer.layout import LTTextLine, LTChar
+
+        page_top = lt_page.y1
+        words = []
+
+        for line in _iter_layout(lt_page, LTTextLine):
+            current = None
+
+            for ch in line:
+                # LTAnno (virtual spaces/newlines) carries no geometry
+                if not isinstance(ch, LTChar):
+                    continue
+
+                text = ch.get_text()
+
+                if text.isspace():
+                    current = self._flush(current, words)
+                    continue
+
+                top = page_top - ch.y1
+                bottom = page_top - ch.y0
+
+                if current is not None and (
+                    ch.x0 - current["x1"] > self.x_tolerance
+                    or ch.x0 < current["x0"]
+                    or abs(top - current["top"]) > self.y_tolerance
+                ):
+                    current = self._flush(current, words)
+
+                if current is None:
+                    current = {
+                        "page": page_num,
+                        "text": text,
+                        "x0": ch.x0,
+                        "x1": ch.x1,
+                        "top": top,
+                        "bottom": bottom,
+                    }
+                else:
+                    current["text"] += text
+                    current["x1"] = max(current["x1"], ch.x1)
+                    current["top"] = min(current["top"], top)
+                    current["bottom"] = max(current["bottom"], bottom)
+
+            self._flush(current, words)
+
+        return words
+
+    @staticmethod
+    def _flush(current, words):
+        if current is not None:
+            words.append(current)
+        return None
+
+
+def _iter_layout(obj, kind):
+    for child in obj:
+        if isinstance(child, kind):
+            yield child
+        elif hasattr(child, "__iter__"):
+            yield from _iter_layout(child, kind)
+
+
+PDF_BACKENDS = {
+    "pdfplumber": PdfplumberBackend,
+    "pdfminer": PdfminerBackend,
+}
+
+
+def get_pdf_backend(name: Optional[str] = None) -> PdfBackend:
+    """
+    Resolve a backend by name (defaults to PDF_BACKEND env, then pdfplumber).
+    """
+    name = (name or os.getenv("PDF_BACKEND") or DEFAULT_PDF_BACKEND).lower()
+    if name not in PDF_BACKENDS:
+        raise ValueError(f"Unknown PDF backend '{name}'. Available: {', '.join(PDF_BACKENDS)}")
+    return PDF_BACKENDS[name]()
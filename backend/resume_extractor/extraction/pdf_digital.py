@@ -1,5 +1,75 @@
 import pdfplumber
-from typing import List, Dict
+from typing import List, Dict, Iterator, Tuple, Optional
+
+
+def _page_words(page) -> List[Dict]:
+    return page.extract_words(
+        use_text_flow=True,
+        keep_blank_chars=False,
+        x_tolerance=1,
+        y_tolerance=2
+    )
+
+
+def open_pdf(pdf_path: str):
+    """
+    Open a pdfplumber document to share between passes (caller closes it).
+    """
+    return pdfplumber.open(pdf_path)
+
+
+def iter_pdf_pages(pdf_path: str,
+                   pages: Optional[List[int]] = None,
+                   pdf=None) -> Iterator[Tuple[int, List[Dict]]]:
+    """
+    Stream words from a digital PDF one page at a time.
+
+    Yields (page_num, words) and releases pdfplumber's per-page caches
+    (chars, layout objects) before moving on, so memory stays bounded
+    by a single page instead of the whole document.
+
+    `pages` optionally restricts extraction to those 1-based page numbers.
+    `pdf` is an already open pdfplumber document (left open): pages another
+    pass already parsed, e.g. pre-flight, are not interpreted twice.
+    """
+    if pdf is not None:
+        yield from _iter_open_pdf(pdf, pages)
+        return
+
+    with pdfplumber.open(pdf_path, pages=pages) as pdf:
+        yield from _iter_open_pdf(pdf, None)
+
+
+def _iter_open_pdf(pdf, pages: Optional[List[int]]) -> Iterator[Tuple[int, List[Dict]]]:
+    wanted = None if pages is None else set(pages)
+    for page in pdf.pages:
+        page_num = page.page_number
+        if wanted is not None and page_num not in wanted:
+            continue
+        page_words = _page_words(page)
+
+        words = [
+            {
+                "page": page_num,
+                "text": w["text"],
+                "x0": w["x0"],
+                "x1": w["x1"],
+                "top": w["top"],
+                "bottom": w["bottom"]
+            }
+            for w in page_words
+        ]
+
+        # Drop cached chars/layout for this page before the next one
+        page.close()
+
+        yield page_num, words
+
+
+def count_pdf_pages(pdf_path: str) -> int:
+    with pdfplumber.open(pdf_path) as pdf:
+        return len(pdf.pages)
+
 
 def extract_pdf_words(pdf_path: str) -> List[Dict]:
     """
@@ -9,23 +79,7 @@ def extract_pdf_words(pdf_path: str) -> List[Dict]:
 
     words = []
 
-    with pdfplumber.open(pdf_path) as pdf:
-        for page_num, page in enumerate(pdf.pages, start=1):
-            page_words = page.extract_words(
-                use_text_flow=True,
-                keep_blank_chars=False,
-                x_tolerance=1,
-                y_tolerance=2
-            )
-
-            for w in page_words:
-                words.append({
-                    "page": page_num,
-                    "text": w["text"],
-                    "x0": w["x0"],
-                    "x1": w["x1"],
-                    "top": w["top"],
-                    "bottom": w["bottom"]
-                })
+    for _, page_words in iter_pdf_pages(pdf_path):
+        words.extend(page_words)
 
     return words
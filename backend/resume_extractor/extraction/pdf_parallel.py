@@ -0,0 +1,92 @@
+# extraction/pdf_parallel.py
+"""
+Process-pool page extraction for long PDFs.
+
+pdfplumber's layout analysis is pure Python and holds the GIL, so a
+60-page CV extracts serially no matter how many threads we have. Here
+each worker process extracts and groups lines for a contiguous page
+range; the parent stitches the ranges back together in page order and
+renumbers line ids so the result matches the serial iter_lines output.
+"""
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Dict, Optional
+
+from extraction.pdf_backends import get_pdf_backend
+from extraction.line_builder import iter_lines
+
+# Below this many pages per worker the pool overhead outweighs the win
+MIN_PAGES_PER_WORKER = 4
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_workers = 0
+_pool_lock = threading.Lock()
+
+
+def default_page_workers() -> int:
+    """
+    Opt-in via PDF_PAGE_WORKERS (0 / unset = serial extraction).
+    """
+    try:
+        return max(0, int(os.getenv("PDF_PAGE_WORKERS", "0")))
+    except ValueError:
+        return 0
+
+
+def _get_pool(workers: int) -> ProcessPoolExecutor:
+    global _pool, _pool_workers
+    with _pool_lock:
+        if _pool is None or _pool_workers != workers:
+            if _pool is not None:
+                _pool.shutdown(wait=False)
+            _pool = ProcessPoolExecutor(max_workers=workers)
+            _pool_workers = workers
+        return _pool
+
+
+def split_page_ranges(n_pages: int, workers: int) -> List[List[int]]:
+    """
+    Split 1..n_pages into at most `workers` contiguous, ordered ranges.
+    """
+    n_chunks = min(workers, n_pages // MIN_PAGES_PER_WORKER)
+    if n_chunks <= 1:
+        return [list(range(1, n_pages + 1))] if n_pages else []
+
+    size, extra = divmod(n_pages, n_chunks)
+    ranges = []
+    start = 1
+    for i in range(n_chunks):
+        end = start + size + (1 if i < extra else 0)
+        ranges.append(list(range(start, end)))
+        start = end
+    return ranges
+
+
+def _extract_page_range(pdf_path: str, pages: List[int], backend: str) -> List[Dict]:
+    # Runs inside the worker process
+    return list(iter_lines(get_pdf_backend(backend).iter_pages(pdf_path, pages=pages)))
+
+
+def build_lines_parallel(pdf_path: str, workers: int, backend: Optional[str] = None) -> List[Dict]:
+    """
+    Same contract as list(iter_lines(backend.iter_pages(pdf_path))), with
+    pages fanned out across `workers` processes.
+    """
+    pdf_backend = get_pdf_backend(backend)
+    ranges = split_page_ranges(pdf_backend.count_pages(pdf_path), workers)
+
+    if len(ranges) <= 1:
+        return list(iter_lines(pdf_backend.iter_pages(pdf_path)))
+
+    pool = _get_pool(workers)
+    futures = [pool.submit(_extract_page_range, pdf_path, r, pdf_backend.name) for r in ranges]
+
+    lines = []
+    for fut in futures:
+        for line in fut.result():
+            # Worker ids restart at l0 — renumber to the serial sequence
+            line["line_id"] = f"l{len(lines)}"
+            lines.append(line)
+
+    return lines
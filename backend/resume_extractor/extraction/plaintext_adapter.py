@@ -1,12 +1,16 @@
 import re,sys,os
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
-SECTION_PATTERNS = {
-    "education": re.compile(r"\bEDUCATION\b", re.I),
-    "experience": re.compile(r"\bWORK EXPERIENCE\b|\bEXPERIENCE\b", re.I),
-    "skills": re.compile(r"\bSKILLS\b", re.I),
-    "projects": re.compile(r"\bPROJECTS\b", re.I),
-    "certifications": re.compile(r"\bCERTIFICATIONS\b", re.I),
+from sectioning.header_classifier import HeaderClassifier
+
+# Inline headings, checked in this order (first listed section wins)
+INLINE_SECTION_KEYWORDS = {
+    "education": ["EDUCATION"],
+    "experience": ["WORK EXPERIENCE", "EXPERIENCE"],
+    "skills": ["SKILLS"],
+    "projects": ["PROJECTS"],
+    "certifications": ["CERTIFICATIONS"],
 }
+INLINE_HEADER_CLASSIFIER = HeaderClassifier(INLINE_SECTION_KEYWORDS)
 def plaintext_to_lines(text: str):
     lines = []
 
@@ -40,34 +44,31 @@ def adapt_plaintext_lines(lines):
     for line in lines:
         text = line["text"]
 
-        matched = False
-        for section, pattern in SECTION_PATTERNS.items():
-            if pattern.search(text):
-                # Split heading from content
-                parts = pattern.split(text, maxsplit=1)
+        hit = INLINE_HEADER_CLASSIFIER.first(text)
+
+        if hit:
+            section, _, end = hit
+
+            # Insert section header
+            adapted.append({
+                **line,
+                "text": section.upper(),
+                "is_section_header": True,
+                "section": section
+            })
 
-                # Insert section header
+            # Remaining content (after the heading) goes under that section
+            rest = text[end:].strip()
+            if rest:
                 adapted.append({
                     **line,
-                    "text": section.upper(),
-                    "is_section_header": True,
+                    "text": rest,
+                    "is_section_header": False,
                     "section": section
                 })
 
-                # Remaining content goes under that section
-                if len(parts) > 1 and parts[1].strip():
-                    adapted.append({
-                        **line,
-                        "text": parts[1].strip(),
-                        "is_section_header": False,
-                        "section": section
-                    })
-
-                current_section = section
-                matched = True
-                break
-
-        if not matched:
+            current_section = section
+        else:
             adapted.append({
                 **line,
                 "section": current_section
@@ -0,0 +1,130 @@
+# extraction/preflight.py
+"""
+Cheap pre-flight classification of a PDF before the pipeline runs.
+
+Scanned resumes and PDFs without a usable text layer yield few or no words.
+Today they still go through sectioning, the LLM profile call and seven
+(mostly empty) embeddings. This pass looks at the first few pages' raw
+objects only (no word extraction / layout) and classifies the document:
+
+  text        every sampled page has a usable text layer
+  mixed       some pages have text, others are scans / blank
+  image_only  no sampled page has usable text (scan, blank, or garbage
+              glyphs such as "(cid:12)" from broken font encodings)
+"""
+from typing import Dict, Any
+
+import pdfplumber
+
+PREFLIGHT_MAX_PAGES = 3
+MIN_TEXT_CHARS = 20           # fewer chars than this is not a text layer
+MIN_PRINTABLE_RATIO = 0.6     # below this the text layer is garbage
+IMAGE_PAGE_RATIO = 0.3        # image coverage that makes a page a "scan"
+
+
+class UnreadablePdf(Exception):
+    """
+    Raised by the pipeline when pre-flight finds no usable text layer.
+    """
+    def __init__(self, report: Dict[str, Any]):
+        super().__init__(f"PDF has no usable text layer ({report.get('reason')})")
+        self.report = report
+
+    def to_result(self) -> Dict[str, Any]:
+        return {
+            "success": False,
+            "error": "unreadable_pdf",
+            "kind": self.report["kind"],
+            "reason": self.report.get("reason"),
+            "preflight": self.report,
+        }
+
+
+def _is_printable(text: str) -> bool:
+    # pdfminer renders unmapped glyphs as "(cid:NN)"
+    if text.startswith("(cid:") or text == "�":
+        return False
+    return text.isprintable()
+
+
+def _page_stats(page) -> Dict[str, Any]:
+    chars = page.chars
+    n_chars = 0
+    n_printable = 0
+    for c in chars:
+        t = c.get("text", "")
+        if t.isspace():
+            continue
+        n_chars += 1
+        if _is_printable(t):
+            n_printable += 1
+
+    page_area = float(page.width * page.height) or 1.0
+    image_area = 0.0
+    for im in page.images:
+        w = max(0.0, float(im["x1"]) - float(im["x0"]))
+        h = max(0.0, float(im["bottom"]) - float(im["top"]))
+        image_area += w * h
+
+    printable_ratio = (n_printable / n_chars) if n_chars else 0.0
+    image_ratio = min(1.0, image_area / page_area)
+
+    if n_printable >= MIN_TEXT_CHARS and printable_ratio >= MIN_PRINTABLE_RATIO:
+        kind = "text"
+    elif n_chars >= MIN_TEXT_CHARS:
+        kind = "garbage"
+    elif image_ratio >= IMAGE_PAGE_RATIO:
+        kind = "image"
+    else:
+        kind = "empty"
+
+    return {
+        "page": page.page_number,
+        "kind": kind,
+        "chars": n_chars,
+        "printable_ratio": round(printable_ratio, 3),
+        "image_ratio": round(image_ratio, 3),
+    }
+
+
+def classify_pdf(pdf_path: str, max_pages: int = PREFLIGHT_MAX_PAGES, pdf=None) -> Dict[str, Any]:
+    """
+    Returns {"kind": text|mixed|image_only, "reason", "pages": [...]}.
+
+    With an open pdfplumber `pdf`, sampled pages keep their parsed objects
+    so extraction from the same handle reuses them (interpreting the page
+    content is most of the cost).
+    """
+    if pdf is not None:
+        total = len(pdf.pages)
+        pages = [_page_stats(page) for page in pdf.pages[:max_pages]]
+    else:
+        with pdfplumber.open(pdf_path) as pdf:
+            total = len(pdf.pages)
+            pages = []
+            for page in pdf.pages[:max_pages]:
+                pages.append(_page_stats(page))
+                page.close()
+
+    kinds = [p["kind"] for p in pages]
+    n_text = kinds.count("text")
+
+    if n_text and n_text == len(kinds):
+        kind, reason = "text", None
+    elif n_text:
+        kind, reason = "mixed", None
+    else:
+        kind = "image_only"
+        if "garbage" in kinds:
+            reason = "garbage_text"
+        elif "image" in kinds:
+            reason = "no_text_layer"
+        else:
+            reason = "empty"
+
+    return {
+        "kind": kind,
+        "reason": reason,
+        "total_pages": total,
+        "pages": pages,
+    }
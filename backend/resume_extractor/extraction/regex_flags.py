@@ -1,13 +1,25 @@
-import re
+import re,sys,os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from sectioning.header_classifier import HeaderClassifier
 
 BULLET_REGEX = re.compile(r"^\s*[•\-*]\s+")
-SECTION_HEADER_REGEX = re.compile(
-    r"^(Education|Experience|Projects|Technical Skills|Certifications)",
-    re.IGNORECASE
-)
+
+# Visual header flag: line *starts with* one of these (no word boundary)
+HEADER_PREFIX_KEYWORDS = {
+    "education": ["Education"],
+    "experience": ["Experience"],
+    "projects": ["Projects"],
+    "skills": ["Technical Skills"],
+    "certifications": ["Certifications"],
+}
+HEADER_PREFIX_CLASSIFIER = HeaderClassifier(HEADER_PREFIX_KEYWORDS)
+
+def enrich_line(l):
+    l["is_bullet"] = bool(BULLET_REGEX.match(l["text"]))
+    l["is_section_header"] = HEADER_PREFIX_CLASSIFIER.starts_with_keyword(l["text"])
+    return l
 
 def enrich_lines(lines):
     for l in lines:
-        l["is_bullet"] = bool(BULLET_REGEX.match(l["text"]))
-        l["is_section_header"] = bool(SECTION_HEADER_REGEX.match(l["text"]))
+        enrich_line(l)
     return lines
@@ -0,0 +1,49 @@
+# extraction/word_table.py
+"""
+Columnar word storage for the extraction stage.
+
+Instead of one 6-key dict per word, a WordTable keeps page/top/x0/x1/bottom
+as parallel NumPy arrays plus a plain list of word texts. Sorting, line
+clustering and per-line bounding boxes then run as array operations (see
+extraction.line_builder.build_lines_from_table).
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import List, Dict
+
+import numpy as np
+
+
+@dataclass
+class WordTable:
+    page: np.ndarray = field(default_factory=lambda: np.empty(0, dtype=np.int64))
+    top: np.ndarray = field(default_factory=lambda: np.empty(0, dtype=np.float64))
+    x0: np.ndarray = field(default_factory=lambda: np.empty(0, dtype=np.float64))
+    x1: np.ndarray = field(default_factory=lambda: np.empty(0, dtype=np.float64))
+    bottom: np.ndarray = field(default_factory=lambda: np.empty(0, dtype=np.float64))
+    text: List[str] = field(default_factory=list)
+
+    def __len__(self) -> int:
+        return len(self.text)
+
+    @classmethod
+    def from_words(cls, words: List[Dict], page: int = None) -> "WordTable":
+        """
+        Build a table from word dicts (the extract_pdf_words contract, or raw
+        pdfplumber words when `page` is given for the whole batch).
+        """
+        n = len(words)
+        if page is None:
+            pages = np.fromiter((w["page"] for w in words), dtype=np.int64, count=n)
+        else:
+            pages = np.full(n, page, dtype=np.int64)
+
+        return cls(
+            page=pages,
+            top=np.fromiter((w["top"] for w in words), dtype=np.float64, count=n),
+            x0=np.fromiter((w["x0"] for w in words), dtype=np.float64, count=n),
+            x1=np.fromiter((w["x1"] for w in words), dtype=np.float64, count=n),
+            bottom=np.fromiter((w["bottom"] for w in words), dtype=np.float64, count=n),
+            text=[w["text"] for w in words],
+        )
@@ -0,0 +1,47 @@
+# extraction_cache.py
+"""
+Content-addressed cache for the full resume pipeline.
+
+Keyed by (pipeline version, embedding model, upload MD5) so the same PDF
+uploaded against a different job skips pdfplumber → sectioning → LLM →
+embedding entirely. Bump PIPELINE_VERSION in run_pipeline.py whenever the
+extraction output changes, and stale entries simply stop matching.
+"""
+import os
+from typing import Any, Dict, Optional
+
+from resume_extractor.disk_cache import DiskLRUCache
+
+DEFAULT_CACHE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "cache", "extraction_cache.sqlite3")
+DEFAULT_MAX_MB = 512
+
+
+class ExtractionCache:
+    def __init__(self, pipeline_version: str, model_name: str,
+                 path: Optional[str] = None, max_mb: Optional[int] = None):
+        self.pipeline_version = pipeline_version
+        self.model_name = model_name
+        self.store = DiskLRUCache(
+            path or os.getenv("EXTRACTION_CACHE_PATH", DEFAULT_CACHE_PATH),
+            int(max_mb or os.getenv("EXTRACTION_CACHE_MAX_MB", DEFAULT_MAX_MB)) * 1024 * 1024,
+        )
+
+    def _key(self, file_hash: str) -> str:
+        return f"{self.pipeline_version}|{self.model_name}|{file_hash}"
+
+    def get(self, file_hash: str) -> Optional[Dict[str, Any]]:
+        """
+        Returns {"parsed_data", "views", "embeddings"} or None.
+        """
+        return self.store.get(self._key(file_hash))
+
+    def put(self, file_hash: str, parsed_data: Dict[str, Any],
+            views: Dict[str, str], embeddings: Dict[str, Any]) -> None:
+        self.store.set(self._key(file_hash), {
+            "parsed_data": parsed_data,
+            "views": views,
+            "embeddings": embeddings,
+        })
+
+    def stats(self) -> Dict[str, Any]:
+        return self.store.stats()
@@ -0,0 +1,212 @@
+# extraction_workers.py
+"""
+Isolated, recycled worker processes for resume extraction.
+
+A malformed PDF can keep pdfplumber busy for minutes. Running the pipeline
+in a threadpool thread means it can't be interrupted, so it holds a slot
+and drags up tail latency for everyone else. Here every document runs in
+a worker process that the parent supervises:
+
+  - wall-clock deadline per document      (EXTRACTION_TIMEOUT_S)
+  - resident memory cap per worker        (EXTRACTION_MAX_RSS_MB)
+  - recycle after N documents             (EXTRACTION_MAX_TASKS_PER_CHILD)
+
+A worker that hits a limit, hangs or dies is killed and replaced. The
+caller gets a structured {"success": False, "error": "extraction_timeout"}
+result and never an exception.
+"""
+import itertools
+import multiprocessing as mp
+import os
+import queue
+import time
+from typing import Any, Dict, Optional
+
+try:
+    import psutil
+    PSUTIL_AVAILABLE = True
+except ImportError:
+    PSUTIL_AVAILABLE = False
+
+POLL_INTERVAL_S = 0.1
+
+
+def _rss_bytes(pid: int) -> Optional[int]:
+    if PSUTIL_AVAILABLE:
+        try:
+            return psutil.Process(pid).memory_info().rss
+        except psutil.Error:
+            return None
+
+    # Linux fallback without psutil; elsewhere the RSS cap is not enforced
+    try:
+        with open(f"/proc/{pid}/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError, AttributeError):
+        return None
+
+
+def _worker_main(conn, max_tasks: int):
+    # Imported here so the parent never pays for it and each fresh worker
+    # starts from a clean interpreter
+    from resume_extractor.run_pipeline import extract_resume, extract_structured, UnreadablePdf
+    tasks = {"resume": extract_resume, "structured": extract_structured}
+
+    done = 0
+    while max_tasks <= 0 or done < max_tasks:
+        try:
+            msg = conn.recv()
+        except (EOFError, OSError):
+            break
+        if msg is None:
+            break
+
+        task_id, path, kind = msg
+        try:
+            conn.send((task_id, True, tasks[kind](path)))
+        except UnreadablePdf as e:
+            conn.send((task_id, False, e.to_result()))
+        except Exception as e:
+            conn.send((task_id, False, str(e)))
+        done += 1
+
+    conn.close()
+
+
+class _Worker:
+    def __init__(self, ctx, max_tasks: int):
+        self.conn, child_conn = ctx.Pipe()
+        self.proc = ctx.Process(target=_worker_main, args=(child_conn, max_tasks))
+        self.proc.start()
+        child_conn.close()
+        self.tasks = 0
+
+    def stop(self, graceful: bool = False):
+        if graceful and self.proc.is_alive():
+            try:
+                self.conn.send(None)
+            except (OSError, ValueError):
+                pass
+            self.proc.join(2)
+
+        if self.proc.is_alive():
+            self.proc.terminate()
+            self.proc.join(2)
+        if self.proc.is_alive():
+            self.proc.kill()
+            self.proc.join()
+
+        self.conn.close()
+
+
+class ExtractionWorkerPool:
+    def __init__(self, workers: int = 2, timeout_s: float = 60.0,
+                 max_rss_mb: int = 1024, max_tasks_per_child: int = 50):
+        self.timeout_s = timeout_s
+        self.max_rss_bytes = max_rss_mb * 1024 * 1024 if max_rss_mb else 0
+        self.max_tasks_per_child = max_tasks_per_child
+
+        # spawn: the API process has torch/BLAS threads; forking it is unsafe
+        self._ctx = mp.get_context("spawn")
+        self._idle: "queue.Queue[_Worker]" = queue.Queue()
+        self._task_ids = itertools.count()
+        self.stats = {"completed": 0, "failed": 0, "timeouts": 0, "memory_kills": 0, "crashes": 0, "recycled": 0}
+
+        for _ in range(workers):
+            self._idle.put(self._spawn())
+
+    def _spawn(self) -> _Worker:
+        return _Worker(self._ctx, self.max_tasks_per_child)
+
+    def _replace(self, worker: _Worker) -> _Worker:
+        worker.stop()
+        return self._spawn()
+
+    def run(self, path: str, timeout_s: Optional[float] = None, kind: str = "resume") -> Dict[str, Any]:
+        """
+        Blocking: extract one resume in a worker. Always returns
+        {"success": True, "data": ...} or a structured failure.
+
+        kind="structured" stops before build_final_resume (no AI calls), so
+        the caller can overlap the LLM with embedding (run_pipeline.build_and_embed).
+        """
+        timeout_s = timeout_s or self.timeout_s
+        worker = self._idle.get()
+
+        try:
+            if not worker.proc.is_alive():
+                worker = self._replace(worker)
+
+            task_id = next(self._task_ids)
+            deadline = time.monotonic() + timeout_s
+
+            try:
+                worker.conn.send((task_id, path, kind))
+
+                while True:
+                    if worker.conn.poll(POLL_INTERVAL_S):
+                        _, ok, payload = worker.conn.recv()
+                        worker.tasks += 1
+                        if ok:
+                            self.stats["completed"] += 1
+                            return {"success": True, "data": payload}
+                        self.stats["failed"] += 1
+                        if isinstance(payload, dict):
+                            # typed failure from the pipeline (e.g. unreadable_pdf)
+                            return payload
+                        return {"success": False, "error": "extraction_failed", "detail": payload}
+
+                    if not worker.proc.is_alive():
+                        raise EOFError("worker exited")
+
+                    if time.monotonic() > deadline:
+                        print(f"[WARN] Extraction deadline ({timeout_s}s) hit for {path}; killing worker")
+                        self.stats["timeouts"] += 1
+                        worker = self._replace(worker)
+                        return {"success": False, "error": "extraction_timeout",
+                                "reason": "deadline", "limit_s": timeout_s}
+
+                    if self.max_rss_bytes:
+                        rss = _rss_bytes(worker.proc.pid)
+                        if rss and rss > self.max_rss_bytes:
+                            print(f"[WARN] Extraction worker RSS {rss // (1024 * 1024)}MB over cap for {path}; killing worker")
+                            self.stats["memory_kills"] += 1
+                            worker = self._replace(worker)
+                            return {"success": False, "error": "extraction_timeout",
+                                    "reason": "memory", "limit_mb": self.max_rss_bytes // (1024 * 1024)}
+
+            except (EOFError, OSError) as e:
+                print(f"[ERROR] Extraction worker crashed on {path}: {e}")
+                self.stats["crashes"] += 1
+                worker = self._replace(worker)
+                return {"success": False, "error": "extraction_failed", "detail": "worker_crashed"}
+
+        finally:
+            if self.max_tasks_per_child and worker.tasks >= self.max_tasks_per_child:
+                self.stats["recycled"] += 1
+                worker.stop(graceful=True)
+                worker = self._spawn()
+            self._idle.put(worker)
+
+    def shutdown(self):
+        while True:
+            try:
+                self._idle.get_nowait().stop(graceful=True)
+            except queue.Empty:
+                break
+
+
+def pool_from_env() -> Optional[ExtractionWorkerPool]:
+    """
+    EXTRACTION_WORKERS=0 disables isolation (extraction runs in-process).
+    """
+    workers = int(os.getenv("EXTRACTION_WORKERS", "2"))
+    if workers <= 0:
+        return None
+
+    return ExtractionWorkerPool(
+        workers=workers,
+        timeout_s=float(os.getenv("EXTRACTION_TIMEOUT_S", "60")),
+        max_rss_mb=int(os.getenv("EXTRACTION_MAX_RSS_MB", "1024")),
+        max_tasks_per_child=int(os.getenv("EXTRACTION_MAX_TASKS_PER_CHILD", "50")),
+    )
@@ -0,0 +1,93 @@
+# llm_cache.py
+"""
+Persistent cache of LLM responses.
+
+Prompts are built deterministically from resume text, so reprocessing a
+resume (or a templated resume with the same header block) repeats the
+exact same paid call. Responses are keyed by (provider, model, SHA-256 of
+the system + user prompt with whitespace runs collapsed) and stored in a
+DiskLRUCache. The calls themselves happen in the API process (extraction
+workers stop before the AI step); the file can still be shared with
+bulk runs of run_pipeline.py.
+
+Configuration:
+  LLM_CACHE_PATH       sqlite file (default cache/llm_cache.sqlite3)
+  LLM_CACHE_MAX_MB     size cap, least recently used evicted first (default 64)
+  LLM_CACHE_TTL_S      entries older than this are refetched (default 30 days)
+  LLM_CACHE_DISABLED   "1" bypasses the cache entirely
+
+generate_ai_content(prompt, use_cache=False) bypasses it for one call.
+generate_ai_content(prompt, validate=...) stores a reply only if the
+caller's check accepts it, so a malformed reply is refetched next time
+instead of being served for the whole TTL.
+"""
+import hashlib
+import os
+import re
+import threading
+from typing import Optional
+
+from resume_extractor.disk_cache import DiskLRUCache
+
+DEFAULT_CACHE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "cache", "llm_cache.sqlite3")
+DEFAULT_MAX_MB = 64
+DEFAULT_TTL_S = 30 * 24 * 3600
+
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def normalize_prompt(prompt: str) -> str:
+    # Indentation / blank-line differences in the f-string templates are
+    # not meaningful to the model
+    return _WHITESPACE_RE.sub(" ", prompt).strip()
+
+
+class LLMResponseCache:
+    def __init__(self, path: Optional[str] = None, max_mb: Optional[int] = None,
+                 ttl_s: Optional[float] = None):
+        self.store = DiskLRUCache(
+            path or os.getenv("LLM_CACHE_PATH", DEFAULT_CACHE_PATH),
+            int(max_mb or os.getenv("LLM_CACHE_MAX_MB", DEFAULT_MAX_MB)) * 1024 * 1024,
+            ttl_s=float(ttl_s or os.getenv("LLM_CACHE_TTL_S", DEFAULT_TTL_S)),
+        )
+
+    @staticmethod
+    def key(provider: str, model: str, prompt: str, system_prompt: str = "") -> str:
+        digest = hashlib.sha256(
+            (normalize_prompt(system_prompt) + "\0" + normalize_prompt(prompt)).encode("utf-8")
+        ).hexdigest()
+        return f"{provider}|{model}|{digest}"
+
+    def get(self, provider: str, model: str, prompt: str, system_prompt: str = "") -> Optional[str]:
+        return self.store.get(self.key(provider, model, prompt, system_prompt))
+
+    def put(self, provider: str, model: str, prompt: str, response: str, system_prompt: str = "") -> None:
+        self.store.set(self.key(provider, model, prompt, system_prompt), response)
+
+    def invalidate(self, provider: str, model: str, prompt: str, system_prompt: str = "") -> None:
+        self.store.delete(self.key(provider, model, prompt, system_prompt))
+
+    def stats(self):
+        return self.store.stats()
+
+
+_cache: Optional[LLMResponseCache] = None
+_cache_lock = threading.Lock()
+
+
+def cache_disabled() -> bool:
+    return os.getenv("LLM_CACHE_DISABLED", "0").lower() in ("1", "true", "yes")
+
+
+def get_llm_cache() -> Optional[LLMResponseCache]:
+    """
+    Process-wide cache, opened on first use; None when disabled.
+    """
+    global _cache
+    if cache_disabled():
+        return None
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = LLMResponseCache()
+    return _cache
@@ -0,0 +1,167 @@
+# llm_limits.py
+"""
+Client-side flow control for LLM calls.
+
+  TokenBucket    per-provider request rate limit. Callers wait for a token
+                 instead of sending a burst the provider answers with 429s.
+                 A 429 pauses the bucket for its Retry-After, so every
+                 thread backs off, not just the one that was refused.
+  backoff_delay  jittered exponential delay between retries of one call
+  SingleFlight   identical requests in flight at the same moment share one
+                 execution (the others wait for its result)
+
+Rates come from the environment (requests per second, 0 = unlimited):
+  AI_RATE_LIMIT_RPS_OPENROUTER / _OPENAI / _GEMINI   (else AI_RATE_LIMIT_RPS, default 0)
+  AI_RATE_LIMIT_BURST                                (default 10)
+Quotas differ by provider and plan, so no rate is assumed: set the one
+your account has. 429s are still retried with backoff either way.
+"""
+import os
+import random
+import threading
+import time
+from typing import Any, Callable, Dict, Hashable, Optional
+
+DEFAULT_RPS = 0.0
+DEFAULT_BURST = 10
+
+
+def _env_float(name: str, default: Optional[float]) -> Optional[float]:
+    value = os.getenv(name)
+    if value is None:
+        return default
+    try:
+        return float(value)
+    except ValueError:
+        return default
+
+
+class TokenBucket:
+    def __init__(self, rate_per_s: float, burst: int):
+        self.rate = rate_per_s
+        self.capacity = max(1, burst)
+        self.tokens = float(self.capacity)
+        self.updated = time.monotonic()
+        self.paused_until = 0.0
+        self._lock = threading.Lock()
+        self.counts = {"granted": 0, "waited": 0, "timed_out": 0, "pauses": 0}
+
+    @classmethod
+    def from_env(cls, provider: str) -> "TokenBucket":
+        rate = _env_float(f"AI_RATE_LIMIT_RPS_{provider.upper()}", None)
+        if rate is None:
+            rate = _env_float("AI_RATE_LIMIT_RPS", DEFAULT_RPS)
+        return cls(rate, int(_env_float("AI_RATE_LIMIT_BURST", DEFAULT_BURST)))
+
+    def _refill(self, now: float) -> None:
+        if now > self.updated:
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+
+    def acquire(self, timeout_s: float) -> bool:
+        """
+        Take one token, waiting up to timeout_s. False if that is not enough.
+        """
+        if self.rate <= 0:
+            return True
+
+        deadline = time.monotonic() + timeout_s
+        waited = False
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                if now < self.paused_until:
+                    wait = self.paused_until - now
+                else:
+                    self._refill(now)
+                    if self.tokens >= 1:
+                        self.tokens -= 1
+                        self.counts["granted"] += 1
+                        self.counts["waited"] += waited
+                        return True
+                    wait = (1 - self.tokens) / self.rate
+
+                if now + wait > deadline:
+                    self.counts["timed_out"] += 1
+                    return False
+
+            waited = True
+            time.sleep(wait)
+
+    def pause(self, seconds: float) -> None:
+        """
+        Provider said slow down: no tokens for `seconds`, then refill from empty.
+        """
+        with self._lock:
+            until = time.monotonic() + seconds
+            if until > self.paused_until:
+                self.paused_until = until
+                self.tokens = 0.0
+                self.updated = until
+                self.counts["pauses"] += 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return dict(self.counts, rate_per_s=self.rate, burst=self.capacity)
+
+
+def backoff_delay(attempt: int, retry_after: Optional[float] = None,
+                  base_s: Optional[float] = None, cap_s: Optional[float] = None) -> float:
+    """
+    Full-jitter exponential backoff for retry number `attempt` (0-based):
+    uniform(0, min(cap, base * 2^attempt)). A server-sent Retry-After is
+    honoured, plus up to one base step of jitter so waiting threads don't
+    return in lockstep.
+    """
+    base_s = base_s if base_s is not None else _env_float("AI_RETRY_BASE_S", 0.5)
+    cap_s = cap_s if cap_s is not None else _env_float("AI_RETRY_MAX_DELAY_S", 8.0)
+    if retry_after is not None:
+        return retry_after + random.uniform(0, base_s)
+    return random.uniform(0, min(cap_s, base_s * (2 ** attempt)))
+
+
+class _Flight:
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._flights: Dict[Hashable, _Flight] = {}
+        self.counts = {"executed": 0, "shared": 0}
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        """
+        Run fn() unless a call with the same key is already running, in
+        which case wait for and return (or raise) that call's outcome.
+        """
+        with self._lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+                self.counts["executed"] += 1
+            else:
+                self.counts["shared"] += 1
+
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.result
+
+        try:
+            flight.result = fn()
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._flights[key]
+            flight.done.set()
+        return flight.result
@@ -9,9 +9,16 @@ import uuid
 from datetime import datetime
 
 # Import internal modules (assumes these are in python path or sibling dirs)
-from resume_extractor.run_pipeline import extract_resume as pipeline_extract
+from resume_extractor.run_pipeline import extract_structured, build_and_embed, PIPELINE_VERSION, UnreadablePdf
 from resume_extractor.recommender.embedder import Embedder
-from resume_extractor.recommender.text_views import resume_to_views
+from resume_extractor.recommender.embedding_service import EmbeddingService
+from resume_extractor.extraction_cache import ExtractionCache
+from resume_extractor.extraction_workers import pool_from_env
+from resume_extractor.ai_service import registry as ai_registry
+from resume_extractor.llm_cache import get_llm_cache
+# Same module object skills_categorizer imports (run_pipeline puts
+# resume_extractor/ on sys.path), so the configured classifier is shared
+from postprocessing.skill_classifier import configure_skill_classifier
 
 # New structure: Cvision/backend/resume_extractor/main.py -> Cvision/backend/.env
 # Parent dir of 'resume_extractor' is 'backend', so .env is in parent_dir
@@ -89,6 +96,35 @@ print("[INFO] Loading AI Model... this may take a moment")
 embedder = Embedder(device="cpu")
 print("[INFO] AI Model Loaded")
 
+# View texts from all concurrent requests share forward passes
+# (EMBED_MAX_BATCH / EMBED_MAX_WAIT_MS); started with the event loop
+embedding_service = EmbeddingService(embedder)
+
+# SKILLS_FALLBACK=local (experimental): skills fallback on the loaded model
+# instead of the LLM, encoding through the service's batches
+configure_skill_classifier(embedder, encode_texts=embedding_service.encode_threadsafe)
+
+# Content-hash cache: same PDF against another job skips the whole pipeline
+extraction_cache = ExtractionCache(PIPELINE_VERSION, embedder.model_name)
+
+# Supervised worker processes: per-document deadline, RSS cap, recycling
+extraction_pool = pool_from_env()
+
+@app.on_event("startup")
+async def start_embedding_service():
+    await embedding_service.start()
+
+@app.on_event("shutdown")
+async def stop_embedding_service():
+    await embedding_service.stop()
+
+@app.on_event("shutdown")
+def shutdown_extraction_pool():
+    if extraction_pool is not None:
+        extraction_pool.shutdown()
+    # Pooled LLM connections used by in-process extraction
+    ai_registry.close()
+
 import hashlib
 from fastapi.concurrency import run_in_threadpool
 
@@ -129,25 +165,65 @@ async def extract_resume_endpoint(
     stored_filename = f"{uuid.uuid4()}_{file.filename}"
     file_path = os.path.join(UPLOAD_DIR, stored_filename)
 
+    try:
+        cached = extraction_cache.get(file_hash)
+    except Exception as e:
+        print(f"[WARN] Failed to read extraction cache: {e}")
+        cached = None
+
     try:
         with open(file_path, "wb") as buffer:
             shutil.copyfileobj(file.file, buffer)
 
         # 1. Parse/Extract (Run in threadpool to unblock event loop)
-        structured_data = await run_in_threadpool(pipeline_extract, file_path)
+        if cached:
+            print(f"[INFO] Extraction cache hit (Hash: {file_hash}). Skipping pipeline.")
+            structured_data = cached["parsed_data"]
+        elif extraction_pool is not None:
+            # The worker stops before the AI calls; they run below,
+            # overlapped with embedding
+            result = await run_in_threadpool(extraction_pool.run, file_path, kind="structured")
+            if not result["success"]:
+                print(f"[ERROR] Extraction failed in worker: {result}")
+                return result
+            sectioned = result["data"]
+        else:
+            sectioned = await run_in_threadpool(extract_structured, file_path)
         
         # NOTE: File is KEPT for download access (no finally/cleanup block)
         print(f"[INFO] Persisting file at: {file_path}")
 
+    except UnreadablePdf as e:
+        # Scanned / image-only upload: skip LLM + embedding entirely
+        print(f"[WARN] Unreadable PDF ({e.report['reason']}): {file_path}")
+        return e.to_result()
     except Exception as e:
         print(f"[ERROR] Extraction failed: {e}")
         return {"success": False, "error": str(e)}
 
-    # 2. Embed
-    views = resume_to_views(structured_data)
-    
-    # Generate embeddings (Use global embedder)
-    embeddings_map = embedder.embed_views(views)
+    # 2. AI fields + Embed (LLM calls overlap with embedding the PDF-derived views)
+    if cached:
+        views = cached["views"]
+        embeddings_map = cached["embeddings"]
+    else:
+        try:
+            built = await run_in_threadpool(build_and_embed, sectioned,
+                                            embedding_service.embed_views_threadsafe,
+                                            doc_key=file_hash)
+        except Exception as e:
+            print(f"[ERROR] Extraction failed: {e}")
+            return {"success": False, "error": str(e)}
+        structured_data = built["resume"]
+        views = built["views"]
+        embeddings_map = built["embeddings"]
+
+        # A rules-only result (the LLM failed) is not cached, so the next
+        # upload of this file asks the AI again
+        if built["ai_complete"]:
+            try:
+                extraction_cache.put(file_hash, structured_data, views, embeddings_map)
+            except Exception as e:
+                print(f"[WARN] Failed to write extraction cache: {e}")
 
     # 3. Store in MongoDB
     doc_id = None
@@ -202,6 +278,27 @@ async def extract_resume_endpoint(
         "stored_filename": stored_filename # Return this so frontend knows the URL immediately if needed
     }
 
+@app.get("/extraction-cache/stats")
+async def extraction_cache_stats():
+    return {"success": True, "stats": extraction_cache.stats()}
+
+@app.get("/embedding-service/stats")
+async def embedding_service_stats():
+    # Micro-batches sent to the model since startup (this process)
+    return {"success": True, "stats": embedding_service.stats()}
+
+@app.get("/llm-cache/stats")
+async def llm_cache_stats():
+    cache = get_llm_cache()
+    if cache is None:
+        return {"success": True, "enabled": False}
+    return {"success": True, "enabled": True, "stats": cache.stats()}
+
+@app.get("/ai-providers/stats")
+async def ai_provider_stats():
+    # Circuit state and latency per LLM provider (this process)
+    return {"success": True, "providers": ai_registry.health_stats()}
+
 from pydantic import BaseModel
 
 class JobData(BaseModel):
@@ -228,8 +325,8 @@ async def embed_job(data: JobData):
         "certifications": ""
     }
 
-    # Use global embedder
-    embeddings_map = embedder.embed_views(views)
+    # Batched with any resume uploads in flight
+    embeddings_map = await embedding_service.embed_views(views)
     
     # Also add the _skills_text meta field if needed by matcher
     embeddings_map["_skills_text"] = skills_text
@@ -0,0 +1,155 @@
+# phrase_stats.py
+"""
+Corpus-level phrase statistics, used to prune the "phrases" view.
+
+extract_phrases keeps every multi-word phrase of a resume, so the phrases
+view often runs past the encoder's sequence limit (256 word pieces for
+MiniLM) and is padded with boilerplate every resume shares ("Team
+Member", "Bachelor Of"). A document-frequency table over every resume
+ingested so far is kept in SQLite, and the view keeps only the
+PHRASES_VIEW_TOP_K best phrases by
+
+    (1 + ln tf) * idf,    idf = ln((1 + N) / (1 + df)) + 1
+
+tf: occurrences of the phrase in the resume's full text; N: resumes
+ingested; df: resumes containing the phrase (case-insensitive). The kept
+phrases stay in document order. signals["phrases"] itself is untouched.
+
+A resume is counted once per upload content hash: re-runs, re-uploads
+and a PIPELINE_VERSION bump do not count it again. Benchmarks set
+PHRASE_STATS_DISABLED=1 (or a scratch PHRASE_STATS_PATH).
+
+Configuration:
+  PHRASE_STATS_PATH      sqlite file (default cache/phrase_stats.sqlite3)
+  PHRASES_VIEW_TOP_K     phrases kept in the view (default 32; 0 keeps all)
+  PHRASE_STATS_DISABLED  "1": no table, the view keeps every phrase
+"""
+import math
+import os
+import sqlite3
+import threading
+from typing import Dict, Iterable, List, Optional, Tuple
+
+DEFAULT_STATS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "cache", "phrase_stats.sqlite3")
+DEFAULT_TOP_K = 32
+_QUERY_CHUNK = 500      # SQLite host-parameter limit is 999 on old builds
+
+
+class PhraseStats:
+    def __init__(self, path: Optional[str] = None):
+        self.path = path or os.getenv("PHRASE_STATS_PATH", DEFAULT_STATS_PATH)
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS df (phrase TEXT PRIMARY KEY, n INTEGER NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS counters (name TEXT PRIMARY KEY, value INTEGER NOT NULL)"
+        )
+        self._conn.execute("CREATE TABLE IF NOT EXISTS documents (doc_key TEXT PRIMARY KEY)")
+        self._conn.commit()
+
+    def observe(self, phrases: Iterable[str], doc_key: str) -> bool:
+        """
+        Count one more document containing these phrases, unless doc_key
+        (the upload's content hash) was counted before. True if counted.
+        """
+        keys = sorted({p.lower() for p in phrases})
+        with self._lock:
+            seen = self._conn.execute(
+                "INSERT OR IGNORE INTO documents (doc_key) VALUES (?)", (doc_key,)
+            ).rowcount == 0
+            if seen:
+                self._conn.commit()
+                return False
+            self._conn.executemany(
+                "INSERT INTO df (phrase, n) VALUES (?, 1) "
+                "ON CONFLICT(phrase) DO UPDATE SET n = n + 1",
+                [(k,) for k in keys],
+            )
+            self._conn.execute(
+                "INSERT INTO counters (name, value) VALUES ('documents', 1) "
+                "ON CONFLICT(name) DO UPDATE SET value = value + 1"
+            )
+            self._conn.commit()
+        return True
+
+    def document_frequencies(self, phrases: Iterable[str]) -> Tuple[int, Dict[str, int]]:
+        """
+        (documents observed, {lowercased phrase: documents containing it}).
+        Phrases never observed are left out.
+        """
+        keys = list({p.lower() for p in phrases})
+        df: Dict[str, int] = {}
+        with self._lock:
+            row = self._conn.execute("SELECT value FROM counters WHERE name = 'documents'").fetchone()
+            for i in range(0, len(keys), _QUERY_CHUNK):
+                chunk = keys[i:i + _QUERY_CHUNK]
+                df.update(self._conn.execute(
+                    f"SELECT phrase, n FROM df WHERE phrase IN ({','.join('?' * len(chunk))})", chunk
+                ))
+        return (row[0] if row else 0), df
+
+    def top_phrases(self, phrases: List[str], k: int, full_text: str = "") -> List[str]:
+        """
+        The k best phrases by (1 + ln tf) * idf, in their original order;
+        ties keep the earlier phrase.
+        """
+        if k <= 0 or len(phrases) <= k:
+            return list(phrases)
+        n_docs, df = self.document_frequencies(phrases)
+        text = full_text.lower()
+
+        def score(phrase: str) -> float:
+            key = phrase.lower()
+            tf = max(1, text.count(key))
+            idf = math.log((1 + n_docs) / (1 + df.get(key, 0))) + 1
+            return (1 + math.log(tf)) * idf
+
+        scores = [score(p) for p in phrases]
+        best = sorted(range(len(phrases)), key=lambda i: -scores[i])[:k]
+        return [phrases[i] for i in sorted(best)]
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+_stats: Optional[PhraseStats] = None
+_stats_lock = threading.Lock()
+
+
+def stats_disabled() -> bool:
+    return os.getenv("PHRASE_STATS_DISABLED", "0").lower() in ("1", "true", "yes")
+
+
+def get_phrase_stats() -> Optional[PhraseStats]:
+    """
+    Process-wide table, opened on first use; None when disabled.
+    """
+    global _stats
+    if stats_disabled():
+        return None
+    if _stats is None:
+        with _stats_lock:
+            if _stats is None:
+                _stats = PhraseStats()
+    return _stats
+
+
+def select_view_phrases(signals: Dict[str, object], doc_key: Optional[str] = None) -> List[str]:
+    """
+    Record the resume's phrases in the table (once per doc_key, the
+    upload's content hash; not at all without one), then return the ones
+    its phrases view should keep (see module docstring).
+    """
+    phrases = list(signals.get("phrases", []) or [])
+    stats = get_phrase_stats()
+    k = int(os.getenv("PHRASES_VIEW_TOP_K", DEFAULT_TOP_K))
+    if stats is None or not phrases:
+        return phrases
+    if doc_key is not None:
+        stats.observe(phrases, doc_key)
+    return stats.top_phrases(phrases, k, str(signals.get("full_text", "") or ""))
@@ -0,0 +1,245 @@
+# postprocessing/ai_extraction.py
+"""
+One LLM round-trip per resume for every field the AI fills in.
+
+profile_parser.extract_with_ai (name / location / summary) and
+skills_categorizer.extract_skills_with_ai used to be two separate calls.
+extract_resume_fields_with_ai asks for all of them in one prompt and
+checks the reply against a single schema. build_final_resume routes the
+pieces back into parse_profile / categorize_skills, so the final resume
+schema is unchanged.
+
+Profile fields are only requested when the rule-based extractor is not
+confident about them (postprocessing.profile_extractor), and skills only
+when the keyword taxonomy would have fallen back to the AI anyway. The
+call count per resume is 0 or 1 (never 2). Bulk runs go further:
+extract_resume_fields_batch packs several resumes into one prompt.
+
+AI_COMBINED_EXTRACTION=0 restores the separate per-field calls.
+"""
+import json
+import os
+
+from resume_extractor.ai_service import BATCH_FAILED, generate_ai_batch, generate_ai_content
+from resume_extractor.prompt_budget import pack_lines
+from postprocessing.profile_extractor import EMAIL, PHONE, PROFILE_FIELDS, URL
+from postprocessing.skills_categorizer import skills_prompt_context
+
+PROFILE_CONTEXT_TOKENS = 300   # about what the old 20-line header sent
+
+
+def combined_extraction_enabled() -> bool:
+    return os.getenv("AI_COMBINED_EXTRACTION", "1").lower() not in ("0", "false", "no")
+
+
+_FIELD_TASKS = {
+    "name": "Name",
+    "location": "Location (City, Country)",
+    "summary": (
+        "Summary (A short 2-3 sentence professional bio/summary based on the text. "
+        "**ALWAYS** generate a professional summary based on the role/experience, "
+        "even if no explicit summary section exists)"
+    ),
+}
+_FIELD_EXAMPLES = {
+    "name": '"name": "Name Here"',
+    "location": '"location": "City, Country"',
+    "summary": '"summary": "Professional summary here..."',
+}
+
+
+_SKILLS_TASK = (
+    "Skills (a list of professional skills from the skills text below: "
+    "technical, management, soft skills, and tools)"
+)
+_SKILLS_EXAMPLE = '"skills": ["Skill1", "Skill2"]'
+
+
+def profile_prompt_context(profile_lines, token_budget=None):
+    """
+    Header lines in document order, up to the token budget
+    (AI_PROFILE_CONTEXT_TOKENS, default 300), without contact details the
+    regexes already extract or duplicate lines.
+    """
+    if token_budget is None:
+        token_budget = int(os.getenv("AI_PROFILE_CONTEXT_TOKENS", PROFILE_CONTEXT_TOKENS))
+    return "\n".join(pack_lines(profile_lines, token_budget, drop=(EMAIL, PHONE, URL)))
+
+
+def _context(profile_lines, skills_text, fields):
+    # skills_text: one skills entry per line (see skills_prompt_context)
+    header_context = ""
+    if fields:
+        header_context = f"\nResume Header/Context:\n{profile_prompt_context(profile_lines)}\n"
+    skills_context = ""
+    if skills_text is not None:
+        skills_context = f"\nSkills Text:\n{skills_prompt_context(skills_text)}\n"
+    return header_context + skills_context
+
+
+def build_prompt(profile_lines, skills_text=None, fields=PROFILE_FIELDS):
+    """
+    fields: the profile fields to ask for (the rule-based extractor in
+    postprocessing.profile_extractor already has the rest).
+    """
+    tasks = [_FIELD_TASKS[f] for f in fields]
+    examples = [_FIELD_EXAMPLES[f] for f in fields]
+    if skills_text is not None:
+        tasks.append(_SKILLS_TASK)
+        examples.append(_SKILLS_EXAMPLE)
+
+    task_list = "\n    ".join(f"{i}. {t}" for i, t in enumerate(tasks, 1))
+
+    return f"""
+    Extract the following from this resume:
+    {task_list}
+    {_context(profile_lines, skills_text, fields)}
+    Return ONLY valid JSON in this format:
+    {{ {", ".join(examples)} }}
+
+    If not found, use null for fields{" and [] for skills" if skills_text is not None else ""}.
+    """
+
+
+def build_batch_instructions():
+    """
+    Task description shared by every resume in a batched prompt (see
+    extract_resume_fields_batch). Each item names the fields it wants.
+    """
+    fields = "\n    ".join(
+        f"- {name}: {task}"
+        for name, task in [*_FIELD_TASKS.items(), ("skills", _SKILLS_TASK)]
+    )
+    examples = ", ".join([*_FIELD_EXAMPLES.values(), _SKILLS_EXAMPLE])
+    return f"""Each item below is one resume. Extract the fields listed on its "Fields:" line:
+    {fields}
+
+    The JSON object for an item has exactly the fields it lists, e.g.
+    {{ {examples} }}
+    If not found, use null for fields and [] for skills."""
+
+
+def build_batch_item(profile_lines, skills_text=None, fields=PROFILE_FIELDS):
+    wanted = [*fields, *(["skills"] if skills_text is not None else [])]
+    return f"Fields: {', '.join(wanted)}\n{_context(profile_lines, skills_text, fields).strip()}"
+
+
+def validate_response(data, want_skills, fields=PROFILE_FIELDS):
+    """
+    Check a decoded reply against the combined schema.
+
+    Returns {"profile": {...} | None, "skills": [...] | None}. The profile is
+    None when the reply is not a JSON object, otherwise it holds exactly
+    the requested fields; those that are not strings become null.
+    Non-string skills are dropped, and skills is [] when the list is
+    missing or malformed. skills is None when skills were not requested.
+    """
+    if not isinstance(data, dict):
+        return {"profile": None, "skills": [] if want_skills else None}
+
+    profile = {}
+    for field in fields:
+        value = data.get(field)
+        profile[field] = value if isinstance(value, str) else None
+
+    skills = None
+    if want_skills:
+        raw = data.get("skills")
+        skills = [s for s in raw if isinstance(s, str)] if isinstance(raw, list) else []
+
+    return {"profile": profile, "skills": skills}
+
+
+def decode_reply(response_text):
+    # The JSON value of a reply, markdown fences stripped; None if it does not parse
+    text = response_text.replace("```json", "").replace("```", "").strip()
+    try:
+        return json.loads(text)
+    except ValueError:
+        return None
+
+
+def extract_resume_fields_with_ai(profile_lines, skills_text=None, fields=PROFILE_FIELDS):
+    """
+    The requested profile fields and (when skills_text is given) skills in
+    one AI call. On any failure the profile is None and skills is [], which
+    is what the separate calls return when they fail. Nothing to ask for
+    means no call at all.
+    """
+    want_skills = skills_text is not None
+    if not fields and not want_skills:
+        return {"profile": {}, "skills": None}
+    try:
+        # Only complete replies are cached
+        response_text = generate_ai_content(
+            build_prompt(profile_lines, skills_text, fields),
+            validate=lambda text: _slot_complete(decode_reply(text), want_skills, fields),
+        )
+        if not response_text:
+            return validate_response(None, want_skills, fields)
+
+        text = response_text.replace("```json", "").replace("```", "").strip()
+        return validate_response(json.loads(text), want_skills, fields)
+    except Exception as e:
+        print(f"[ERROR] AI Combined Extraction Failed: {e}")
+        return validate_response(None, want_skills, fields)
+
+
+def _slot_complete(data, want_skills, fields):
+    # A batched slot is trusted only if it answers everything it was asked
+    if not isinstance(data, dict) or any(f not in data for f in fields):
+        return False
+    return not want_skills or isinstance(data.get("skills"), list)
+
+
+def extract_resume_fields_batch(jobs):
+    """
+    extract_resume_fields_with_ai for many resumes at once (bulk
+    ingestion): jobs is [(profile_lines, skills_text, fields)], and the
+    result list lines up with it.
+
+    Resumes are packed into shared prompts within a token budget (see
+    ai_service.generate_ai_batch). A resume whose slot is missing or
+    malformed in a reply that did parse is retried on its own with the
+    regular prompt. A prompt that failed as a whole (the call already
+    retried and failed over) is not multiplied into one call per resume:
+    its resumes get the failed-call result, as a single call would.
+    Jobs with nothing to ask make no call.
+    """
+    results = [None] * len(jobs)
+    asked = []
+    for i, (profile_lines, skills_text, fields) in enumerate(jobs):
+        if fields or skills_text is not None:
+            asked.append(i)
+        else:
+            results[i] = extract_resume_fields_with_ai(profile_lines, skills_text, fields)
+
+    try:
+        slots = generate_ai_batch(
+            [build_batch_item(*jobs[i]) for i in asked],
+            build_batch_instructions(),
+            validate_slot=lambda k, slot: _slot_complete(
+                slot, jobs[asked[k]][1] is not None, jobs[asked[k]][2]
+            ),
+        )
+    except Exception as e:
+        print(f"[ERROR] AI Batch Extraction Failed: {e}")
+        slots = [BATCH_FAILED] * len(asked)
+
+    retried = failed = 0
+    for i, slot in zip(asked, slots):
+        profile_lines, skills_text, fields = jobs[i]
+        want_skills = skills_text is not None
+        if slot is BATCH_FAILED:
+            failed += 1
+            results[i] = validate_response(None, want_skills, fields)
+        elif _slot_complete(slot, want_skills, fields):
+            results[i] = validate_response(slot, want_skills, fields)
+        else:
+            retried += 1
+            results[i] = extract_resume_fields_with_ai(profile_lines, skills_text, fields)
+
+    if asked:
+        print(f"[INFO] AI batch: {len(asked)} resumes, {retried} retried individually, "
+              f"{failed} in failed prompts")
+    return results
@@ -1,25 +1,111 @@
 from postprocessing.education_normalizer import normalize_education
-from postprocessing.skills_categorizer import categorize_skills
+from postprocessing.skills_categorizer import categorize_skills, match_skill_keywords, skills_need_ai
 from postprocessing.profile_parser import parse_profile
+from postprocessing.profile_extractor import extract_profile_fields, fields_needing_ai
+from postprocessing.ai_extraction import (
+    combined_extraction_enabled, extract_resume_fields_batch, extract_resume_fields_with_ai
+)
+from stage_profiler import stage
 
-def build_final_resume(structured):
+
+def rule_based_fields(structured):
     """
-    FINAL OUTPUT CONTRACT (v1 – frozen):
-    This schema feeds the MATCHING ENGINE.
+    The rule-based results every later step needs, computed once per resume:
+      {"profile": extract_profile_fields(...), "skills": match_skill_keywords(...)}
+    Pass it as rules= to request_ai_fields / build_base_resume / build_final_resume.
     """
+    profile = structured.get("profile", {})
+    profile_raw = profile.get("raw", [])
+    with stage("rule_based_fields"):
+        return {
+            "profile": extract_profile_fields(profile_raw, profile.get("header") or profile_raw),
+            "skills": match_skill_keywords(structured.get("skills", {}).get("raw", [])),
+        }
 
-    final = {
-        "profile": parse_profile(
-            structured.get("profile", {}).get("raw", [])
-        ),
-        "education": normalize_education(
+
+def _ai_job(structured, rules):
+    # (context lines, skills text or None, profile fields) to ask the AI for.
+    # Only the profile fields the rule-based extractor is unsure of, and
+    # skills only if the keywords fall short (and the local classifier is
+    # off). Often that is nothing.
+    profile = structured.get("profile", {})
+    header = profile.get("header") or profile.get("raw", [])
+    skills_raw = structured.get("skills", {}).get("raw", [])
+
+    fields = fields_needing_ai(rules["profile"])
+    want_skills = skills_need_ai(skills_raw, rules["skills"])
+    return header, "\n".join(skills_raw) if want_skills else None, fields
+
+
+def _as_kwargs(result):
+    return {"profile": {"ai_data": result["profile"]}, "skills": {"ai_skills": result["skills"]}}
+
+
+def request_ai_fields(structured, rules=None):
+    """
+    The one combined AI call for this resume (see postprocessing.ai_extraction),
+    as keyword arguments for parse_profile / categorize_skills:
+      {"profile": {"ai_data": ...}, "skills": {"ai_skills": ...}}
+    Both are empty when combined extraction is off, so each makes its own call.
+    No call is made when nothing needs the AI.
+    rules: rule_based_fields(structured), if already computed.
+    """
+    if not combined_extraction_enabled():
+        return {"profile": {}, "skills": {}}
+
+    if rules is None:
+        rules = rule_based_fields(structured)
+    with stage("ai_extraction"):
+        result = extract_resume_fields_with_ai(*_ai_job(structured, rules))
+    return _as_kwargs(result)
+
+
+def ai_fields_complete(ai_fields):
+    """
+    False when the AI call behind ai_fields was made and failed, so the
+    resume built from them carries rule-based values only.
+    """
+    return ai_fields["profile"].get("ai_data", {}) is not None
+
+
+def request_ai_fields_batch(structured_list, rules_list=None):
+    """
+    request_ai_fields for many resumes, sharing prompts between them
+    (extract_resume_fields_batch). Used by bulk ingestion.
+    """
+    if not combined_extraction_enabled():
+        return [{"profile": {}, "skills": {}} for _ in structured_list]
+
+    if rules_list is None:
+        rules_list = [rule_based_fields(s) for s in structured_list]
+    with stage("ai_extraction_batch"):
+        results = extract_resume_fields_batch(
+            [_ai_job(s, r) for s, r in zip(structured_list, rules_list)]
+        )
+    return [_as_kwargs(r) for r in results]
+
+
+def build_base_resume(structured, rules=None):
+    """
+    The part of the final resume that never waits on the AI: every section
+    taken from the PDF, plus "skills" when the keyword taxonomy (or the
+    local skill classifier) is enough on its own. No "profile".
+    rules: rule_based_fields(structured), if already computed.
+    """
+    if rules is None:
+        rules = rule_based_fields(structured)
+    skills_raw = structured.get("skills", {}).get("raw", [])
+    phrases = structured.get("signals", {}).get("phrases", [])
+
+    with stage("normalize_education"):
+        education = normalize_education(
             structured.get("education", [])
-        ),
+        )
+
+    base = {
+        "education": education,
         "experience": structured.get("experience", []),
         "projects": structured.get("projects", []),
-        "skills": categorize_skills(
-            structured.get("skills", {}).get("raw", [])
-        ),
         "certifications": structured.get("certifications", []),
         "other": structured.get("other", []),
         "signals": structured.get("signals", {
@@ -28,4 +114,56 @@ def build_final_resume(structured):
         })
     }
 
+    if not skills_need_ai(skills_raw, rules["skills"]):
+        with stage("categorize_skills"):
+            base["skills"] = categorize_skills(skills_raw, phrases=phrases,
+                                               categorized=rules["skills"])
+    return base
+
+
+def build_final_resume(structured, ai_fields=None, base=None, rules=None):
+    """
+    FINAL OUTPUT CONTRACT (v1 – frozen):
+    This schema feeds the MATCHING ENGINE.
+
+    ai_fields / base / rules: results of request_ai_fields /
+    build_base_resume / rule_based_fields when the caller already ran them
+    (possibly concurrently); computed here otherwise.
+    """
+    if rules is None:
+        rules = rule_based_fields(structured)
+    if base is None:
+        base = build_base_resume(structured, rules)
+    if ai_fields is None:
+        ai_fields = request_ai_fields(structured, rules)
+
+    with stage("parse_profile"):
+        profile = parse_profile(
+            structured.get("profile", {}).get("raw", []),
+            header_lines=structured.get("profile", {}).get("header"),
+            extracted=rules["profile"],
+            **ai_fields["profile"]
+        )
+
+    skills = base.get("skills")
+    if skills is None:
+        with stage("categorize_skills"):
+            skills = categorize_skills(
+                structured.get("skills", {}).get("raw", []),
+                phrases=base["signals"].get("phrases", []),
+                categorized=rules["skills"],
+                **ai_fields["skills"]
+            )
+
+    final = {
+        "profile": profile,
+        "education": base["education"],
+        "experience": base["experience"],
+        "projects": base["projects"],
+        "skills": skills,
+        "certifications": base["certifications"],
+        "other": base["other"],
+        "signals": base["signals"]
+    }
+
     return final
@@ -1,5 +1,6 @@
 import re
-from typing import List, Dict, Any
+from functools import lru_cache
+from typing import List, Dict, Any, Optional, Tuple
 
 STOPWORDS = {
     "and", "or", "with", "using", "for", "of", "in", "to", "on", "by"
@@ -7,56 +8,125 @@ STOPWORDS = {
 
 PHRASE_SPLIT_RE = re.compile(r"[•|,\n;/()]+")
 
-CAPITAL_PHRASE_RE = re.compile(
-    r"\b([A-Z][a-z]+(?:\s+[A-Z][a-z]+){0,4})\b"
-)
-
 TECH_LIKE_RE = re.compile(
     r"\b([A-Za-z0-9\+\#\.\-]{2,})\b"
 )
 
+# One scan per text: whitespace-separated tokens, and the PHRASE_SPLIT_RE
+# characters (one at a time) as chunk breaks
+_TOKEN_RE = re.compile(r"[^\s•|,;/()]+|[•|,;/()\n]")
+_CHUNK_BREAKS = frozenset("•|,;/()\n")
+_WORD_RUN_RE = re.compile(r"\w+")
+_CAP_WORD_RE = re.compile(r"[A-Z][a-z]+")
+CAPITAL_PHRASE_MAX_WORDS = 5
+
+
 def _normalize(text: str) -> str:
     return re.sub(r"\s+", " ", text).strip()
 
-def _extract_from_text(text: str) -> List[str]:
-    phrases = []
-    chunks = PHRASE_SPLIT_RE.split(text)
 
-    for chunk in chunks:
-        chunk = _normalize(chunk)
-        if len(chunk) < 3:
-            continue
+@lru_cache(maxsize=65536)
+def _token_type(token: str) -> Tuple[bool, bool, Optional[str], Optional[str], bool]:
+    """
+    (stopword, tech-like, capitalized word at the start, capitalized word
+    at the end, token is one capitalized word), once per distinct token.
 
-        # Capitalized domain / role phrases
-        for m in CAPITAL_PHRASE_RE.finditer(chunk):
-            p = _normalize(m.group(1))
-            if len(p.split()) >= 2:
-                phrases.append(p)
+    A capitalized word is a whole word of the form "Xxxx" (not "Java8",
+    not "McDonald"). Capitalized phrases are runs of them separated by
+    whitespace only, so only the word touching each end of a token can
+    join its neighbours.
+    """
+    stop = token.lower() in STOPWORDS
+    tech = TECH_LIKE_RE.match(token) is not None
 
-        # Noun / tech phrase builder
-        tokens = chunk.split()
-        buf = []
+    runs = [m.span() for m in _WORD_RUN_RE.finditer(token)]
+    if len(runs) == 1 and runs[0] == (0, len(token)) and _CAP_WORD_RE.fullmatch(token):
+        return stop, tech, token, token, True
 
-        for t in tokens:
-            tl = t.lower()
+    head = tail = None
+    if runs:
+        s, e = runs[0]
+        if s == 0 and _CAP_WORD_RE.fullmatch(token, s, e):
+            head = token[s:e]
+        s, e = runs[-1]
+        if e == len(token) and _CAP_WORD_RE.fullmatch(token, s, e):
+            tail = token[s:e]
+    return stop, tech, head, tail, False
 
-            if tl in STOPWORDS:
-                if len(buf) >= 2:
-                    phrases.append(" ".join(buf))
-                buf = []
+
+class PhraseCollector:
+    """
+    Phrases from many texts, deduplicated as they are added (first
+    occurrence order).
+
+    Each text is tokenized once; a single walk over the tokens builds both
+    kinds of phrase per chunk (text between PHRASE_SPLIT_RE characters):
+      - capitalized domain / role phrases: 2-5 consecutive "Xxxx" words
+        ("Data Science", "Bachelor Of Technology"); longer runs are cut
+        every 5 words
+      - tech phrases: 2+ consecutive tech-like tokens ("Node.js REST APIs"),
+        broken by stopwords and other tokens
+    Within a chunk, capitalized phrases come before tech phrases.
+    """
+
+    def __init__(self):
+        self._phrases: Dict[str, None] = {}     # insertion-ordered set
+
+    @property
+    def phrases(self) -> List[str]:
+        return list(self._phrases)
+
+    def add(self, text: str) -> None:
+        caps: List[str] = []
+        tech: List[str] = []
+        chain: List[str] = []
+        buf: List[str] = []
+
+        for token in _TOKEN_RE.findall(text):
+            if token in _CHUNK_BREAKS:
+                if caps or tech or len(chain) > 1 or len(buf) > 1:
+                    self._end_chunk(caps, tech, chain, buf)
+                    caps, tech = [], []
+                chain, buf = [], []
                 continue
 
-            if TECH_LIKE_RE.match(t):
-                buf.append(t)
+            stop, tech_like, head, tail, whole = _token_type(token)
+
+            # Capitalized phrase: extend the run, or close it
+            if whole:
+                chain.append(token)
             else:
+                if head is not None:
+                    chain.append(head)
+                if len(chain) > 1:
+                    _close_chain(chain, caps)
+                chain = [tail] if tail is not None else []
+
+            # Tech phrase builder
+            if not stop and tech_like:
+                buf.append(token)
+            elif buf:
                 if len(buf) >= 2:
-                    phrases.append(" ".join(buf))
+                    tech.append(" ".join(buf))
                 buf = []
 
+        self._end_chunk(caps, tech, chain, buf)
+
+    def _end_chunk(self, caps, tech, chain, buf) -> None:
+        _close_chain(chain, caps)
         if len(buf) >= 2:
-            phrases.append(" ".join(buf))
+            tech.append(" ".join(buf))
+        for p in caps:
+            self._phrases[p] = None
+        for p in tech:
+            self._phrases[p] = None
 
-    return phrases
+
+def _close_chain(chain: List[str], out: List[str]) -> None:
+    for i in range(0, len(chain), CAPITAL_PHRASE_MAX_WORDS):
+        piece = chain[i:i + CAPITAL_PHRASE_MAX_WORDS]
+        if len(piece) >= 2:
+            out.append(" ".join(piece))
 
 
 def extract_phrases(structured_resume: Dict[str, Any]) -> Dict[str, Any]:
@@ -68,7 +138,7 @@ def extract_phrases(structured_resume: Dict[str, Any]) -> Dict[str, Any]:
     Designed for MATCHING ENGINE, not UI perfection.
     """
 
-    phrases: List[str] = []
+    phrases = PhraseCollector()
     full_text_parts: List[str] = []
 
     # ---- Education ----
@@ -80,56 +150,48 @@ def extract_phrases(structured_resume: Dict[str, Any]) -> Dict[str, Any]:
             txt = str(e)
 
         if txt:
-            phrases.extend(_extract_from_text(txt))
+            phrases.add(txt)
             full_text_parts.append(txt)
 
     # ---- Experience ----
     for exp in structured_resume.get("experience", []):
         header = exp.get("header", "")
         if header:
-            phrases.extend(_extract_from_text(header))
+            phrases.add(header)
             full_text_parts.append(header)
 
         for b in exp.get("bullets", []):
-            phrases.extend(_extract_from_text(b))
+            phrases.add(b)
             full_text_parts.append(b)
 
     # ---- Projects ----
     for proj in structured_resume.get("projects", []):
         title = proj.get("title", "")
         if title:
-            phrases.extend(_extract_from_text(title))
+            phrases.add(title)
             full_text_parts.append(title)
 
         for b in proj.get("bullets", []):
-            phrases.extend(_extract_from_text(b))
+            phrases.add(b)
             full_text_parts.append(b)
 
     # ---- Skills (RAW ON PURPOSE) ----
     for s in structured_resume.get("skills", {}).get("raw", []):
-        phrases.extend(_extract_from_text(s))
+        phrases.add(s)
         full_text_parts.append(s)
 
     # ---- Certifications ----
     for c in structured_resume.get("certifications", []):
-        phrases.extend(_extract_from_text(c))
+        phrases.add(c)
         full_text_parts.append(c)
 
     # ---- Other ----
     for o in structured_resume.get("other", []):
-        phrases.extend(_extract_from_text(o))
+        phrases.add(o)
         full_text_parts.append(o)
 
-    # ---- Deduplicate (preserve order) ----
-    seen = set()
-    deduped_phrases = []
-    for p in phrases:
-        if p not in seen:
-            seen.add(p)
-            deduped_phrases.append(p)
-
     structured_resume["signals"] = {
-        "phrases": deduped_phrases,
+        "phrases": phrases.phrases,   # deduplicated as added
         "full_text": _normalize(" ".join(full_text_parts))
     }
 
@@ -0,0 +1,329 @@
+# postprocessing/profile_extractor.py
+"""
+Rule-based profile fields with a confidence per field.
+
+Most resume headers already state everything parse_profile needs: a name
+line, "City, Country", and an email whose local part spells the name.
+extract_profile_fields reads those and scores each field in [0, 1]. Only
+fields under PROFILE_CONFIDENCE_THRESHOLD (default 0.75) go to the LLM.
+
+  name      first name-shaped run of words on a header line. It scores
+            higher when its words also appear in the email address.
+  location  bundled gazetteer (data/gazetteer.json), never from the words
+            taken as the name ("Jack London"). A city followed by its
+            region / country is kept as written, wherever it is in the
+            header. Failing that, a bare city gets its country filled in
+            but stays under the threshold, as does a bare country.
+  summary   prose lines from the profile block (summary / objective
+            text). The LLM writes one only when asked
+            (PROFILE_AI_SUMMARY=1).
+"""
+import json
+import os
+import re
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple
+
+EMAIL = re.compile(r"\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b")
+PHONE = re.compile(r"\+?\d[\d\s\-\(\)]{8,}")
+URL = re.compile(r"https?://\S+")
+
+GAZETTEER_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "gazetteer.json")
+PROFILE_FIELDS = ("name", "location", "summary")
+HEADER_LINES = 6            # name / contact block sits at the very top
+SUMMARY_MAX_LINES = 3
+BARE_CITY_CONFIDENCE = 0.6  # "Austin" alone may be a first name: let the LLM confirm
+
+# Segment separators on contact lines ("Name | City, ST | email")
+_SEGMENT_SPLIT_RE = re.compile(r"\s*(?:[|•·—–;,]|\s{3,})\s*")
+_NAME_TOKEN_RE = re.compile(r"^[A-Z][A-Za-z'\-]*\.?$")
+_SPACED_CAPS_RE = re.compile(r"\b(?:[A-Z] ){3,}[A-Z]\b")   # "G A U R A V"
+_LEADING_BULLET_RE = re.compile(r"^[•·\-\*\s]+")
+_REGION_CODE_RE = re.compile(r"^([A-Z]{2,3})\b")
+_WORD_RE = re.compile(r"[A-Za-z]+")
+# Local part only, apostrophes allowed ("charlie.o'connor@...")
+_EMAIL_LOCAL_RE = re.compile(r"([A-Za-z0-9._%+'\-]+)@[A-Za-z0-9.-]+\.[A-Za-z]{2,}\b")
+
+# Header words that are never part of a person's name
+NAME_STOPWORDS = {
+    "resume", "cv", "curriculum", "vitae", "profile", "summary", "professional",
+    "objective", "career", "contact", "personal", "details", "information",
+    "education", "experience", "skills", "projects", "certifications", "about",
+    "engineer", "developer", "manager", "student", "intern", "analyst",
+    "consultant", "designer", "scientist", "architect", "lead", "senior",
+    "junior", "director", "officer", "assistant", "executive", "specialist",
+    "email", "phone", "mobile", "linkedin", "github", "portfolio", "address",
+}
+
+
+# ---------------- GAZETTEER ----------------
+class Gazetteer:
+    def __init__(self, data: Dict[str, Any]):
+        self.kind: Dict[str, Tuple[str, str]] = {}   # lowercase name → (kind, country)
+        self.region_codes: Dict[str, str] = {}       # "CA" → "United States"
+
+        for country, aliases in data["countries"].items():
+            for n in [country, *aliases]:
+                self.kind[n.lower()] = ("country", country)
+
+        for country, regions in data["regions"].items():
+            names = regions.values() if isinstance(regions, dict) else regions
+            if isinstance(regions, dict):
+                for code in regions:
+                    self.region_codes.setdefault(code, country)
+            for n in names:
+                self.kind.setdefault(n.lower(), ("region", country))
+
+        for country, cities in data["cities"].items():
+            for n in cities:
+                # A city shadows a same-named region ("New York", "Washington")
+                if self.kind.get(n.lower(), ("",))[0] != "country":
+                    self.kind[n.lower()] = ("city", country)
+
+        names = sorted({n for n in self.kind}, key=len, reverse=True)
+        self._place_re = re.compile(
+            r"(?<![\w])(?:" + "|".join(re.escape(n) for n in names) + r")(?![\w])",
+            re.IGNORECASE,
+        )
+
+    def places(self, text: str):
+        """
+        (match, kind, country) for every capitalized place name in text.
+        """
+        for m in self._place_re.finditer(text):
+            if m.group()[0].isupper():
+                kind, country = self.kind[m.group().lower()]
+                yield m, kind, country
+
+    def lookup(self, text: str) -> Optional[Tuple[str, str]]:
+        """
+        (kind, country) if text as a whole is a capitalized place name.
+        """
+        text = text.strip()
+        if text[:1].isupper() and text.lower() in self.kind:
+            return self.kind[text.lower()]
+        if text in self.region_codes:
+            return ("region", self.region_codes[text])
+        return None
+
+
+@lru_cache(maxsize=1)
+def load_gazetteer(path: str = GAZETTEER_PATH) -> Gazetteer:
+    with open(path, "r", encoding="utf-8") as f:
+        return Gazetteer(json.load(f))
+
+
+# ---------------- LOCATION ----------------
+def _place_span(chunk: str, start: int, gaz: Gazetteer) -> Optional[int]:
+    # After "City": ", City2, Region/Country" → end offset of the region or
+    # country; None when no region or country follows
+    pos = start
+    while True:
+        m = re.match(r"\s*,\s*", chunk[pos:])
+        if not m:
+            return None
+        part_start = pos + m.end()
+        code = _REGION_CODE_RE.match(chunk[part_start:])
+        if code and code.group(1) in gaz.region_codes:
+            return part_start + code.end()
+
+        place = next(gaz.places(chunk[part_start:]), None)
+        if place is None or place[0].start() != 0:
+            return None
+        pos = part_start + place[0].end()
+        if place[1] in ("region", "country"):
+            return pos
+
+
+def find_location(lines: List[str],
+                  name_at: Optional[Tuple[int, List[str]]] = None) -> Tuple[Optional[str], float]:
+    """
+    name_at: (header line index, tokens) chosen as the name (see
+    find_name_at); those words are not read as a place.
+    """
+    gaz = load_gazetteer()
+    bare = fallback = (None, 0.0)
+
+    for i, line in enumerate(lines[:HEADER_LINES]):
+        if name_at is not None and i == name_at[0]:
+            line = _without_name(line, name_at[1])
+        for chunk in re.split(r"\s*[|•·—–;]\s*", line):
+            for m, kind, country in gaz.places(chunk):
+                if kind == "city":
+                    end = _place_span(chunk, m.end(), gaz)
+                    if end is not None:
+                        return chunk[m.start():end].strip(), 0.95
+                    if bare[0] is None:
+                        bare = (f"{m.group()}, {country}", BARE_CITY_CONFIDENCE)
+                elif fallback[0] is None:
+                    fallback = (m.group(), 0.5)
+    return bare if bare[0] is not None else fallback
+
+
+# ---------------- NAME ----------------
+def _letters(token: str) -> str:
+    return re.sub(r"[^a-z]", "", token.lower())
+
+
+def _email_local(lines: List[str]) -> str:
+    for line in lines:
+        m = _EMAIL_LOCAL_RE.search(line)
+        if m:
+            return _letters(m.group(1))
+    return ""
+
+
+def _strip_trailing_place(tokens: List[str], gaz: Gazetteer) -> List[str]:
+    # "Emma Dupont Paris" → "Emma Dupont"; two words always stay a name
+    # ("Victoria Chad", "Jack London")
+    for n in (3, 2, 1):
+        if len(tokens) - n >= 2 and gaz.lookup(" ".join(tokens[-n:])):
+            return tokens[:-n]
+    return tokens
+
+
+def _clean_header_line(line: str) -> Tuple[str, bool]:
+    # (line without leading bullets, "G A U R A V" joined; whether it was spaced)
+    line = _LEADING_BULLET_RE.sub("", line)
+    spaced = bool(_SPACED_CAPS_RE.search(line))
+    return _SPACED_CAPS_RE.sub(lambda m: m.group().replace(" ", ""), line), spaced
+
+
+def _without_name(line: str, tokens: List[str]) -> str:
+    # The name tokens lead the line (see _name_candidate)
+    line, _ = _clean_header_line(line)
+    m = re.match(r"\s*" + r"\s+".join(map(re.escape, tokens)), line)
+    return line[m.end():] if m else line
+
+
+def _name_candidate(line: str, gaz: Gazetteer) -> Tuple[List[str], bool]:
+    line, spaced = _clean_header_line(line)
+
+    segment = _SEGMENT_SPLIT_RE.split(line, maxsplit=1)[0]
+    tokens = []
+    for tok in segment.split():
+        if not _NAME_TOKEN_RE.match(tok):
+            break
+        tokens.append(tok)
+
+    if not tokens or gaz.lookup(" ".join(tokens)):
+        return [], spaced
+    return _strip_trailing_place(tokens, gaz), spaced
+
+
+def _score_name(tokens: List[str], local: str, first_line: bool, spaced: bool) -> float:
+    n = len(tokens)
+    score = 0.6 if 2 <= n <= 4 else 0.3 if n == 1 else 0.2
+    if spaced:
+        score -= 0.1
+    in_email = sum(1 for t in tokens if len(_letters(t)) > 1 and _letters(t) in local)
+    if local and in_email >= 2:
+        score += 0.3
+    elif local and in_email == 1:
+        score += 0.1
+    if first_line:
+        score += 0.1
+    return min(score, 1.0)
+
+
+def _display_name(tokens: List[str]) -> str:
+    return " ".join(t.title() if t.isupper() and len(t) > 1 else t for t in tokens)
+
+
+def find_name(lines: List[str]) -> Tuple[Optional[str], float]:
+    name, score, _ = find_name_at(lines)
+    return name, score
+
+
+def find_name_at(lines: List[str]) -> Tuple[Optional[str], float, Optional[Tuple[int, List[str]]]]:
+    """
+    find_name plus where the name was read: (header line index, tokens).
+    """
+    gaz = load_gazetteer()
+    local = _email_local(lines)
+    best, best_score, best_at = None, 0.0, None
+
+    for i, line in enumerate(lines[:HEADER_LINES]):
+        tokens, spaced = _name_candidate(line, gaz)
+        if not tokens or any(t.lower().strip(".") in NAME_STOPWORDS for t in tokens):
+            continue
+
+        if len(tokens) > 4 and local:
+            # "Firstname Lastname Somewhere Else": keep the part the email spells
+            prefix = []
+            for t in tokens:
+                if _letters(t) not in local:
+                    break
+                prefix.append(t)
+            if len(prefix) >= 2:
+                tokens = prefix
+
+        score = _score_name(tokens, local, first_line=(i == 0), spaced=spaced)
+        if score > best_score:
+            best, best_score, best_at = _display_name(tokens), score, (i, tokens)
+    return best, best_score, best_at
+
+
+# ---------------- SUMMARY ----------------
+def find_summary(lines: List[str]) -> Tuple[Optional[str], float]:
+    prose = []
+    for line in lines:
+        if EMAIL.search(line) or URL.search(line) or PHONE.search(line):
+            continue
+        words = _WORD_RE.findall(line)
+        if len(words) < 8 or sum(map(len, words)) < 0.6 * len(line.replace(" ", "")):
+            continue
+        prose.append(line.lstrip(".•· ").strip())
+        if len(prose) == SUMMARY_MAX_LINES:
+            break
+
+    if not prose:
+        return None, 0.0
+    return " ".join(prose), 0.8
+
+
+# ---------------- ENTRY POINT ----------------
+def extract_profile_fields(raw_lines: List[str],
+                           header_lines: Optional[List[str]] = None) -> Dict[str, Dict[str, Any]]:
+    """
+    raw_lines: profile block (structured["profile"]["raw"])
+    header_lines: every line above the first section, headers included
+    (structured["profile"]["header"]); defaults to raw_lines.
+
+    Returns {"fields": {name, location, summary}, "confidence": {same keys}}.
+    """
+    lines = header_lines or raw_lines
+    name, name_score, name_at = find_name_at(lines)
+    found = {
+        "name": (name, name_score),
+        "location": find_location(lines, name_at),
+        "summary": find_summary(raw_lines),
+    }
+    return {
+        "fields": {k: v for k, (v, _) in found.items()},
+        "confidence": {k: round(c, 2) for k, (_, c) in found.items()},
+    }
+
+
+def confidence_threshold() -> float:
+    try:
+        return float(os.getenv("PROFILE_CONFIDENCE_THRESHOLD", "0.75"))
+    except ValueError:
+        return 0.75
+
+
+def ai_summary_requested() -> bool:
+    return os.getenv("PROFILE_AI_SUMMARY", "0").lower() in ("1", "true", "yes")
+
+
+def fields_needing_ai(extracted: Dict[str, Dict[str, Any]],
+                      ai_summary: Optional[bool] = None) -> Tuple[str, ...]:
+    """
+    Profile fields to ask the LLM for: name / location below the confidence
+    threshold, plus summary when an AI summary is requested.
+    """
+    threshold = confidence_threshold()
+    needed = [f for f in ("name", "location") if extracted["confidence"][f] < threshold]
+    if ai_summary if ai_summary is not None else ai_summary_requested():
+        needed.append("summary")
+    return tuple(needed)
@@ -1,14 +1,11 @@
 # postprocessing/profile_parser.py
-import re
-import os
-import json
-# Import unified AI service
-from resume_extractor.ai_service import generate_ai_content
+from postprocessing.ai_extraction import extract_resume_fields_with_ai
+from postprocessing.profile_extractor import (
+    EMAIL, PHONE, URL, PROFILE_FIELDS, extract_profile_fields, fields_needing_ai
+)
 
-# Patterns for regex fallback
-EMAIL = re.compile(r"\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b")
-PHONE = re.compile(r"\+?\d[\d\s\-\(\)]{8,}")
-URL = re.compile(r"https?://\S+")
+# parse_profile default: make its own AI call
+_ASK_AI = object()
 
 def extract_links(lines):
     links = []
@@ -16,83 +13,54 @@ def extract_links(lines):
         links.extend(URL.findall(l))
     return list(dict.fromkeys(links))
 
-def extract_with_ai(lines):
+def extract_with_ai(lines, fields=PROFILE_FIELDS):
     """
-    Uses AI (OpenRouter/OpenAI/Gemini) to intelligently extract Name, Location, and Summary.
+    Uses AI (OpenRouter/OpenAI/Gemini) to extract the given profile fields
+    (name, location, summary) from the resume header.
     """
-    try:
-        # Context: Top 20 lines of resume
-        header_text = "\n".join(lines[:20])
-        
-        prompt = f"""
-        Extract the following form this resume header text:
-        1. Name
-        2. Location (City, Country)
-        3. Summary (A short 2-3 sentence professional bio/summary based on the text. **ALWAYS** generate a professional summary based on the role/experience, even if no explicit summary section exists).
-        
-        Resume Header/Context:
-        {header_text}
-        
-        Return ONLY valid JSON in this format:
-        {{ "name": "Name Here", "location": "City, Country", "summary": "Professional summary here..." }}
-        
-        If not found, use null for fields.
-        """
-        
-        response_text = generate_ai_content(prompt)
-        if not response_text:
-            return None
-        
-        # Parse JSON from response
-        text = response_text.replace("```json", "").replace("```", "").strip()
-        data = json.loads(text)
-        
-        return data # {name, location, summary}
-    except Exception as e:
-        print(f"[ERROR] AI Extraction Failed: {e}")
-        return None
+    return extract_resume_fields_with_ai(lines, None, fields)["profile"]
 
-def parse_profile(raw_lines):
-    # 1. Try AI Extraction first
-    ai_data = extract_with_ai(raw_lines)
-    
-    # 2. Extract standard fields via Regex (always robust)
+def parse_profile(raw_lines, ai_data=_ASK_AI, header_lines=None, extracted=None):
+    """
+    Rule-based fields first (postprocessing.profile_extractor); the AI only
+    fills the fields the rules are not confident about.
+
+    ai_data: result of an AI call already made for this resume (see
+    postprocessing.ai_extraction), or None if it failed or was not needed.
+    Omit it to call extract_with_ai here for the fields that need it.
+    header_lines: every line above the first section (name / contact block).
+    extracted: extract_profile_fields(raw_lines, header_lines), if already
+    computed (left untouched).
+    """
+    if extracted is None:
+        extracted = extract_profile_fields(raw_lines, header_lines)
+    fields = dict(extracted["fields"])
+
+    if ai_data is _ASK_AI:
+        needed = fields_needing_ai(extracted)
+        ai_data = extract_with_ai(header_lines or raw_lines, needed) if needed else None
+
+    # AI values replace the rule-based guesses for the fields it was asked for
+    for field, value in (ai_data or {}).items():
+        if value:
+            fields[field] = value
+
+    conf = extracted["confidence"]
+    print(
+        f"[INFO] Profile: {fields['name']} ({conf['name']}) | {fields['location']} ({conf['location']})"
+        f"{' | AI: ' + ', '.join(ai_data) if ai_data else ''}"
+    )
+
+    # Standard fields via Regex (always robust)
     email = next((EMAIL.search(l).group() for l in raw_lines if EMAIL.search(l)), None)
     phone = next((PHONE.search(l).group() for l in raw_lines if PHONE.search(l)), None)
-    links = extract_links(raw_lines)
 
-    if ai_data:
-        print(f"[INFO] Gemini Extracted: {ai_data.get('name')} | {ai_data.get('location')}")
-        return {
-            "name": ai_data.get("name"),
-            "email": email,
-            "phone": phone,
-            "location": ai_data.get("location"),
-            "links": links,
-            # Prefer AI summary, fallback to raw lines if null
-            "summary": ai_data.get("summary") or "\n".join(raw_lines)
-        }
-    
-    # 3. Fallback to Regex Heuristic (if API fails or no key)
-    # (Simplified fallback for safety)
     return {
-        "name": _regex_name_fallback(raw_lines),
+        "name": fields["name"],
         "email": email,
         "phone": phone,
-        "location": _regex_location_fallback(raw_lines),
-        "links": links,
-        "summary": "\n".join(raw_lines)  # Add summary fallback
+        "location": fields["location"],
+        "links": extract_links(raw_lines),
+        # Prefer a found / AI summary, fallback to raw lines
+        "summary": fields["summary"] or "\n".join(raw_lines)
     }
-
-def _regex_name_fallback(lines):
-    if not lines: return None
-    first = lines[0].strip()
-    if re.match(r"^[A-Z][a-z]+(?:\s[A-Z][a-z]+)+$", first):
-        return first
-    return None
-
-def _regex_location_fallback(lines):
-    for l in lines:
-        m = re.search(r"(San Francisco|New York|Los Angeles|London|Mumbai|Bangalore|Delhi)", l, re.I)
-        if m: return m.group(1)
-    return None
@@ -25,7 +25,7 @@ def _is_probable_name(text: str) -> bool:
 
 def structure_resume(lines: List[Dict[str, Any]]) -> Dict[str, Any]:
     resume = {
-        "profile": {"raw": []},
+        "profile": {"raw": [], "header": []},
         "education": [],
         "experience": [],
         "projects": [],
@@ -60,12 +60,17 @@ def structure_resume(lines: List[Dict[str, Any]]) -> Dict[str, Any]:
             t = _normalize_text(l.get("text", ""))
             if t:
                 resume["profile"]["raw"].append(t)
+                resume["profile"]["header"].append(t)
         return resume
 
     for l in lines[:first_section_idx]:
+        t = _normalize_text(l.get("text", ""))
+        if t:
+            # Everything above the first section, headers included: an
+            # all-caps name line is often flagged as a header
+            resume["profile"]["header"].append(t)
         if l.get("is_section_header"):
             continue
-        t = _normalize_text(l.get("text", ""))
         if not t:
             continue
         if _is_probable_name(t):
@@ -0,0 +1,169 @@
+# postprocessing/skill_classifier.py
+"""
+Local skill classifier: an on-box stand-in for the LLM skills fallback.
+
+When the taxonomy match finds too few skills, candidate phrases (skills
+section items plus the phrase_extractor signals) are embedded with the
+already-loaded Embedder and matched against every taxonomy name
+(data/skill_taxonomy.json). A candidate whose nearest name has cosine
+similarity of at least SKILL_CLASSIFIER_THRESHOLD (default 0.75) becomes
+that name's canonical skill, in its category.
+
+The taxonomy embeddings are computed once and persisted
+(cache/skill_embeddings.npz, or SKILL_EMBEDDINGS_PATH). The file is keyed
+by model and taxonomy content, so either changing triggers a rebuild.
+After that a resume costs one batched encode of at most
+SKILL_CLASSIFIER_MAX_CANDIDATES (default 64) short phrases plus a matrix
+product.
+
+Enabled by SKILLS_FALLBACK=local; the default ("ai") keeps the LLM call.
+The server calls configure_skill_classifier(embedder, encode_texts=...)
+at startup so classify() shares the EmbeddingService batches.
+
+Experimental: the 0.75 threshold was chosen by hand and has not been
+checked against real MiniLM vectors on the resume corpus. Measure
+precision on a sample of resumes before turning this on, and tune
+SKILL_CLASSIFIER_THRESHOLD to match.
+"""
+import hashlib
+import os
+import re
+from typing import Callable, Dict, Iterable, List, Optional
+
+import numpy as np
+
+from postprocessing.skill_matcher import TAXONOMY_PATH, load_skill_matcher
+
+DEFAULT_EMBEDDINGS_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "cache", "skill_embeddings.npz"
+)
+DEFAULT_THRESHOLD = 0.75
+DEFAULT_MAX_CANDIDATES = 64
+CANDIDATE_MAX_WORDS = 5
+
+# Skills lines: "Label: item, item | item"
+_LABEL_RE = re.compile(r"^[^:]{1,30}:\s*")
+_ITEM_SPLIT_RE = re.compile(r"[•|,\n;/()]+")
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def local_fallback_requested() -> bool:
+    return os.getenv("SKILLS_FALLBACK", "ai").lower() == "local"
+
+
+def skill_candidates(raw_skills: Iterable[str], phrases: Iterable[str] = (),
+                     limit: Optional[int] = None) -> List[str]:
+    """
+    Short phrases that may name a skill, skills section items first, then
+    the extracted phrases; case-insensitive duplicates and phrases the
+    taxonomy already matches whole are left out.
+    """
+    if limit is None:
+        limit = int(os.getenv("SKILL_CLASSIFIER_MAX_CANDIDATES", DEFAULT_MAX_CANDIDATES))
+    matcher = load_skill_matcher()
+    items = [item for line in raw_skills for item in _ITEM_SPLIT_RE.split(_LABEL_RE.sub("", line))]
+
+    seen = set()
+    candidates = []
+    for text in [*items, *phrases]:
+        text = _WHITESPACE_RE.sub(" ", text).strip(" .-")
+        key = text.lower()
+        if len(text) < 2 or len(text.split()) > CANDIDATE_MAX_WORDS or key in seen:
+            continue
+        seen.add(key)
+        found = matcher.find(text)
+        if len(found) == 1 and found[0].start == 0 and found[0].end == len(text):
+            continue
+        candidates.append(text)
+        if len(candidates) == limit:
+            break
+    return candidates
+
+
+class SkillClassifier:
+    def __init__(self, encode_texts: Callable[[List[str]], np.ndarray], model_name: str,
+                 path: Optional[str] = None, threshold: Optional[float] = None):
+        """
+        encode_texts: texts → unit vectors [N, D] (Embedder.encode_texts).
+        """
+        self.encode_texts = encode_texts
+        self.model_name = model_name
+        self.path = path or os.getenv("SKILL_EMBEDDINGS_PATH", DEFAULT_EMBEDDINGS_PATH)
+        self.threshold = threshold if threshold is not None else float(
+            os.getenv("SKILL_CLASSIFIER_THRESHOLD", DEFAULT_THRESHOLD)
+        )
+
+        # One row per taxonomy name: (category, canonical skill)
+        patterns = load_skill_matcher().patterns
+        self.labels = [(category, skill) for _, category, skill, _ in patterns]
+        self._names = [exact or surface for surface, _, _, exact in patterns]
+        self.matrix = self._load_or_build()
+
+    # ---------------- PERSISTED MATRIX ----------------
+    def _key(self) -> str:
+        with open(TAXONOMY_PATH, "rb") as f:
+            taxonomy = hashlib.sha1(f.read()).hexdigest()
+        return f"{self.model_name}|{taxonomy}"
+
+    def _load_or_build(self) -> np.ndarray:
+        key = self._key()
+        try:
+            with np.load(self.path) as data:
+                if str(data["key"]) == key and data["vectors"].shape[0] == len(self._names):
+                    return data["vectors"]
+        except (OSError, KeyError, ValueError):
+            pass
+
+        print(f"[INFO] Embedding {len(self._names)} taxonomy skills for the local classifier...")
+        vectors = np.asarray(self.encode_texts(self._names), dtype=np.float32)
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        # Written aside and renamed: other workers may be reading it
+        tmp = f"{self.path}.{os.getpid()}.tmp.npz"
+        np.savez(tmp, key=np.array(key), vectors=vectors)
+        os.replace(tmp, self.path)
+        return vectors
+
+    # ---------------- CLASSIFY ----------------
+    def classify(self, candidates: List[str]) -> Dict[str, List[str]]:
+        """
+        {category: [canonical skill, ...]} for the candidates whose nearest
+        taxonomy name clears the threshold, each skill once.
+        """
+        if not candidates:
+            return {}
+        sims = np.asarray(self.encode_texts(candidates), dtype=np.float32) @ self.matrix.T
+        best = sims.argmax(axis=1)
+
+        found: Dict[str, List[str]] = {}
+        for row, col in enumerate(best):
+            if sims[row, col] < self.threshold:
+                continue
+            category, skill = self.labels[col]
+            if skill not in found.setdefault(category, []):
+                found[category].append(skill)
+        return found
+
+
+_classifier: Optional[SkillClassifier] = None
+
+
+def configure_skill_classifier(embedder, path: Optional[str] = None,
+                               encode_texts: Optional[Callable[[List[str]], np.ndarray]] = None
+                               ) -> Optional[SkillClassifier]:
+    """
+    Build (or load) the classifier on an already-loaded Embedder when
+    SKILLS_FALLBACK=local; a no-op returning None otherwise.
+    encode_texts: used instead of embedder.encode_texts, e.g.
+    EmbeddingService.encode_threadsafe so stage-graph threads join the
+    server's batches rather than running the model beside them.
+    """
+    global _classifier
+    if not local_fallback_requested():
+        return None
+    _classifier = SkillClassifier(encode_texts or embedder.encode_texts, embedder.model_name,
+                                  path=path)
+    return _classifier
+
+
+def get_skill_classifier() -> Optional[SkillClassifier]:
+    return _classifier
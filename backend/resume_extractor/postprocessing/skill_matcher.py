@@ -0,0 +1,182 @@
+# postprocessing/skill_matcher.py
+"""
+Skill taxonomy matching in one pass over the text.
+
+The taxonomy (data/skill_taxonomy.json) maps category → canonical skill →
+synonyms. Every name, canonical or synonym, is compiled once into an
+Aho-Corasick automaton over lowercased text. Matching is then a single
+linear scan, whatever the number of skills.
+
+Matches respect word boundaries: "java" is not found inside
+"javascript", and "c" is not found inside "c++" or "c#". Overlapping
+matches keep the leftmost, longest one ("react native" over "react").
+Names listed under case_sensitive ("Go", "R", "Excel", ...) match only
+as written, so ordinary words are not taken for skills. The riskiest of
+them (list_item_only: "C", "R", "Go", "Spring", "Swift") must also stand
+alone as a list item: "Java, Go, R" counts, "Spring 2021", "Swift
+delivery", "R&D" and "C-level" do not. Each skill is reported once per
+text ("Java/J2EE" is one java).
+"""
+import json
+import os
+import re
+from functools import lru_cache
+from typing import Any, Dict, Iterator, List, NamedTuple, Tuple
+
+TAXONOMY_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "skill_taxonomy.json")
+
+_WHITESPACE_RE = re.compile(r"\s+")
+_JOINERS = "+#"     # "c" must not match the start of "c++" / "c#"
+_LETTER_JOINERS = "&-"      # a one-letter name glued to these is a word part ("R&D", "C-level")
+_LIST_SEPARATORS = ",;|/:()[]•·*-"
+
+
+class SkillMatch(NamedTuple):
+    start: int
+    end: int
+    category: str
+    skill: str      # canonical name
+
+
+def _lower(text: str) -> str:
+    # Offsets must survive lowercasing; a few characters ("İ") grow
+    lowered = text.lower()
+    if len(lowered) == len(text):
+        return lowered
+    return "".join(c.lower() if len(c.lower()) == 1 else c for c in text)
+
+
+def _is_word(ch: str) -> bool:
+    return ch.isalnum() or ch == "_"
+
+
+class SkillMatcher:
+    def __init__(self, data: Dict[str, Any]):
+        self.categories: List[str] = list(data["categories"])
+        exact = {s.lower(): s for s in data.get("case_sensitive", [])}
+        # Exact forms that only count as a standalone list item
+        self.list_item_only = set(data.get("list_item_only", []))
+
+        # Pattern table: lowercased surface → (category, canonical, exact form or None)
+        self.patterns: List[Tuple[str, str, str, Any]] = []
+        for category, skills in data["categories"].items():
+            for skill, synonyms in skills.items():
+                for name in (skill, *synonyms):
+                    surface = _WHITESPACE_RE.sub(" ", name.lower().strip())
+                    self.patterns.append((surface, category, skill, exact.get(surface)))
+
+        self._build()
+
+    # ---------------- AUTOMATON ----------------
+    def _build(self) -> None:
+        goto: List[Dict[str, int]] = [{}]
+        out: List[List[int]] = [[]]
+
+        for pid, (surface, *_rest) in enumerate(self.patterns):
+            state = 0
+            for ch in surface:
+                nxt = goto[state].get(ch)
+                if nxt is None:
+                    nxt = len(goto)
+                    goto[state][ch] = nxt
+                    goto.append({})
+                    out.append([])
+                state = nxt
+            out[state].append(pid)
+
+        # Failure links, breadth first; outputs inherit their fallback's
+        fail = [0] * len(goto)
+        queue = list(goto[0].values())
+        for state in queue:
+            for ch, nxt in goto[state].items():
+                f = fail[state]
+                while f and ch not in goto[f]:
+                    f = fail[f]
+                fail[nxt] = goto[f].get(ch, 0)
+                out[nxt] = out[nxt] + out[fail[nxt]]
+                queue.append(nxt)
+
+        self._goto, self._fail, self._out = goto, fail, out
+
+    def _scan(self, low: str) -> Iterator[Tuple[int, int, int]]:
+        goto, fail, out = self._goto, self._fail, self._out
+        state = 0
+        for i, ch in enumerate(low):
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            for pid in out[state]:
+                yield i + 1 - len(self.patterns[pid][0]), i + 1, pid
+
+    # ---------------- MATCHING ----------------
+    def _on_boundary(self, text: str, start: int, end: int, surface: str) -> bool:
+        if start > 0 and _is_word(surface[0]) and _is_word(text[start - 1]):
+            return False
+        if end < len(text):
+            after = text[end]
+            if _is_word(after) and _is_word(surface[-1]):
+                return False
+            if after in _JOINERS and _is_word(surface[-1]):
+                return False
+        if len(surface) == 1 and (
+            (start > 0 and text[start - 1] in _LETTER_JOINERS)
+            or (end < len(text) and text[end] in _LETTER_JOINERS)
+        ):
+            return False
+        return True
+
+    @staticmethod
+    def _is_list_item(text: str, start: int, end: int) -> bool:
+        # Only whitespace between the name and a separator / line end, both sides
+        before = text[:start].rstrip()
+        after = text[end:].lstrip()
+        return (not before or before[-1] in _LIST_SEPARATORS) and \
+            (not after or after[0] in _LIST_SEPARATORS)
+
+    def find(self, text: str) -> List[SkillMatch]:
+        """
+        Non-overlapping skill mentions in text, in order of appearance;
+        each skill once, at its first mention.
+        """
+        text = _WHITESPACE_RE.sub(" ", text)
+        candidates = []
+        for start, end, pid in self._scan(_lower(text)):
+            surface, category, skill, exact = self.patterns[pid]
+            if exact is not None and text[start:end] != exact:
+                continue
+            if not self._on_boundary(text, start, end, surface):
+                continue
+            if exact in self.list_item_only and not self._is_list_item(text, start, end):
+                continue
+            candidates.append(SkillMatch(start, end, category, skill))
+
+        # Leftmost-longest: "react native" wins over the "react" inside it
+        candidates.sort(key=lambda m: (m.start, m.start - m.end))
+        matches, covered, seen = [], 0, set()
+        for m in candidates:
+            if m.start >= covered:
+                covered = m.end
+                if (m.category, m.skill) not in seen:
+                    seen.add((m.category, m.skill))
+                    matches.append(m)
+        return matches
+
+    def categorize(self, lines) -> Dict[str, List[str]]:
+        """
+        {category: [canonical skill, ...]} for every category (empty lists
+        included), each skill once, in order of first mention.
+        """
+        categorized = {c: [] for c in self.categories}
+        seen = set()
+        for line in lines:
+            for m in self.find(line):
+                if (m.category, m.skill) not in seen:
+                    seen.add((m.category, m.skill))
+                    categorized[m.category].append(m.skill)
+        return categorized
+
+
+@lru_cache(maxsize=1)
+def load_skill_matcher(path: str = TAXONOMY_PATH) -> SkillMatcher:
+    with open(path, "r", encoding="utf-8") as f:
+        return SkillMatcher(json.load(f))
@@ -1,4 +1,5 @@
 import os
+import re
 import json
 # Import unified AI service
 # Adjust import path based on file structure: 
@@ -6,34 +7,76 @@ import json
 # parent -> postprocessing, parent->parent -> resume_extractor. 
 # So it's from resume_extractor.ai_service
 from resume_extractor.ai_service import generate_ai_content
+from resume_extractor.prompt_budget import pack_lines
+from postprocessing.profile_extractor import EMAIL, PHONE, URL
+from postprocessing.skill_matcher import load_skill_matcher
+from postprocessing.skill_classifier import get_skill_classifier, local_fallback_requested, skill_candidates
+
+SKILLS_CONTEXT_TOKENS = 750   # about what the old text[:3000] cut sent
+
+_SKILL_LABEL_RE = re.compile(
+    r"^\s*(?:technical\s+)?(?:skills?|tools?|technolog(?:y|ies)|languages?|frameworks?|"
+    r"platforms?|databases?|software|competenc(?:y|ies)|expertise)\b",
+    re.IGNORECASE,
+)
+_LIST_SEPARATOR_RE = re.compile(r"[,|•·;/]")
+
+
+def skill_line_priority(line):
+    """
+    How likely a line is to list skills: known keywords, a skills label,
+    and list separators count for it; long prose counts against it.
+    """
+    score = 2 * len(load_skill_matcher().find(line))
+    if _SKILL_LABEL_RE.match(line):
+        score += 3
+    score += min(len(_LIST_SEPARATOR_RE.findall(line)), 3)
+    if len(line.split()) > 25:
+        score -= 2
+    return score
+
+
+def skills_prompt_context(text, token_budget=None):
+    """
+    The skill-bearing lines of text (one per line) that fit in the token
+    budget (AI_SKILLS_CONTEXT_TOKENS, default 750), without contact details
+    or duplicates. See prompt_budget.pack_lines.
+    """
+    if token_budget is None:
+        token_budget = int(os.getenv("AI_SKILLS_CONTEXT_TOKENS", SKILLS_CONTEXT_TOKENS))
+    lines = pack_lines(text.splitlines(), token_budget,
+                       priority=skill_line_priority, drop=(EMAIL, PHONE, URL))
+    return "\n".join(lines)
+
+
+def _is_json_list(response_text):
+    try:
+        return isinstance(json.loads(response_text.replace("```json", "").replace("```", "").strip()), list)
+    except ValueError:
+        return False
 
-SKILL_BUCKETS = {
-    "languages": ["python", "java", "c++", "javascript"],
-    "frameworks": ["react", "spring", "fastapi"],
-    "databases": ["mysql", "postgresql", "mongodb"],
-    "cloud_devops": ["docker", "kubernetes", "aws"],
-    "concepts": ["dsa", "ml", "nlp", "os"]
-}
 
 def extract_skills_with_ai(text):
     """
     Fallback: Use AI (OpenRouter/OpenAI/Gemini) to extract skills.
+    text: the skills section, one entry per line.
     """
     # Limit text to save tokens
-    truncated_text = text[:3000]
+    skills_text = skills_prompt_context(text)
     
     prompt = f"""
     Extract a list of professional skills from this resume text.
     Focus on technical, management, soft skills, and tools.
     
     Resume Text:
-    {truncated_text}
+    {skills_text}
     
     Return ONLY a JSON array of strings. Example: ["Skill1", "Skill2"]
     """
     
     try:
-        response_text = generate_ai_content(prompt)
+        # Only a reply that parses to a list is cached
+        response_text = generate_ai_content(prompt, validate=_is_json_list)
         if not response_text:
             return []
 
@@ -49,25 +92,82 @@ def extract_skills_with_ai(text):
         print(f"[ERROR] AI Skills Extraction Failed: {e}")
         return []
 
-def categorize_skills(raw_skills):
-    categorized = {k: [] for k in SKILL_BUCKETS}
-    
-    # 1. Keyword Matching (Fast, Fixed Taxonomy)
-    for line in raw_skills:
-        lower = line.lower()
-        for bucket, keywords in SKILL_BUCKETS.items():
-            for kw in keywords:
-                if kw in lower:
-                    categorized[bucket].append(kw)
+AI_FALLBACK_THRESHOLD = 3
+FALLBACK_IGNORED_CATEGORIES = ("soft_skills", "spoken_languages")
+
+# categorize_skills default: make its own AI call when needed
+_ASK_AI = object()
+
+
+def match_skill_keywords(raw_skills):
+    """
+    {category: [skill, ...]} from the skill taxonomy (data/skill_taxonomy.json,
+    see postprocessing.skill_matcher), every category present.
+    """
+    return load_skill_matcher().categorize(raw_skills)
+
+
+def needs_ai_fallback(categorized):
+    # Spoken languages and soft skills alone don't make a skills section
+    found = sum(len(v) for k, v in categorized.items() if k not in FALLBACK_IGNORED_CATEGORIES)
+    return found < AI_FALLBACK_THRESHOLD
+
+
+def local_fallback_enabled():
+    # SKILLS_FALLBACK=local and the server has configured the classifier
+    return local_fallback_requested() and get_skill_classifier() is not None
+
+
+def skills_need_ai(raw_skills, categorized=None):
+    """
+    Whether categorize_skills will want the LLM for these lines.
+    categorized: match_skill_keywords(raw_skills), if already computed.
+    """
+    if categorized is None:
+        categorized = match_skill_keywords(raw_skills)
+    return needs_ai_fallback(categorized) and not local_fallback_enabled()
+
+
+def classify_skills_locally(categorized, raw_skills, phrases):
+    # Nearest taxonomy skills to the candidate phrases, merged in place
+    found = get_skill_classifier().classify(skill_candidates(raw_skills, phrases))
+    added = 0
+    for category, skills in found.items():
+        for skill in skills:
+            if skill not in categorized[category]:
+                categorized[category].append(skill)
+                added += 1
+    print(f"[INFO] Skill classifier found {added} additional skills.")
+    return categorized
+
+
+def categorize_skills(raw_skills, ai_skills=_ASK_AI, phrases=(), categorized=None):
+    """
+    ai_skills: skills from an AI call already made for this resume (see
+    postprocessing.ai_extraction). Omit it to call extract_skills_with_ai
+    here when the keyword pass finds too little.
+    phrases: the resume's signals["phrases"], extra candidates for the
+    local classifier (SKILLS_FALLBACK=local, see postprocessing.skill_classifier).
+    categorized: match_skill_keywords(raw_skills), if already computed
+    (left untouched).
+    """
+    # 1. Taxonomy Matching (Fast, one pass per line)
+    if categorized is None:
+        categorized = match_skill_keywords(raw_skills)
+    else:
+        categorized = {k: list(v) for k, v in categorized.items()}
     
     # 2. Check if we missed skills (e.g. non-tech resume or new terms)
-    total_found = sum(len(v) for v in categorized.values())
-    
-    if total_found < 3: # Threshold for fallback
+    if needs_ai_fallback(categorized) and local_fallback_enabled():
+        print("[INFO] Few skills found via keywords. Classifying phrases locally...")
+        return classify_skills_locally(categorized, raw_skills, phrases)
+
+    if needs_ai_fallback(categorized):
         print("[INFO] Few skills found via keywords. Attempting AI fallback...")
-        # Join all raw lines to form context
-        full_text = " ".join(raw_skills)
-        ai_skills = extract_skills_with_ai(full_text)
+        if ai_skills is _ASK_AI:
+            # Join all raw lines to form context
+            full_text = "\n".join(raw_skills)
+            ai_skills = extract_skills_with_ai(full_text)
         
         if ai_skills:
             print(f"[INFO] AI found {len(ai_skills)} additional skills.")
@@ -0,0 +1,101 @@
+# prompt_budget.py
+"""
+Token-budgeted prompt context.
+
+Prompts used to take a fixed slice of the resume (the first 20 header
+lines, the first 3000 characters of skills text). That sends boilerplate
+and repeated lines, and it can cut an entry in half. pack_lines instead:
+
+  - drops text the regexes already capture (emails, phones, URLs) and
+    labels left empty by that ("Email:", "Mobile: |")
+  - drops duplicate lines (repeated headers / footers, case-insensitive)
+  - keeps whole lines only, best first (by an optional priority), until
+    the token budget is spent, then restores document order
+
+Token counts come from tiktoken when it is installed (cl100k_base), or
+else from a local estimate that errs on the high side: a budget of N
+stays within N real tokens.
+"""
+import re
+from typing import Callable, Iterable, List, Optional, Pattern, Sequence
+
+try:
+    import tiktoken
+    _ENCODING = tiktoken.get_encoding("cl100k_base")
+except Exception:   # not installed, or no cached encoding offline
+    _ENCODING = None
+
+_PIECE_RE = re.compile(r"[A-Za-z]+|\d+|[^\sA-Za-z\d]")
+_CONTACT_LABEL_RE = re.compile(
+    r"\b(?:e-?mail|phone|mobile|mob|tel|contact|linkedin|github|portfolio|website|url)\s*[:\-]",
+    re.IGNORECASE,
+)
+_SEPARATOR_RUN_RE = re.compile(r"(?:\s*[|•·;,/—–]\s*){2,}")
+_EDGE_SEPARATORS = " |•·;,/-:—–"
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def count_tokens(text: str) -> int:
+    if _ENCODING is not None:
+        return len(_ENCODING.encode(text))
+    # BPE keeps common words whole and splits long ones; ~4 letters or
+    # 3 digits per token, one per punctuation mark
+    tokens = 0
+    for piece in _PIECE_RE.findall(text):
+        if piece[0].isalpha():
+            tokens += (len(piece) + 3) // 4
+        elif piece[0].isdigit():
+            tokens += (len(piece) + 2) // 3
+        else:
+            tokens += 1
+    return tokens
+
+
+def clean_lines(lines: Iterable[str], drop: Sequence[Pattern] = ()) -> List[str]:
+    """
+    Lines with every `drop` match removed, whitespace and separator runs
+    collapsed, and empty or already-seen lines left out.
+    """
+    seen = set()
+    cleaned = []
+    for line in lines:
+        text = line
+        if drop:
+            for pattern in drop:
+                text = pattern.sub(" ", text)
+            text = _CONTACT_LABEL_RE.sub(" ", text)
+        text = _SEPARATOR_RUN_RE.sub(" | ", text)
+        text = _WHITESPACE_RE.sub(" ", text).strip(_EDGE_SEPARATORS)
+        if not re.search(r"\w", text):
+            continue
+        key = text.lower()
+        if key in seen:
+            continue
+        seen.add(key)
+        cleaned.append(text)
+    return cleaned
+
+
+def pack_lines(lines: Iterable[str], token_budget: int,
+               priority: Optional[Callable[[str], float]] = None,
+               drop: Sequence[Pattern] = ()) -> List[str]:
+    """
+    The cleaned lines (see clean_lines) that fit in token_budget, highest
+    priority first (ties and priority=None: earlier lines first), returned
+    in document order. A line that does not fit is skipped whole; shorter
+    ones after it may still fit.
+    """
+    cleaned = clean_lines(lines, drop)
+    order = range(len(cleaned))
+    if priority is not None:
+        scores = [priority(line) for line in cleaned]
+        order = sorted(order, key=lambda i: -scores[i])
+
+    chosen = []
+    used = 0
+    for i in order:
+        cost = count_tokens(cleaned[i]) + 1     # + newline
+        if used + cost <= token_budget:
+            chosen.append(i)
+            used += cost
+    return [cleaned[i] for i in sorted(chosen)]
@@ -0,0 +1,161 @@
+# provider_health.py
+"""
+Per-provider latency tracking and circuit breaking for LLM calls.
+
+ai_service keeps one ProviderHealth per provider (openrouter / openai /
+gemini) and consults it on every call:
+
+  - allow()        may we call this provider right now?
+  - record(...)    outcome and latency of the call we made
+  - attempt_timeout(...)  how long to give one attempt before failing
+                          over, from the provider's own recent latency
+
+Circuit breaker states:
+  closed     normal operation
+  open       AI_BREAKER_THRESHOLD consecutive failures (timeouts, errors);
+             calls are skipped for AI_BREAKER_COOLDOWN_S
+  half_open  cooldown over: exactly one caller gets through as a probe.
+             Success closes the circuit, failure re-opens it.
+
+Rate refusals (HTTP 429) say nothing about provider health; they are
+counted but never open the circuit.
+"""
+import math
+import os
+import threading
+import time
+from collections import deque
+from typing import Any, Dict, Optional
+
+
+CLOSED, OPEN, HALF_OPEN = "closed", "open", "half_open"
+
+LATENCY_WINDOW = 50         # recent successful calls kept per provider
+MIN_LATENCY_SAMPLES = 5     # before latency is trusted for timeouts
+EWMA_ALPHA = 0.2
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return float(os.getenv(name, default))
+    except ValueError:
+        return default
+
+
+def _percentile(values, q: float) -> float:
+    # Nearest rank, as stage_profiler.percentile; kept here so this module
+    # imports without resume_extractor/ on sys.path
+    ordered = sorted(values)
+    return ordered[max(1, math.ceil(q / 100 * len(ordered))) - 1]
+
+
+def is_timeout(exc: BaseException) -> bool:
+    # openai.APITimeoutError, httpx.*Timeout, google DeadlineExceeded, ...
+    name = type(exc).__name__
+    return isinstance(exc, TimeoutError) or "Timeout" in name or "DeadlineExceeded" in name
+
+
+class ProviderHealth:
+    def __init__(self, name: str, failure_threshold: Optional[int] = None,
+                 cooldown_s: Optional[float] = None):
+        self.name = name
+        self.failure_threshold = failure_threshold or int(_env_float("AI_BREAKER_THRESHOLD", 3))
+        self.cooldown_s = cooldown_s if cooldown_s is not None else _env_float("AI_BREAKER_COOLDOWN_S", 30.0)
+
+        self._lock = threading.Lock()
+        self.state = CLOSED
+        self.consecutive_failures = 0
+        self.opened_at = 0.0
+        self._latencies = deque(maxlen=LATENCY_WINDOW)
+        self.ewma_s: Optional[float] = None
+        self.counts = {"calls": 0, "successes": 0, "failures": 0, "timeouts": 0,
+                       "throttled": 0, "skipped": 0, "opened": 0}
+
+    # ---------------- BREAKER ----------------
+    def allow(self) -> bool:
+        with self._lock:
+            if self.state == CLOSED:
+                return True
+            if self.state == OPEN and time.monotonic() - self.opened_at >= self.cooldown_s:
+                self.state = HALF_OPEN   # this caller is the probe
+                return True
+            self.counts["skipped"] += 1
+            return False
+
+    def available(self) -> bool:
+        """
+        allow() without side effects: would a call be let through now?
+        """
+        with self._lock:
+            return self.state == CLOSED or (
+                self.state == OPEN and time.monotonic() - self.opened_at >= self.cooldown_s
+            )
+
+    def record(self, ok: bool, latency_s: float, timed_out: bool = False,
+               throttled: bool = False) -> None:
+        """
+        throttled: refused for rate (429s, or our own limiter ran out of
+        time). The provider is up, so the breaker ignores it; an unfinished
+        probe hands the probe slot on.
+        """
+        with self._lock:
+            self.counts["calls"] += 1
+            if throttled:
+                self.counts["throttled"] += 1
+                if self.state == HALF_OPEN:
+                    self.state = OPEN   # cooldown already over: next caller probes
+                return
+            if ok:
+                self.counts["successes"] += 1
+                self.consecutive_failures = 0
+                self.state = CLOSED
+                self._latencies.append(latency_s)
+                self.ewma_s = latency_s if self.ewma_s is None else \
+                    EWMA_ALPHA * latency_s + (1 - EWMA_ALPHA) * self.ewma_s
+                return
+
+            self.counts["failures"] += 1
+            if timed_out:
+                self.counts["timeouts"] += 1
+            self.consecutive_failures += 1
+            if self.state == HALF_OPEN or self.consecutive_failures >= self.failure_threshold:
+                if self.state != OPEN:
+                    self.counts["opened"] += 1
+                self.state = OPEN
+                self.opened_at = time.monotonic()
+
+    # ---------------- LATENCY ----------------
+    def p90_s(self) -> Optional[float]:
+        with self._lock:
+            if len(self._latencies) < MIN_LATENCY_SAMPLES:
+                return None
+            return _percentile(self._latencies, 90)
+
+    def attempt_timeout(self, remaining_s: float, last_candidate: bool) -> float:
+        """
+        The last provider gets whatever is left of the deadline. Others are
+        cut off at AI_ATTEMPT_TIMEOUT_S, or sooner once we know their usual
+        latency (AI_ATTEMPT_LATENCY_FACTOR × p90, at least
+        AI_ATTEMPT_MIN_TIMEOUT_S), leaving time to fail over.
+        """
+        if last_candidate:
+            return remaining_s
+        timeout = _env_float("AI_ATTEMPT_TIMEOUT_S", 15.0)
+        p90 = self.p90_s()
+        if p90 is not None:
+            timeout = min(timeout, max(_env_float("AI_ATTEMPT_MIN_TIMEOUT_S", 2.0),
+                                       _env_float("AI_ATTEMPT_LATENCY_FACTOR", 3.0) * p90))
+        return min(remaining_s, timeout)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            latencies = list(self._latencies)
+            stats = dict(self.counts)
+            stats.update({
+                "state": self.state,
+                "consecutive_failures": self.consecutive_failures,
+                "latency_ewma_s": self.ewma_s,
+                "latency_p50_s": _percentile(latencies, 50) if latencies else None,
+                "latency_p90_s": _percentile(latencies, 90) if latencies else None,
+            })
+        return stats
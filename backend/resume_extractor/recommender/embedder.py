@@ -55,7 +55,9 @@ class Embedder:
           "full_text": "..."
         }
         """
-        embeddings = {}
-        for key, text in views.items():
-            embeddings[key] = self.encode_one(text).tolist()
-        return embeddings
+        # One forward pass for all views, not one per view
+        keys = list(views)
+        if not keys:
+            return {}
+        vecs = self.encode_texts([views[k] for k in keys], batch_size=len(keys))
+        return {k: vecs[i].tolist() for i, k in enumerate(keys)}
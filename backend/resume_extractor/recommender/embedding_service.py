@@ -0,0 +1,196 @@
+# recommender/embedding_service.py
+"""
+Cross-request micro-batching for the embedding model.
+
+Each upload used to run its own forward passes, one per view, so
+concurrent uploads kept the model at batch size 1. EmbeddingService
+queues view texts from every in-flight request on an asyncio queue. A
+single dispatcher sends them to the model as one encode call once
+max_batch texts are waiting or the oldest has waited max_wait_ms,
+whichever comes first. It then hands each caller its own vectors.
+
+Encoding runs on one background thread, so the event loop stays free.
+While one batch is in the model, the next one fills up, and batches grow
+with load.
+
+  service = EmbeddingService(embedder)      # EMBED_MAX_BATCH, EMBED_MAX_WAIT_MS
+  await service.start()                     # on the serving loop (app startup)
+  await service.embed_views(views)          # from async code
+  service.embed_views_threadsafe(views)     # from worker threads (build_and_embed)
+  service.encode_threadsafe(texts)          # likewise (skill classifier)
+  await service.stop()
+
+Until start() (or after stop()) calls go straight to the embedder.
+"""
+from __future__ import annotations
+
+import asyncio
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+
+DEFAULT_MAX_BATCH = 64
+DEFAULT_MAX_WAIT_MS = 5.0
+
+_STOP = object()    # queued by stop(): finish the current batch, then exit
+
+
+class EmbeddingService:
+    def __init__(self, embedder, max_batch: Optional[int] = None,
+                 max_wait_ms: Optional[float] = None):
+        self.embedder = embedder
+        self.max_batch = max(1, int(max_batch or os.getenv("EMBED_MAX_BATCH", DEFAULT_MAX_BATCH)))
+        self.max_wait_s = float(
+            max_wait_ms if max_wait_ms is not None else os.getenv("EMBED_MAX_WAIT_MS", DEFAULT_MAX_WAIT_MS)
+        ) / 1000.0
+        self.batches = 0
+        self.texts = 0
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread: Optional[int] = None
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    # ---------------- LIFECYCLE ----------------
+    async def start(self) -> None:
+        if self.running:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._loop_thread = threading.get_ident()
+        self._queue = asyncio.Queue()
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="embed")
+        self._task = asyncio.create_task(self._dispatch())
+
+    async def stop(self) -> None:
+        if not self.running:
+            return
+        self._queue.put_nowait(_STOP)
+        await self._task
+        # Callers queued behind the stop get an answer, in one last batch
+        pending = []
+        while not self._queue.empty():
+            pending.append(self._queue.get_nowait())
+        pending = [(t, f) for t, f in pending if not f.done()]
+        if pending:
+            vecs = self.embedder.encode_texts([t for t, _ in pending], batch_size=len(pending))
+            for (_, future), vec in zip(pending, vecs):
+                future.set_result(vec)
+        self._executor.shutdown(wait=True)
+        self._task = None
+
+    # ---------------- DISPATCH ----------------
+    async def _collect(self) -> Tuple[List[Tuple[str, asyncio.Future]], bool]:
+        # (batch, stop requested)
+        item = await self._queue.get()
+        if item is _STOP:
+            return [], True
+        batch = [item]
+        deadline = self._loop.time() + self.max_wait_s
+        while len(batch) < self.max_batch:
+            # Whatever is already queued joins without waiting
+            if not self._queue.empty():
+                item = self._queue.get_nowait()
+            else:
+                remaining = deadline - self._loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(self._queue.get(), remaining)
+                except asyncio.TimeoutError:
+                    break
+            if item is _STOP:
+                return batch, True
+            batch.append(item)
+        return batch, False
+
+    async def _dispatch(self) -> None:
+        stopping = False
+        while not stopping:
+            batch, stopping = await self._collect()
+            batch = [(t, f) for t, f in batch if not f.cancelled()]
+            if batch:
+                await self._run_batch(batch)
+
+    async def _run_batch(self, batch: List[Tuple[str, asyncio.Future]]) -> None:
+        # Identical texts (often "") are encoded once
+        unique = list(dict.fromkeys(t for t, _ in batch))
+        try:
+            vecs = await self._loop.run_in_executor(
+                self._executor,
+                lambda: self.embedder.encode_texts(unique, batch_size=len(unique)),
+            )
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        self.batches += 1
+        self.texts += len(batch)
+        row = {t: i for i, t in enumerate(unique)}
+        for text, future in batch:
+            if not future.done():
+                future.set_result(vecs[row[text]])
+
+    # ---------------- API ----------------
+    async def encode(self, texts: List[str]) -> List[Any]:
+        """
+        One unit vector per text, batched with every other caller's.
+        """
+        if not texts:
+            return []
+        if not self.running:
+            return list(self.embedder.encode_texts(texts, batch_size=len(texts)))
+        futures = []
+        for text in texts:
+            future = self._loop.create_future()
+            self._queue.put_nowait((text, future))
+            futures.append(future)
+        return list(await asyncio.gather(*futures))
+
+    async def embed_views(self, views: Dict[str, str]) -> Dict[str, list]:
+        """
+        Same contract as Embedder.embed_views.
+        """
+        keys = list(views)
+        vecs = await self.encode([views[k] for k in keys])
+        return {k: vecs[i].tolist() for i, k in enumerate(keys)}
+
+    def encode_threadsafe(self, texts: List[str]) -> List[Any]:
+        """
+        encode for code running in a worker thread; blocks that thread
+        until the batch returns.
+        """
+        if not texts:
+            return []
+        if not self.running:
+            return list(self.embedder.encode_texts(texts, batch_size=len(texts)))
+        if threading.get_ident() == self._loop_thread:
+            raise RuntimeError("encode_threadsafe called on the event loop; await encode")
+        return asyncio.run_coroutine_threadsafe(self.encode(texts), self._loop).result()
+
+    def embed_views_threadsafe(self, views: Dict[str, str]) -> Dict[str, list]:
+        """
+        embed_views for code running in a worker thread (run_in_threadpool,
+        stage graph); blocks that thread until the batch returns.
+        """
+        if not self.running:
+            return self.embedder.embed_views(views)
+        if threading.get_ident() == self._loop_thread:
+            raise RuntimeError("embed_views_threadsafe called on the event loop; await embed_views")
+        return asyncio.run_coroutine_threadsafe(self.embed_views(views), self._loop).result()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "running": self.running,
+            "batches": self.batches,
+            "texts": self.texts,
+            "avg_batch": round(self.texts / self.batches, 2) if self.batches else 0.0,
+            "max_batch": self.max_batch,
+            "max_wait_ms": self.max_wait_s * 1000.0,
+        }
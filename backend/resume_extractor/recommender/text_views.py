@@ -1,6 +1,6 @@
 # recommender/text_views.py
 from __future__ import annotations
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 import re
 
 WS_RE = re.compile(r"\s+")
@@ -15,20 +15,21 @@ def _join(parts: List[str]) -> str:
     return " ".join(parts).strip()
 
 
-def resume_to_views(resume: Dict[str, Any]) -> Dict[str, str]:
+def resume_to_views(resume: Dict[str, Any], phrases: Optional[List[str]] = None) -> Dict[str, str]:
     """
     Input: final structured resume (your schema v1):
       profile, education, experience, projects, skills, certifications, other, signals{phrases, full_text}
+    phrases: the phrases view's phrases (phrase_stats.select_view_phrases);
+      defaults to every signals phrase
     Output: multiple text views for embedding
     """
 
     # ---- Skills view ----
     skills = resume.get("skills", {}) or {}
-    # your categorized skills: languages/frameworks/databases/cloud_devops/concepts
+    # your categorized skills: taxonomy categories (languages/frameworks/...) + ai_detected
     skills_parts = []
-    for k in ["languages", "frameworks", "databases", "cloud_devops", "concepts", "ai_detected"]:
-        vals = skills.get(k, []) or []
-        if vals:
+    for k, vals in skills.items():
+        if vals and isinstance(vals, list):
             skills_parts.append(f"{k}: " + ", ".join([str(v) for v in vals]))
     skills_text = _join(skills_parts)
 
@@ -66,7 +67,9 @@ def resume_to_views(resume: Dict[str, Any]) -> Dict[str, str]:
 
     # ---- Signals ----
     signals = resume.get("signals", {}) or {}
-    phrases_text = _join([str(p) for p in (signals.get("phrases", []) or [])])
+    if phrases is None:
+        phrases = signals.get("phrases", []) or []
+    phrases_text = _join([str(p) for p in phrases])
     full_text = _norm(signals.get("full_text", ""))
 
     # ---- Fallback full ----
@@ -85,6 +88,21 @@ def resume_to_views(resume: Dict[str, Any]) -> Dict[str, str]:
     }
 
 
+def ai_independent_views(base: Dict[str, Any], phrases: Optional[List[str]] = None) -> Dict[str, str]:
+    """
+    The views that can be built from postprocessing.final_mapper.build_base_resume,
+    i.e. before any AI output exists. "skills" is left out unless the base
+    already has its skills. "full_text" is left out when it would have to be
+    synthesized from them.
+    """
+    views = resume_to_views(base, phrases)
+    if "skills" not in base:
+        views.pop("skills")
+        if not _norm((base.get("signals", {}) or {}).get("full_text", "")):
+            views.pop("full_text")
+    return views
+
+
 def jd_form_to_views(jd: Dict[str, Any]) -> Dict[str, str]:
     """
     JD is best provided as a form JSON. Example recommended schema:
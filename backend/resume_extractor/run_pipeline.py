@@ -2,9 +2,10 @@ from __future__ import annotations
 
 import os
 import json
+import hashlib
 import time
 import uuid
-from typing import List, Dict, Any
+from typing import Callable, Iterable, List, Dict, Any, Optional
 from datetime import datetime
 
 # ---------------- PATH SETUP ----------------
@@ -12,12 +13,17 @@ import sys
 sys.path.append(os.path.abspath(os.path.dirname(__file__)))
 
 # ---------------- EXTRACTION ----------------
-from extraction.pdf_digital import extract_pdf_words
-from extraction.line_builder import build_lines
-from extraction.regex_flags import enrich_lines
-from extraction.merge_lines import merge_wrapped_lines
+from extraction.pdf_backends import get_pdf_backend
+from extraction.pdf_digital import open_pdf, iter_pdf_pages
+from extraction.line_builder import iter_lines
+from extraction.regex_flags import enrich_line
+from extraction.merge_lines import iter_merge_wrapped_lines
+from extraction.pdf_parallel import build_lines_parallel, default_page_workers
+from extraction.preflight import classify_pdf, UnreadablePdf
 from extraction.plaintext_adapter import plaintext_to_lines, adapt_plaintext_lines
 
+from stage_profiler import stage
+
 # ---------------- SECTIONING ----------------
 from sectioning.section_mapper import assign_sections
 from sectioning.wrapped_line_merger import merge_lines, merge_education_wrapped
@@ -29,13 +35,22 @@ from postprocessing.section_structurer import structure_resume
 from postprocessing.embedded_bullet_extractor import extract_embedded_bullets
 from postprocessing.education_parser import split_education_entries
 from postprocessing.phrase_extractor import extract_phrases
-from postprocessing.final_mapper import build_final_resume
+from postprocessing.final_mapper import (
+    ai_fields_complete, build_base_resume, build_final_resume, request_ai_fields,
+    request_ai_fields_batch, rule_based_fields
+)
+from stage_graph import StageGraph
+from phrase_stats import select_view_phrases
 
 # ---------------- EMBEDDING & MATCHING ----------------
-from recommender.embedder import Embedder
-from recommender.text_views import resume_to_views
+# Embedder (torch) is imported lazily in main(): extraction workers import
+# this module and should not pay for loading the model stack.
+from recommender.text_views import ai_independent_views, resume_to_views
 from recommender.matcher import batch_rank_candidates, MatchConfig
 
+# Bump whenever extraction/structuring output changes — keys the extraction cache
+PIPELINE_VERSION = "4"
+
 VIEW_KEYS = [
     "skills", "experience", "projects",
     "education", "certifications",
@@ -45,18 +60,44 @@ VIEW_KEYS = [
 # =====================================================
 # RESUME EXTRACTION
 # =====================================================
-def extract_resume(path: str) -> Dict[str, Any]:
-    if path.lower().endswith(".pdf"):
-        words = extract_pdf_words(path)
-        lines = build_lines(words)
-        lines = enrich_lines(lines)
-        lines = merge_wrapped_lines(lines)
-    else:
-        with open(path, "r", encoding="utf-8") as f:
-            text = f.read()
-        lines = plaintext_to_lines(text)
+def iter_raw_pdf_lines(path: str,
+                       page_workers: Optional[int] = None,
+                       backend: Optional[str] = None) -> Iterable[Dict[str, Any]]:
+    """
+    pages → lines, streamed page by page. Only one page of words is alive
+    at a time, so long CVs don't inflate worker memory.
+
+    page_workers > 1 fans page extraction out over a process pool
+    (defaults to PDF_PAGE_WORKERS; serial when unset). backend picks the
+    word extractor (defaults to PDF_BACKEND, then pdfplumber).
+    """
+    if page_workers is None:
+        page_workers = default_page_workers()
+
+    if page_workers > 1:
+        return build_lines_parallel(path, page_workers, backend=backend)
+    return iter_lines(get_pdf_backend(backend).iter_pages(path))
+
+
+def extract_pdf_lines(path: str,
+                      page_workers: Optional[int] = None,
+                      backend: Optional[str] = None) -> List[Dict[str, Any]]:
+    """
+    pages → lines → flags → wrap merge (see iter_raw_pdf_lines).
+    """
+    lines = map(enrich_line, iter_raw_pdf_lines(path, page_workers, backend))
+    return list(iter_merge_wrapped_lines(lines))
+
 
-    lines = adapt_plaintext_lines(lines)
+def normalize_lines(lines: Iterable[Dict[str, Any]], pdf: bool = False) -> List[Dict[str, Any]]:
+    """
+    lines → sectioned, merged lines ready for structure_resume.
+    pdf=True means raw line_builder output: flags and the wrap merge run first.
+    """
+    if pdf:
+        lines = iter_merge_wrapped_lines(map(enrich_line, lines))
+
+    lines = adapt_plaintext_lines(list(lines))
     sectioned = assign_sections(lines)
 
     merged = merge_lines(sectioned)
@@ -64,14 +105,149 @@ def extract_resume(path: str) -> Dict[str, Any]:
     merged = merge_bullet_continuations(merged)
     merged = merge_education_wrapped(merged)
     merged = merge_bullet_continuations(merged)
-    merged = [l for l in merged if l.get("text") and l["text"].strip()]
+    return [l for l in merged if l.get("text") and l["text"].strip()]
+
+
+def extract_structured(path: str,
+                       page_workers: Optional[int] = None,
+                       backend: Optional[str] = None,
+                       preflight: bool = True) -> Dict[str, Any]:
+    """
+    Everything before build_final_resume: the sectioned resume, no AI calls.
+
+    Raises UnreadablePdf (before any expensive stage) when pre-flight finds
+    no usable text layer — scans, blank pages, garbage glyphs.
+    """
+    if path.lower().endswith(".pdf"):
+        if page_workers is None:
+            page_workers = default_page_workers()
+
+        # Serial pdfplumber: pre-flight and extraction share one handle, so
+        # the sampled pages are interpreted once, not twice
+        shared = None
+        if page_workers <= 1 and get_pdf_backend(backend).name == "pdfplumber":
+            shared = open_pdf(path)
 
-    structured = structure_resume(merged)
-    structured = extract_phrases(structured)
-    structured = extract_embedded_bullets(structured)
-    structured["education"] = split_education_entries(structured.get("education", []))
+        try:
+            if preflight:
+                with stage("preflight"):
+                    report = classify_pdf(path, pdf=shared)
+                if report["kind"] == "image_only":
+                    raise UnreadablePdf(report)
 
-    return build_final_resume(structured)
+            # Lines (not words) are materialized: small, and it keeps PDF
+            # parsing and normalization apart in the stage profile
+            with stage("extract_lines"):
+                if shared is not None:
+                    lines = list(iter_lines(iter_pdf_pages(path, pdf=shared)))
+                else:
+                    lines = list(iter_raw_pdf_lines(path, page_workers=page_workers, backend=backend))
+        finally:
+            if shared is not None:
+                shared.close()
+
+        with stage("normalize_lines"):
+            merged = normalize_lines(lines, pdf=True)
+    else:
+        with stage("extract_lines"):
+            with open(path, "r", encoding="utf-8") as f:
+                text = f.read()
+            lines = plaintext_to_lines(text)
+        with stage("normalize_lines"):
+            merged = normalize_lines(lines)
+
+    with stage("structure_resume"):
+        structured = structure_resume(merged)
+    with stage("extract_phrases"):
+        structured = extract_phrases(structured)
+    with stage("extract_embedded_bullets"):
+        structured = extract_embedded_bullets(structured)
+    with stage("split_education_entries"):
+        structured["education"] = split_education_entries(structured.get("education", []))
+    return structured
+
+
+def extract_resume(path: str,
+                   page_workers: Optional[int] = None,
+                   backend: Optional[str] = None,
+                   preflight: bool = True) -> Dict[str, Any]:
+    """
+    Final resume, stages run one after another (see extract_structured).
+    """
+    structured = extract_structured(path, page_workers, backend, preflight)
+    with stage("build_final_resume"):
+        return build_final_resume(structured)
+
+
+def _embed_remaining(embed_views, views: Dict[str, str], base_views: Dict[str, str],
+                     base_embeddings: Dict[str, Any]) -> Dict[str, Any]:
+    # Views embedded before the AI finished are reused when their text
+    # came out the same; only the rest is embedded now
+    todo = {k: t for k, t in views.items() if base_views.get(k) != t}
+    fresh = embed_views(todo) if todo else {}
+    return {k: fresh[k] if k in fresh else base_embeddings[k] for k in views}
+
+
+def build_and_embed(structured: Dict[str, Any],
+                    embed_views: Callable[[Dict[str, str]], Dict[str, Any]],
+                    ai_fields: Optional[Dict[str, Any]] = None,
+                    rules: Optional[Dict[str, Any]] = None,
+                    doc_key: Optional[str] = None) -> Dict[str, Any]:
+    """
+    build_final_resume → resume_to_views → embed_views, run as a stage graph:
+
+        rules            ← structured
+        ai_fields        ← structured, rules                (LLM)
+        base             ← structured, rules
+        base_views       ← base
+        base_embeddings  ← base_views                       (overlaps the LLM)
+        resume           ← structured, ai_fields, base, rules
+        views            ← resume
+        embeddings       ← views, base_views, base_embeddings
+
+    The phrases view keeps only the resume's highest-IDF phrases (see
+    phrase_stats). doc_key, the upload's content hash, also records the
+    resume in the document-frequency table, once per hash; without it the
+    resume is not counted.
+
+    Every view that does not depend on the AI is embedded while the LLM
+    call is in flight. Afterwards only the AI-dependent views (skills, when
+    the keywords fell short) are embedded, so latency is about
+    max(LLM, embedding) instead of their sum.
+
+    embed_views: {view: text} → {view: vector}, e.g. Embedder.embed_views.
+    ai_fields: request_ai_fields result made beforehand (batched bulk
+    ingestion); the graph then starts with it instead of calling the LLM.
+    rules: rule_based_fields result made beforehand (the same bulk path).
+    Returns {"resume", "views", "embeddings"}, the same values the stages
+    give when run one after another, plus "ai_complete": False when the AI
+    call failed and the resume fell back to the rules.
+    """
+    with stage("select_view_phrases"):
+        phrases = select_view_phrases(structured.get("signals", {}), doc_key)
+
+    graph = (
+        StageGraph()
+        .add("rules", rule_based_fields, deps=("structured",))
+        .add("ai_fields", request_ai_fields, deps=("structured", "rules"))
+        .add("base", build_base_resume, deps=("structured", "rules"))
+        .add("base_views", lambda base: ai_independent_views(base, phrases), deps=("base",))
+        .add("base_embeddings", embed_views, deps=("base_views",))
+        .add("resume", lambda s, ai, base, rules: build_final_resume(s, ai, base, rules),
+             deps=("structured", "ai_fields", "base", "rules"))
+        .add("views", lambda resume: resume_to_views(resume, phrases), deps=("resume",))
+        .add("embeddings", lambda v, bv, be: _embed_remaining(embed_views, v, bv, be),
+             deps=("views", "base_views", "base_embeddings"))
+    )
+    inputs = {"structured": structured}
+    if ai_fields is not None:
+        inputs["ai_fields"] = ai_fields
+    if rules is not None:
+        inputs["rules"] = rules
+    results = graph.run(inputs)
+    built = {k: results[k] for k in ("resume", "views", "embeddings")}
+    built["ai_complete"] = ai_fields_complete(results["ai_fields"])
+    return built
 
 # =====================================================
 # LOAD RESUME PATHS
@@ -114,20 +290,45 @@ def main():
     resume_paths = load_resume_paths(INPUT_PATH)
     print(f"📄 Found {len(resume_paths)} resumes")
 
+    from recommender.embedder import Embedder
+    from postprocessing.skill_classifier import configure_skill_classifier
+
     embedder = Embedder(device=DEVICE)
+    configure_skill_classifier(embedder)     # SKILLS_FALLBACK=local
     candidates = []
 
+    def embed_views(views):
+        # One batch per call
+        keys = list(views)
+        vecs = embedder.encode_texts([views[k] for k in keys], batch_size=len(keys))
+        return {k: vecs[i].tolist() for i, k in enumerate(keys)}
+
+    extracted = []
     for path in resume_paths:
         resume_file = os.path.basename(path)
 
         print(f"🔍 Processing: {resume_file}")
-        resume = extract_resume(path)
-        views = resume_to_views(resume)
+        try:
+            extracted.append((path, extract_structured(path)))
+        except UnreadablePdf as e:
+            print(f"⚠️ Skipping {resume_file}: {e}")
 
-        texts = [views.get(k, "") for k in VIEW_KEYS]
-        vecs = embedder.encode_texts(texts, batch_size=len(texts))
+    # A directory: every resume's AI fields in a few shared prompts.
+    # A single file: its LLM call overlaps with embedding instead.
+    ai_batch = [None] * len(extracted)
+    rules_batch = [None] * len(extracted)
+    if os.path.isdir(INPUT_PATH):
+        rules_batch = [rule_based_fields(s) for _, s in extracted]
+        ai_batch = request_ai_fields_batch([s for _, s in extracted], rules_batch)
 
-        embeddings = {k: vecs[i].tolist() for i, k in enumerate(VIEW_KEYS)}
+    for (path, structured), ai_fields, rules in zip(extracted, ai_batch, rules_batch):
+        resume_file = os.path.basename(path)
+        with open(path, "rb") as f:
+            doc_key = hashlib.md5(f.read()).hexdigest()   # as main.py's file_hash
+        built = build_and_embed(structured, embed_views, ai_fields=ai_fields, rules=rules,
+                                doc_key=doc_key)
+        views = built["views"]
+        embeddings = {k: built["embeddings"][k] for k in VIEW_KEYS}
 
         candidates.append({
             "candidate_id": str(uuid.uuid4()),
@@ -0,0 +1,88 @@
+# scripts/bench_ai_clients.py
+"""
+Per-call overhead of a fresh OpenAI client per request (the old
+get_ai_client behaviour) vs the pooled ProviderRegistry, measured against
+the local stub server so only client/connection cost is visible.
+
+  python scripts/bench_ai_clients.py --calls 200 --threads 8
+"""
+import argparse
+import contextlib
+import io
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+from openai import OpenAI
+
+from scripts.stub_llm_server import start_stub_server
+from stage_profiler import percentile
+
+
+def fresh_client_call(prompt: str) -> str:
+    client = OpenAI(api_key=os.environ["OPENAI_API_KEY"])
+    try:
+        response = client.chat.completions.create(
+            model="gpt-4o",
+            messages=[{"role": "user", "content": prompt}],
+        )
+        return response.choices[0].message.content
+    finally:
+        client.close()
+
+
+def run(fn, calls: int, threads: int):
+    latencies = []
+
+    def one(i):
+        t0 = time.perf_counter()
+        fn(f"prompt {i}")
+        latencies.append(time.perf_counter() - t0)
+
+    t0 = time.perf_counter()
+    if threads <= 1:
+        for i in range(calls):
+            one(i)
+    else:
+        with ThreadPoolExecutor(threads) as ex:
+            list(ex.map(one, range(calls)))
+    return time.perf_counter() - t0, latencies
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--calls", type=int, default=200)
+    ap.add_argument("--threads", type=int, default=8)
+    args = ap.parse_args()
+
+    server, _ = start_stub_server()
+    os.environ.pop("OPENROUTER_API_KEY", None)
+    os.environ.pop("GEMINI_API_KEY", None)
+    os.environ["OPENAI_API_KEY"] = "stub"
+    os.environ["OPENAI_BASE_URL"] = server.base_url
+    # Measure the network path, not cache hits
+    os.environ["LLM_CACHE_DISABLED"] = "1"
+    os.environ["AI_RATE_LIMIT_RPS"] = "0"
+
+    from resume_extractor.ai_service import generate_ai_content, registry
+
+    print(f"🧪 Stub server {server.base_url} | {args.calls} calls")
+    for threads in sorted({1, args.threads}):
+        for name, fn in [("fresh client", fresh_client_call), ("pooled", generate_ai_content)]:
+            conns = server.connections
+            with contextlib.redirect_stdout(io.StringIO()):
+                wall, lat = run(fn, args.calls, threads)
+            print(f"{name:>13} | threads={threads:<2} | "
+                  f"p50 {percentile(lat, 50) * 1000:6.2f}ms  p90 {percentile(lat, 90) * 1000:6.2f}ms | "
+                  f"{args.calls / wall:7.1f} calls/s | TCP connections: {server.connections - conns}")
+
+    registry.close()
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
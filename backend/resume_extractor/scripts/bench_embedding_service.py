@@ -0,0 +1,130 @@
+# scripts/bench_embedding_service.py
+"""
+Embedding throughput under concurrent uploads: per-request encoding vs the
+cross-request micro-batching EmbeddingService, with the offline batched
+encode (what scripts/embed_resumes.py does) as the ceiling.
+
+Views come from the saved corpus (no LLM: the AI keys are unset), repeated
+--repeat times; --concurrency requests are in flight at once.
+
+  python scripts/bench_embedding_service.py --corpus ../saved_resumes --concurrency 16 --repeat 5
+  python scripts/bench_embedding_service.py --max-batch 128 --max-wait-ms 10
+
+Modes:
+  per-view   one encode per view (the old Embedder.embed_views)
+  per-resume one encode per resume, all its views together
+  service    EmbeddingService: every in-flight view text, one encode
+  offline    all texts, encode_texts(batch_size=--batch), no concurrency
+"""
+import argparse
+import asyncio
+import contextlib
+import io
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+from recommender.embedding_service import EmbeddingService
+from stage_profiler import percentile
+
+
+def load_views(corpus):
+    for var in ("OPENROUTER_API_KEY", "OPENAI_API_KEY", "GEMINI_API_KEY"):
+        os.environ.pop(var, None)
+    from run_pipeline import extract_resume, load_resume_paths
+    from recommender.text_views import resume_to_views
+
+    views = []
+    for path in sorted(load_resume_paths(corpus)):
+        try:
+            with contextlib.redirect_stdout(io.StringIO()):
+                views.append(resume_to_views(extract_resume(path)))
+        except Exception:
+            pass
+    return views
+
+
+def per_view(embedder, views):
+    return {k: embedder.encode_one(t).tolist() for k, t in views.items()}
+
+
+async def run_concurrent(handler, docs, concurrency):
+    # handler: async views → embeddings; returns per-request latencies
+    sem = asyncio.Semaphore(concurrency)
+    latencies = []
+
+    async def one(views):
+        async with sem:
+            t0 = time.perf_counter()
+            await handler(views)
+            latencies.append(time.perf_counter() - t0)
+
+    await asyncio.gather(*(one(v) for v in docs))
+    return latencies
+
+
+async def bench(embedder, docs, args):
+    loop = asyncio.get_running_loop()
+    # The server's threadpool, sized like Starlette's default
+    pool = ThreadPoolExecutor(max_workers=max(args.concurrency, 1))
+    results = {}
+
+    for name, fn in (("per-view", lambda v: per_view(embedder, v)),
+                     ("per-resume", embedder.embed_views)):
+        t0 = time.perf_counter()
+        lat = await run_concurrent(lambda v, fn=fn: loop.run_in_executor(pool, fn, v),
+                                   docs, args.concurrency)
+        results[name] = (time.perf_counter() - t0, lat, None)
+
+    service = EmbeddingService(embedder, max_batch=args.max_batch, max_wait_ms=args.max_wait_ms)
+    await service.start()
+    t0 = time.perf_counter()
+    lat = await run_concurrent(service.embed_views, docs, args.concurrency)
+    results["service"] = (time.perf_counter() - t0, lat, service.stats())
+    await service.stop()
+
+    texts = [t for v in docs for t in v.values()]
+    t0 = time.perf_counter()
+    embedder.encode_texts(texts, batch_size=args.batch)
+    results["offline"] = (time.perf_counter() - t0, None, None)
+    pool.shutdown()
+    return results
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--corpus", default=os.path.join(os.path.dirname(__file__), "..", "..", "saved_resumes"))
+    ap.add_argument("--repeat", type=int, default=5)
+    ap.add_argument("--concurrency", type=int, default=16)
+    ap.add_argument("--max-batch", type=int, default=64)
+    ap.add_argument("--max-wait-ms", type=float, default=5.0)
+    ap.add_argument("--batch", type=int, default=64, help="offline batch size")
+    ap.add_argument("--model", default="sentence-transformers/all-MiniLM-L6-v2")
+    ap.add_argument("--device", default="cpu")
+    args = ap.parse_args()
+
+    from recommender.embedder import Embedder
+
+    docs = load_views(args.corpus) * args.repeat
+    embedder = Embedder(model_name=args.model, device=args.device)
+    embedder.encode_texts(["warm up"])
+    print(f"🧪 {len(docs)} resumes × {len(docs[0]) if docs else 0} views | "
+          f"concurrency {args.concurrency} | max batch {args.max_batch} | "
+          f"max wait {args.max_wait_ms} ms")
+
+    results = asyncio.run(bench(embedder, docs, args))
+    for name, (wall, lat, stats) in results.items():
+        line = f"{name:>10}: {len(docs) / wall:7.2f} resumes/s"
+        if lat:
+            line += f" | p50 {percentile(lat, 50) * 1000:.0f} ms  p99 {percentile(lat, 99) * 1000:.0f} ms"
+        if stats:
+            line += f" | {stats['batches']} batches, avg {stats['avg_batch']} texts"
+        print(line)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+# scripts/bench_line_builder.py
+"""
+Micro-benchmark: dict-based build_lines vs columnar build_lines_from_table.
+
+  python scripts/bench_line_builder.py                 # synthetic 5k/20k/50k words
+  python scripts/bench_line_builder.py --pdf big.pdf   # real document
+"""
+import argparse
+import copy
+import os
+import random
+import sys
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from extraction.line_builder import build_lines, build_lines_from_table
+from extraction.word_table import WordTable
+
+
+def synthetic_words(n_words: int, words_per_line: int = 10, seed: int = 0):
+    rng = random.Random(seed)
+    words = []
+    lines_per_page = 50
+    for i in range(n_words):
+        line = i // words_per_line
+        page = line // lines_per_page + 1
+        top = 40.0 + (line % lines_per_page) * 14.0 + rng.uniform(0, 1.5)
+        x0 = 30.0 + (i % words_per_line) * 50.0 + rng.uniform(0, 3)
+        words.append({
+            "page": page,
+            "text": f"word{i}",
+            "x0": x0,
+            "x1": x0 + 40.0,
+            "top": top,
+            "bottom": top + 10.0,
+        })
+    rng.shuffle(words)
+    return words
+
+
+def bench(words, repeat: int):
+    table = WordTable.from_words(words)
+
+    # Parity first — the columnar path must be a drop-in replacement
+    expected = build_lines(copy.deepcopy(words))
+    assert build_lines_from_table(table) == expected, "columnar output differs"
+
+    t_dict = float("inf")
+    for _ in range(repeat):
+        w = copy.deepcopy(words)
+        t0 = time.perf_counter()
+        build_lines(w)
+        t_dict = min(t_dict, time.perf_counter() - t0)
+
+    t_cols = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        build_lines_from_table(table)
+        t_cols = min(t_cols, time.perf_counter() - t0)
+
+    return len(expected), t_dict, t_cols
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--pdf", default=None, help="Benchmark on a real PDF instead of synthetic words")
+    ap.add_argument("--repeat", type=int, default=5)
+    args = ap.parse_args()
+
+    if args.pdf:
+        from extraction.pdf_digital import extract_pdf_words
+        cases = [(os.path.basename(args.pdf), extract_pdf_words(args.pdf))]
+    else:
+        cases = [(f"synthetic-{n}", synthetic_words(n)) for n in (5_000, 20_000, 50_000)]
+
+    for name, words in cases:
+        n_lines, t_dict, t_cols = bench(words, args.repeat)
+        print(
+            f"✅ {name}: {len(words)} words → {n_lines} lines | "
+            f"dict {t_dict * 1000:.1f} ms | columnar {t_cols * 1000:.1f} ms | "
+            f"{t_dict / t_cols:.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
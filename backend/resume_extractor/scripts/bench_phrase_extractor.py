@@ -0,0 +1,163 @@
+# scripts/bench_phrase_extractor.py
+"""
+Parity + cost check: the per-chunk regex phrase extraction (regex pass
+for capitalized phrases, split + TECH_LIKE_RE per token, dedup at the
+end) vs the single-pass postprocessing.phrase_extractor.
+
+Sections are extracted once per PDF. Besides each resume on its own,
+"long" documents are built by pooling every resume's sections, --scale
+times over, to show how both paths behave on long CVs. Exits 1 if any
+document's signals (phrases, full_text) differ.
+
+  python scripts/bench_phrase_extractor.py --corpus ../saved_resumes --repeat 20 --scale 4
+"""
+import argparse
+import contextlib
+import copy
+import io
+import os
+import re
+import sys
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+from postprocessing.phrase_extractor import (
+    PHRASE_SPLIT_RE, STOPWORDS, TECH_LIKE_RE, _normalize, extract_phrases
+)
+
+CAPITAL_PHRASE_RE = re.compile(
+    r"\b([A-Z][a-z]+(?:\s+[A-Z][a-z]+){0,4})\b"
+)
+
+
+def legacy_extract_from_text(text):
+    phrases = []
+    for chunk in PHRASE_SPLIT_RE.split(text):
+        chunk = _normalize(chunk)
+        if len(chunk) < 3:
+            continue
+
+        for m in CAPITAL_PHRASE_RE.finditer(chunk):
+            p = _normalize(m.group(1))
+            if len(p.split()) >= 2:
+                phrases.append(p)
+
+        buf = []
+        for t in chunk.split():
+            if t.lower() in STOPWORDS:
+                if len(buf) >= 2:
+                    phrases.append(" ".join(buf))
+                buf = []
+                continue
+            if TECH_LIKE_RE.match(t):
+                buf.append(t)
+            else:
+                if len(buf) >= 2:
+                    phrases.append(" ".join(buf))
+                buf = []
+        if len(buf) >= 2:
+            phrases.append(" ".join(buf))
+    return phrases
+
+
+def section_texts(structured):
+    # Same texts, same order as extract_phrases
+    for e in structured.get("education", []):
+        txt = (e.get("entry") or e.get("institution") or "") if isinstance(e, dict) else str(e)
+        if txt:
+            yield txt
+    for exp in structured.get("experience", []):
+        if exp.get("header", ""):
+            yield exp["header"]
+        yield from exp.get("bullets", [])
+    for proj in structured.get("projects", []):
+        if proj.get("title", ""):
+            yield proj["title"]
+        yield from proj.get("bullets", [])
+    yield from structured.get("skills", {}).get("raw", [])
+    yield from structured.get("certifications", [])
+    yield from structured.get("other", [])
+
+
+def legacy_signals(structured):
+    phrases = []
+    full_text_parts = []
+    for text in section_texts(structured):
+        phrases.extend(legacy_extract_from_text(text))
+        full_text_parts.append(text)
+    seen = set()
+    deduped = []
+    for p in phrases:
+        if p not in seen:
+            seen.add(p)
+            deduped.append(p)
+    return {"phrases": deduped, "full_text": _normalize(" ".join(full_text_parts))}
+
+
+def single_pass_signals(structured):
+    return extract_phrases(structured)["signals"]
+
+
+def pooled(docs, scale):
+    # One long "resume": every document's sections, scale times over
+    keys = ("education", "experience", "projects", "certifications", "other")
+    long_doc = {k: [] for k in keys}
+    long_doc["skills"] = {"raw": []}
+    for _ in range(scale):
+        for d in docs:
+            for k in keys:
+                long_doc[k].extend(d.get(k, []))
+            long_doc["skills"]["raw"].extend(d.get("skills", {}).get("raw", []))
+    return long_doc
+
+
+def measure(fn, docs, repeat):
+    total = 0.0
+    for _ in range(repeat):
+        inputs = copy.deepcopy(docs)
+        t0 = time.process_time()
+        for d in inputs:
+            fn(d)
+        total += time.process_time() - t0
+    return total / (repeat * len(docs))
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--corpus", default=os.path.join(os.path.dirname(__file__), "..", "..", "saved_resumes"))
+    ap.add_argument("--repeat", type=int, default=20)
+    ap.add_argument("--scale", type=int, default=4, help="copies of the pooled corpus in the long document")
+    args = ap.parse_args()
+
+    from run_pipeline import extract_structured, load_resume_paths
+
+    docs = []
+    for path in sorted(load_resume_paths(args.corpus)):
+        try:
+            with contextlib.redirect_stdout(io.StringIO()):
+                docs.append(extract_structured(path))
+        except Exception:
+            pass
+    long_docs = [pooled(docs, args.scale)]
+    n_texts = sum(1 for _ in section_texts(long_docs[0]))
+    print(f"📄 Corpus: {len(docs)} resumes | long document: {n_texts} texts")
+
+    mismatched = [
+        i for i, d in enumerate(docs + long_docs)
+        if legacy_signals(copy.deepcopy(d)) != single_pass_signals(copy.deepcopy(d))
+    ]
+
+    for label, group in (("resume", docs), ("long", long_docs)):
+        for name, fn in (("regex", legacy_signals), ("1-pass", single_pass_signals)):
+            per_doc = measure(fn, group, args.repeat)
+            print(f"{label:>7} {name:>7}: {per_doc * 1000:.3f} ms CPU / document")
+
+    status = "✅" if not mismatched else "❌"
+    print(f"{status} output mismatches: {len(mismatched)}")
+    sys.exit(1 if mismatched else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,171 @@
+# scripts/bench_pipeline_e2e.py
+"""
+End-to-end pipeline throughput and tail latency against the local stub
+LLM server (scripts/stub_llm_server.py), so the AI path runs for real
+offline: pooled clients, rate limits, retries, failover, batching.
+
+ai_service is pointed at the stub through the usual environment
+variables (OPENAI_BASE_URL / GEMINI_BASE_URL), the LLM response cache is
+off, and the stub injects latency, 500s and 429s as asked.
+
+  python scripts/bench_pipeline_e2e.py --corpus ../saved_resumes --concurrency 8 --repeat 3
+  python scripts/bench_pipeline_e2e.py --latency lognormal:1.2,0.6 --error-rate 0.05 --throttle-rate 0.05
+  python scripts/bench_pipeline_e2e.py --providers openai,gemini --error-rate 0.3   # failover
+  python scripts/bench_pipeline_e2e.py --mode bulk        # run_pipeline.main's batched prompts
+  python scripts/bench_pipeline_e2e.py --ai-summary       # every resume calls the LLM
+
+Modes:
+  request  each resume on its own, `concurrency` at a time: the upload
+           path in main.py (extract_structured → build_and_embed)
+  bulk     every resume extracted, then AI fields for all of them in
+           batched prompts, then build_and_embed: run_pipeline.main
+
+Embedding is skipped unless --embed loads the real model, so the numbers
+show extraction + LLM cost only.
+"""
+import argparse
+import contextlib
+import io
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+from scripts.stub_llm_server import start_stub_server
+from stage_profiler import percentile
+
+PROVIDER_ENV = {
+    "openrouter": ("OPENROUTER_API_KEY", "OPENROUTER_BASE_URL", "base_url"),
+    "openai": ("OPENAI_API_KEY", "OPENAI_BASE_URL", "base_url"),
+    "gemini": ("GEMINI_API_KEY", "GEMINI_BASE_URL", "gemini_url"),
+}
+
+
+def point_ai_service_at(servers):
+    """
+    Configure exactly the given providers ({name: stub server}), each at
+    its own stub; the others are unset so nothing leaves the machine.
+    """
+    for name, (key_var, url_var, _) in PROVIDER_ENV.items():
+        os.environ.pop(key_var, None)
+        os.environ.pop(url_var, None)
+    for name, server in servers.items():
+        key_var, url_var, attr = PROVIDER_ENV[name]
+        os.environ[key_var] = "stub"
+        os.environ[url_var] = getattr(server, attr)
+    os.environ["LLM_CACHE_DISABLED"] = "1"
+    os.environ["PHRASE_STATS_DISABLED"] = "1"   # keep bench runs out of the corpus table
+
+
+def no_embedding(views):
+    return {k: None for k in views}
+
+
+def run_request_mode(paths, embed_views, concurrency):
+    from run_pipeline import build_and_embed, extract_structured
+
+    def one(path):
+        t0 = time.perf_counter()
+        try:
+            build_and_embed(extract_structured(path), embed_views)
+        except Exception:
+            return None
+        return time.perf_counter() - t0
+
+    with ThreadPoolExecutor(concurrency) as pool:
+        return list(pool.map(one, paths))
+
+
+def run_bulk_mode(paths, embed_views, concurrency):
+    from postprocessing.final_mapper import request_ai_fields_batch, rule_based_fields
+    from run_pipeline import build_and_embed, extract_structured
+
+    def extract(path):
+        try:
+            return extract_structured(path)
+        except Exception:
+            return None
+
+    t0 = time.perf_counter()
+    with ThreadPoolExecutor(concurrency) as pool:
+        structured = [s for s in pool.map(extract, paths) if s is not None]
+    rules = [rule_based_fields(s) for s in structured]
+    ai_fields = request_ai_fields_batch(structured, rules)
+    with ThreadPoolExecutor(concurrency) as pool:
+        list(pool.map(lambda args: build_and_embed(*args),
+                      [(s, embed_views, ai, r) for s, ai, r in zip(structured, ai_fields, rules)]))
+    # One latency for the whole batch: resumes finish together
+    elapsed = time.perf_counter() - t0
+    return [elapsed] * len(structured) + [None] * (len(paths) - len(structured))
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--corpus", default=os.path.join(os.path.dirname(__file__), "..", "..", "saved_resumes"))
+    ap.add_argument("--mode", choices=("request", "bulk"), default="request")
+    ap.add_argument("--concurrency", type=int, default=8)
+    ap.add_argument("--repeat", type=int, default=1, help="run the corpus this many times")
+    ap.add_argument("--providers", default="openai", help="comma-separated, failover order")
+    ap.add_argument("--latency", default="lognormal:0.8,0.5", help="stub latency spec (seconds)")
+    ap.add_argument("--error-rate", type=float, default=0.0)
+    ap.add_argument("--throttle-rate", type=float, default=0.0)
+    ap.add_argument("--rate-limit-rps", type=float, default=0.0, help="stub-side limit")
+    ap.add_argument("--ai-summary", action="store_true", help="PROFILE_AI_SUMMARY=1")
+    ap.add_argument("--embed", action="store_true", help="load the real embedding model")
+    ap.add_argument("--seed", type=int, default=0)
+    args = ap.parse_args()
+
+    names = [p.strip() for p in args.providers.split(",") if p.strip()]
+    servers = {
+        name: start_stub_server(latency_s=args.latency, error_rate=args.error_rate,
+                                throttle_rate=args.throttle_rate,
+                                rate_limit_rps=args.rate_limit_rps, seed=args.seed + i)[0]
+        for i, name in enumerate(names)
+    }
+    point_ai_service_at(servers)
+    if args.ai_summary:
+        os.environ["PROFILE_AI_SUMMARY"] = "1"
+
+    from run_pipeline import load_resume_paths
+    from resume_extractor.ai_service import registry
+
+    paths = sorted(load_resume_paths(args.corpus)) * args.repeat
+    embed_views = no_embedding
+    if args.embed:
+        from recommender.embedder import Embedder
+        embed_views = Embedder(device="cpu").embed_views
+
+    print(f"🧪 {len(paths)} resumes | mode {args.mode} | concurrency {args.concurrency} | "
+          f"providers {','.join(names)} | latency {args.latency} | "
+          f"500s {args.error_rate:.0%} | 429s {args.throttle_rate:.0%}")
+
+    runner = run_request_mode if args.mode == "request" else run_bulk_mode
+    log = io.StringIO()
+    t0 = time.perf_counter()
+    with contextlib.redirect_stdout(log):
+        latencies = runner(paths, embed_views, args.concurrency)
+    wall = time.perf_counter() - t0
+
+    done = [l for l in latencies if l is not None]
+    print(f"\n⏱ wall {wall:.2f}s | {len(done) / wall:.2f} resumes/s | "
+          f"{len(paths) - len(done)} failed (unreadable PDFs included)")
+    if done:
+        print(f"   per resume p50 {percentile(done, 50):.2f}s  p90 {percentile(done, 90):.2f}s  "
+              f"p99 {percentile(done, 99):.2f}s  max {max(done):.2f}s")
+    print(f"   LLM errors logged by the pipeline: "
+          f"{sum('[ERROR]' in line for line in log.getvalue().splitlines())}")
+
+    for name, server in servers.items():
+        stats = registry.health_stats()[name]
+        print(f"\n🔌 {name}: {server.requests} requests ({server.rejected} × 429, "
+              f"{server.errors} × 500) over {server.connections} connections")
+        print(f"   client: {stats['successes']} ok, {stats['failures']} failed "
+              f"({stats['timeouts']} timeouts), {stats['throttled']} throttled, "
+              f"circuit {stats['state']} (opened {stats['opened']}×)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+# scripts/check_ai_failover.py
+"""
+Failover / circuit-breaker walk-through against two local stub servers:
+a slow "OpenRouter" and a fast "OpenAI".
+
+  python scripts/check_ai_failover.py --slow-ms 3000 --calls 12
+
+Expected: the first calls wait out the OpenRouter attempt timeout and then
+fail over. After AI_BREAKER_THRESHOLD timeouts the circuit opens and calls
+go straight to OpenAI. Once the cooldown is over, a single probe goes back
+to OpenRouter. --recover makes the slow server fast before the probe, so
+the circuit closes again.
+
+Last, a call that arrives with its deadline already spent, right after
+the cooldown, must leave the open circuit open: it is not the probe.
+Exits 1 if it does not.
+"""
+import argparse
+import contextlib
+import io
+import os
+import sys
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+from scripts.stub_llm_server import start_stub_server
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--slow-ms", type=float, default=3000)
+    ap.add_argument("--calls", type=int, default=12)
+    ap.add_argument("--attempt-timeout", type=float, default=0.5)
+    ap.add_argument("--cooldown", type=float, default=1.0)
+    ap.add_argument("--recover", action="store_true", help="speed the slow server up before the probe")
+    args = ap.parse_args()
+
+    slow, _ = start_stub_server(content='"from openrouter"', latency_s=args.slow_ms / 1000)
+    fast, _ = start_stub_server(content='"from openai"')
+
+    os.environ.pop("GEMINI_API_KEY", None)
+    os.environ.update({
+        "OPENROUTER_API_KEY": "stub", "OPENROUTER_BASE_URL": slow.base_url,
+        "OPENAI_API_KEY": "stub", "OPENAI_BASE_URL": fast.base_url,
+        "AI_ATTEMPT_TIMEOUT_S": str(args.attempt_timeout),
+        "AI_BREAKER_COOLDOWN_S": str(args.cooldown),
+        "LLM_CACHE_DISABLED": "1",
+        "AI_RATE_LIMIT_RPS": "0",
+    })
+
+    from resume_extractor.ai_service import generate_ai_content, registry
+
+    print(f"🧪 slow {slow.base_url} ({args.slow_ms:.0f}ms) | fast {fast.base_url}")
+    for i in range(args.calls):
+        if i == args.calls // 2:
+            time.sleep(args.cooldown)
+            if args.recover:
+                slow.latency_s = 0.0
+            print("   … cooldown elapsed")
+
+        t0 = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            content = generate_ai_content(f"prompt {i}")
+        state = registry.health["openrouter"].state
+        print(f"call {i:>2}: {(time.perf_counter() - t0) * 1000:7.1f}ms → {content:<18} openrouter circuit: {state}")
+
+    print()
+    for name, s in registry.health_stats().items():
+        if s["calls"] or s["skipped"]:
+            p50 = f"{s['latency_p50_s'] * 1000:.1f}ms" if s["latency_p50_s"] is not None else "-"
+            print(f"{name:>10}: {s['successes']} ok, {s['timeouts']} timeouts, {s['skipped']} skipped, "
+                  f"opened {s['opened']}x, p50 {p50}, state {s['state']}")
+
+    # Deadline spent when the cooldown is over: no probe, circuit stays open
+    health = registry.health["openrouter"]
+    for _ in range(health.failure_threshold):
+        health.record(False, 0.0, timed_out=True)
+    time.sleep(args.cooldown)
+    with contextlib.redirect_stdout(io.StringIO()):
+        generate_ai_content("expired deadline", deadline_s=0)
+    ok = health.state == "open"
+    print(f"\n{'✅' if ok else '❌'} expired deadline after cooldown → openrouter circuit: {health.state}")
+
+    registry.close()
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+# scripts/check_ai_rate_limit.py
+"""
+Bulk-upload burst against a rate-limited stub provider, with and without
+client-side flow control (token bucket + 429 retry), then a burst of
+identical prompts to show in-flight coalescing.
+
+  python scripts/check_ai_rate_limit.py --provider-rps 20 --calls 120 --threads 16
+"""
+import argparse
+import contextlib
+import io
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+from scripts.stub_llm_server import start_stub_server
+
+
+def burst(fn, prompts, threads):
+    t0 = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        with ThreadPoolExecutor(threads) as ex:
+            results = list(ex.map(fn, prompts))
+    return time.perf_counter() - t0, results
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--provider-rps", type=float, default=20)
+    ap.add_argument("--calls", type=int, default=120)
+    ap.add_argument("--threads", type=int, default=16)
+    ap.add_argument("--latency-ms", type=float, default=50)
+    args = ap.parse_args()
+
+    server, _ = start_stub_server(content='"ok"', latency_s=args.latency_ms / 1000,
+                                  rate_limit_rps=args.provider_rps)
+    for key in ("OPENROUTER_API_KEY", "GEMINI_API_KEY"):
+        os.environ.pop(key, None)
+    os.environ.update({
+        "OPENAI_API_KEY": "stub", "OPENAI_BASE_URL": server.base_url,
+        "LLM_CACHE_DISABLED": "1", "AI_CALL_DEADLINE_S": "60",
+    })
+
+    from resume_extractor.ai_service import generate_ai_content, registry, _inflight
+    from resume_extractor.llm_limits import TokenBucket
+
+    print(f"🧪 Stub provider allows {args.provider_rps:.0f} req/s | "
+          f"{args.calls} distinct prompts over {args.threads} threads")
+
+    scenarios = [
+        ("no flow control", 0, "1"),
+        ("bucket + retry", args.provider_rps, "4"),
+    ]
+    for name, rps, attempts in scenarios:
+        registry.limiters["openai"] = TokenBucket(rps, burst=max(1, int(rps)))
+        os.environ["AI_RETRY_MAX_ATTEMPTS"] = attempts
+        sent, rejected = server.requests, server.rejected
+        wall, results = burst(generate_ai_content, [f"{name} {i}" for i in range(args.calls)], args.threads)
+        ok = sum(r is not None for r in results)
+        print(f"{name:>16}: {ok}/{args.calls} answered ({args.calls - ok} fell back) | "
+              f"{ok / wall:5.1f} answers/s | upstream {server.requests - sent} requests, "
+              f"{server.rejected - rejected} × 429")
+
+    sent = server.requests
+    shared = _inflight.counts["shared"]
+    wall, results = burst(generate_ai_content, ["same resume header"] * args.threads, args.threads)
+    print(f"{'coalescing':>16}: {args.threads} identical concurrent prompts → "
+          f"{server.requests - sent} upstream request(s), {_inflight.counts['shared'] - shared} shared")
+
+    registry.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+# scripts/check_skill_matcher.py
+"""
+Known false positives and true positives of the skill taxonomy matcher
+(postprocessing.skill_matcher). Prints every case and exits 1 if any
+case finds other skills than expected.
+
+  python scripts/check_skill_matcher.py
+"""
+import os
+import sys
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from postprocessing.skill_matcher import load_skill_matcher
+
+# text → canonical skills find() must return, in order
+CASES = [
+    # Ordinary words and word parts that share a skill's name
+    ("Joined R&D in 2019", []),
+    ("Presented to C-level executives", []),
+    ("Internship, Spring 2021", []),
+    ("Known for Swift delivery of features", []),
+    ("Let's Go live next week", []),
+    ("R programming, Python", ["python"]),
+    # One skill, several names
+    ("Java/J2EE", ["java"]),
+    ("Go (Golang)", ["go"]),
+    # Word boundaries and joiners
+    ("JavaScript, C++, C#", ["javascript", "c++", "c#"]),
+    ("C/C++", ["c++"]),
+    # The same names as list items
+    ("Languages: C, R, Go, Swift", ["c", "r", "go", "swift"]),
+    ("Python | R | SQL", ["python", "r", "sql"]),
+    ("Spring, Spring Boot, Hibernate", ["spring", "spring boot", "hibernate"]),
+    ("• Go", ["go"]),
+]
+
+
+def main():
+    matcher = load_skill_matcher()
+    failed = 0
+    for text, expected in CASES:
+        found = [m.skill for m in matcher.find(text)]
+        ok = found == expected
+        failed += not ok
+        print(f"{'✅' if ok else '❌'} {text!r:<40} → {found}" + ("" if ok else f" (expected {expected})"))
+
+    print(f"\n{len(CASES) - failed}/{len(CASES)} cases pass")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
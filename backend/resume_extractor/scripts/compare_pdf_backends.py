@@ -0,0 +1,76 @@
+# scripts/compare_pdf_backends.py
+"""
+Parity + throughput check for the PDF word backends.
+
+For every PDF in the corpus, each backend's output is pushed through the
+sectioning stages and compared with the reference backend (pdfplumber).
+Throughput is reported as pages/sec of raw word extraction.
+
+  python scripts/compare_pdf_backends.py --corpus ../saved_resumes
+"""
+import argparse
+import os
+import sys
+import time
+from typing import Dict, List
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from extraction.pdf_backends import PDF_BACKENDS, DEFAULT_PDF_BACKEND, get_pdf_backend
+from extraction.line_builder import iter_lines
+from extraction.regex_flags import enrich_line
+from extraction.merge_lines import iter_merge_wrapped_lines
+from extraction.plaintext_adapter import adapt_plaintext_lines
+from sectioning.section_mapper import assign_sections
+
+
+def sectioned_view(backend: str, path: str) -> List[tuple]:
+    lines = iter_lines(get_pdf_backend(backend).iter_pages(path))
+    lines = list(iter_merge_wrapped_lines(map(enrich_line, lines)))
+    sectioned = assign_sections(adapt_plaintext_lines(lines))
+    return [(l["section"], l["text"]) for l in sectioned]
+
+
+def throughput(backend: str, paths: List[str]) -> float:
+    be = get_pdf_backend(backend)
+    pages = 0
+    t0 = time.perf_counter()
+    for p in paths:
+        for _ in be.iter_pages(p):
+            pages += 1
+    return pages / (time.perf_counter() - t0)
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--corpus", default=os.path.join(os.path.dirname(__file__), "..", "..", "saved_resumes"))
+    ap.add_argument("--backends", nargs="*", default=list(PDF_BACKENDS))
+    args = ap.parse_args()
+
+    paths = sorted(
+        os.path.join(args.corpus, f)
+        for f in os.listdir(args.corpus)
+        if f.lower().endswith(".pdf")
+    )
+    print(f"📄 Corpus: {len(paths)} PDFs")
+
+    reference: Dict[str, List[tuple]] = {p: sectioned_view(DEFAULT_PDF_BACKEND, p) for p in paths}
+    failures = 0
+
+    for backend in args.backends:
+        mismatched = [
+            os.path.basename(p) for p in paths
+            if sectioned_view(backend, p) != reference[p]
+        ]
+        pps = throughput(backend, paths)
+        status = "✅" if not mismatched else "❌"
+        print(f"{status} {backend}: {pps:.1f} pages/sec | sectioning mismatches: {len(mismatched)}")
+        for name in mismatched:
+            print(f"   - {name}")
+        failures += len(mismatched)
+
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
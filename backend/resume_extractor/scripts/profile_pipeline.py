@@ -0,0 +1,129 @@
+# scripts/profile_pipeline.py
+"""
+Per-stage profile of run_pipeline.extract_resume over a corpus.
+
+Every document is run once with stage timing (wall, CPU, tracemalloc peak)
+and the report gives per-stage percentiles plus each stage's share of the
+total wall time. The slowest N documents can then be re-run under cProfile;
+the .prof dumps open in snakeviz / flameprof / `python -m pstats`.
+
+  python scripts/profile_pipeline.py --corpus ../saved_resumes
+  python scripts/profile_pipeline.py --corpus ../saved_resumes --cprofile 3 --cprofile-dir prof/
+  python scripts/profile_pipeline.py --corpus ../saved_resumes --no-memory --json report.json
+
+tracemalloc slows Python-heavy stages noticeably. Use --no-memory when you
+need wall/CPU numbers you can compare across runs.
+
+LLM stages (parse_profile, categorize_skills) call whichever provider is
+configured in the environment. Unset the API keys to profile the offline path.
+"""
+import argparse
+import contextlib
+import cProfile
+import io
+import json
+import os
+import pstats
+import sys
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+# postprocessing imports resume_extractor.ai_service (package-qualified)
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+from run_pipeline import extract_resume, load_resume_paths
+from stage_profiler import StageProfiler
+
+
+def _fmt_bytes(n: float) -> str:
+    for unit in ("B", "KiB", "MiB", "GiB"):
+        if abs(n) < 1024 or unit == "GiB":
+            return f"{n:.0f}{unit}" if unit == "B" else f"{n:.1f}{unit}"
+        n /= 1024
+
+
+def print_report(report):
+    print(f"\n📊 {report['documents']} documents ({report['errors']} failed) | "
+          f"total wall p50 {report['total_wall_s']['p50'] * 1000:.1f}ms, "
+          f"p90 {report['total_wall_s']['p90'] * 1000:.1f}ms, "
+          f"max {report['total_wall_s']['max'] * 1000:.1f}ms\n")
+
+    header = (f"{'stage':<38} {'share':>6} {'wall p50':>9} {'p90':>9} {'p99':>9} "
+              f"{'cpu p50':>9} {'p90':>9} {'alloc p50':>10} {'p90':>10}")
+    print(header)
+    print("-" * len(header))
+
+    # Pipeline order; the share column shows what dominates
+    for name, s in report["stages"].items():
+        indent = "  " * name.count(".")
+        label = indent + name.rsplit(".", 1)[-1]
+        w, c, a = s["wall_s"], s["cpu_s"], s["alloc_bytes"]
+        print(f"{label:<38} {s['share'] * 100:>5.1f}% "
+              f"{w['p50'] * 1000:>7.2f}ms {w['p90'] * 1000:>7.2f}ms {w['p99'] * 1000:>7.2f}ms "
+              f"{c['p50'] * 1000:>7.2f}ms {c['p90'] * 1000:>7.2f}ms "
+              f"{_fmt_bytes(a['p50']):>10} {_fmt_bytes(a['p90']):>10}")
+
+
+def cprofile_documents(docs, paths_by_name, out_dir, top):
+    os.makedirs(out_dir, exist_ok=True)
+
+    for d in docs:
+        path = paths_by_name[d["doc"]]
+        prof = cProfile.Profile()
+        with contextlib.redirect_stdout(io.StringIO()):
+            prof.enable()
+            try:
+                extract_resume(path)
+            except Exception:
+                pass
+            finally:
+                prof.disable()
+
+        out = os.path.join(out_dir, os.path.splitext(d["doc"])[0] + ".prof")
+        prof.dump_stats(out)
+        print(f"\n🔥 {d['doc']} ({d['total']['wall_s'] * 1000:.1f}ms) → {out}")
+
+        if top:
+            buf = io.StringIO()
+            pstats.Stats(prof, stream=buf).sort_stats("cumulative").print_stats(top)
+            print(buf.getvalue())
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--corpus", default=os.path.join(os.path.dirname(__file__), "..", "..", "saved_resumes"))
+    ap.add_argument("--no-memory", action="store_true", help="skip tracemalloc (faster, no alloc column)")
+    ap.add_argument("--json", help="write the full report + per-document rows here")
+    ap.add_argument("--cprofile", type=int, default=0, metavar="N", help="cProfile the N slowest documents")
+    ap.add_argument("--cprofile-dir", default="profiles")
+    ap.add_argument("--cprofile-top", type=int, default=15, help="functions to print per dump (0 = none)")
+    args = ap.parse_args()
+
+    paths = sorted(load_resume_paths(args.corpus))
+    paths_by_name = {os.path.basename(p): p for p in paths}
+    print(f"📄 Corpus: {len(paths)} resumes")
+
+    profiler = StageProfiler(track_memory=not args.no_memory)
+    for path in paths:
+        # The pipeline prints progress; keep the report readable
+        with contextlib.redirect_stdout(io.StringIO()):
+            with profiler.document(os.path.basename(path)):
+                extract_resume(path)
+
+    report = profiler.report()
+    print_report(report)
+
+    for d in profiler.documents:
+        if d["error"]:
+            print(f"⚠️ {d['doc']}: {d['error']}")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"report": report, "documents": profiler.documents}, f, indent=2)
+        print(f"\n📁 Report saved to {args.json}")
+
+    if args.cprofile:
+        cprofile_documents(profiler.slowest(args.cprofile), paths_by_name, args.cprofile_dir, args.cprofile_top)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,315 @@
+# scripts/stub_llm_server.py
+"""
+Local stand-in for the LLM providers, so everything behind ai_service can
+run and be benchmarked offline.
+
+Speaks both wire formats ai_service uses:
+  POST /v1/chat/completions                    OpenAI / OpenRouter
+  POST /v1beta/models/<model>:generateContent  Gemini (REST transport)
+
+Replies are schema-valid for the pipeline's prompts: the combined profile
+/ skills prompt, the batched prompt (indexed JSON) and the skills-only
+prompt are recognised and answered from the prompt text itself (header
+words for the name, the skills text split into items, ...). Pass
+content=... to answer every request with a fixed string instead.
+
+Failure injection, per request:
+  latency          fixed seconds, or a distribution (see parse_latency)
+  error_rate       fraction answered with HTTP 500
+  throttle_rate    fraction answered with HTTP 429 + Retry-After
+  rate_limit_rps   requests over this rate (one second of burst) get 429
+
+It counts TCP connections, requests, 429s and 500s.
+
+  python scripts/stub_llm_server.py --port 8088 --latency lognormal:0.8,0.5 --error-rate 0.02
+  OPENAI_API_KEY=stub OPENAI_BASE_URL=http://127.0.0.1:8088/v1 python run_pipeline.py
+  GEMINI_API_KEY=stub GEMINI_BASE_URL=http://127.0.0.1:8088 python run_pipeline.py
+"""
+import argparse
+import json
+import random
+import re
+import socket
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Optional, Tuple
+
+_GEMINI_PATH_RE = re.compile(r"/models/([^/:]+):generateContent")
+_FORMAT_KEYS_RE = re.compile(r'"(\w+)":')
+_ITEM_RE = re.compile(r"^### Item (\d+)\n", re.MULTILINE)
+_SKILL_LABEL_RE = re.compile(r"^[^:\n]{1,30}:\s*", re.MULTILINE)    # "Languages: "
+_SKILL_SPLIT_RE = re.compile(r"[,;|•\n]|\band\b")
+
+
+def parse_latency(spec, rng=random) -> Callable[[], float]:
+    """
+    Latency sampler from a spec (seconds):
+      0.2 / "fixed:0.2"        always 0.2
+      "uniform:0.1,0.5"        uniform between the two
+      "lognormal:0.8,0.5"      median 0.8, sigma 0.5 (a realistic long tail)
+    """
+    if isinstance(spec, (int, float)):
+        return lambda: float(spec)
+    kind, _, params = str(spec).partition(":")
+    if not params:
+        kind, params = "fixed", kind
+    values = [float(v) for v in params.split(",")]
+    if kind == "fixed":
+        return lambda: values[0]
+    if kind == "uniform":
+        return lambda: rng.uniform(values[0], values[1])
+    if kind == "lognormal":
+        median, sigma = values
+        return lambda: median * rng.lognormvariate(0, sigma)
+    raise ValueError(f"unknown latency distribution: {kind}")
+
+
+# ---------------- HEURISTIC REPLIES ----------------
+def _block(text: str, label: str) -> str:
+    # Lines after "label:" up to the next blank line
+    m = re.search(rf"{re.escape(label)}:\n(.*?)(?:\n\s*\n|$)", text, re.DOTALL)
+    return m.group(1).strip() if m else ""
+
+
+def _skills(text: str):
+    items = []
+    for part in _SKILL_SPLIT_RE.split(_SKILL_LABEL_RE.sub("", text)):
+        part = part.strip(" .()-")
+        if part and len(part.split()) <= 4 and part.lower() not in (i.lower() for i in items):
+            items.append(part)
+    return items[:30]
+
+
+def _fields(fields, text: str):
+    header = _block(text, "Resume Header/Context")
+    first = header.splitlines()[0] if header else ""
+    words = []
+    for word in first.split():
+        if not word[:1].isalpha():
+            break
+        words.append(word.title())
+    values = {
+        "name": " ".join(words[:3]) or None,
+        "location": None,
+        "summary": f"Stub summary: {' '.join(header.split()[:25])}" if header else None,
+        "skills": _skills(_block(text, "Skills Text")),
+    }
+    return {f: values.get(f) for f in fields}
+
+
+def heuristic_reply(prompt: str) -> str:
+    if "Return ONLY a JSON array of strings" in prompt:
+        return json.dumps(_skills(_block(prompt, "Resume Text")))
+
+    items = _ITEM_RE.split(prompt)
+    if len(items) > 1:
+        # [preamble, "0", body0, "1", body1, ...]
+        reply = {}
+        for index, body in zip(items[1::2], items[2::2]):
+            m = re.search(r"^Fields: (.*)$", body, re.MULTILINE)
+            fields = [f.strip() for f in m.group(1).split(",")] if m else []
+            reply[index] = _fields(fields, body)
+        return json.dumps(reply)
+
+    fmt = prompt.split("Return ONLY valid JSON in this format:")
+    if len(fmt) == 2:
+        keys = _FORMAT_KEYS_RE.findall(fmt[1].split("\n\n")[0])
+        return json.dumps(_fields(keys, prompt))
+    return "{}"
+
+
+# ---------------- SERVER ----------------
+class StubLLMServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, addr, content: Optional[str] = None, latency_s=0.0,
+                 rate_limit_rps: float = 0.0, error_rate: float = 0.0,
+                 throttle_rate: float = 0.0, seed: Optional[int] = None):
+        super().__init__(addr, _Handler)
+        self.content = content
+        self.rng = random.Random(seed)
+        self.sample_latency = parse_latency(latency_s, random.Random(seed))
+        self.rate_limit_rps = rate_limit_rps
+        self.error_rate = error_rate
+        self.throttle_rate = throttle_rate
+        self.connections = 0
+        self.requests = 0
+        self.rejected = 0
+        self.errors = 0
+        self._count_lock = threading.Lock()
+        self._tokens = rate_limit_rps
+        self._refilled = time.monotonic()
+
+    def take_token(self) -> bool:
+        if not self.rate_limit_rps:
+            return True
+        with self._count_lock:
+            now = time.monotonic()
+            self._tokens = min(self.rate_limit_rps,
+                               self._tokens + (now - self._refilled) * self.rate_limit_rps)
+            self._refilled = now
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return True
+            return False
+
+    def fault(self) -> Optional[int]:
+        """
+        HTTP status to fail this request with, or None to answer it.
+        """
+        with self._count_lock:
+            self.requests += 1
+            roll = self.rng.random()
+        status = None
+        if not self.take_token() or roll < self.throttle_rate:
+            status = 429
+        elif roll < self.throttle_rate + self.error_rate:
+            status = 500
+        if status is not None:
+            with self._count_lock:
+                if status == 429:
+                    self.rejected += 1
+                else:
+                    self.errors += 1
+        return status
+
+    def reply(self, prompt: str) -> str:
+        return self.content if self.content is not None else heuristic_reply(prompt)
+
+    def process_request(self, request, client_address):
+        with self._count_lock:
+            self.connections += 1
+        super().process_request(request, client_address)
+
+    @property
+    def root_url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def base_url(self) -> str:
+        # OPENAI_BASE_URL / OPENROUTER_BASE_URL
+        return f"{self.root_url}/v1"
+
+    @property
+    def gemini_url(self) -> str:
+        # GEMINI_BASE_URL
+        return self.root_url
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"   # keep-alive
+
+    def setup(self):
+        super().setup()
+        # Headers and body go out as separate writes; without this, Nagle +
+        # delayed ACK add ~40ms to every keep-alive response
+        self.request.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+    def log_message(self, *args):
+        pass
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        body = json.loads(self.rfile.read(length) or b"{}")
+        path = self.path.split("?")[0]
+        gemini = _GEMINI_PATH_RE.search(path)
+
+        status = self.server.fault()
+        if status == 429:
+            message = "Rate limit exceeded"
+            self._send(429, self._error(429, message, "RESOURCE_EXHAUSTED", gemini),
+                       {"Retry-After": "1"})
+            return
+
+        time.sleep(max(0.0, self.server.sample_latency()))
+        if status == 500:
+            self._send(500, self._error(500, "Injected server error", "INTERNAL", gemini))
+            return
+
+        if gemini:
+            prompt = "\n".join(
+                part.get("text", "")
+                for content in body.get("contents", [])
+                for part in content.get("parts", [])
+            )
+            self._send(200, {
+                "candidates": [{
+                    "content": {"parts": [{"text": self.server.reply(prompt)}], "role": "model"},
+                    "finishReason": "STOP",
+                    "index": 0,
+                }],
+                "usageMetadata": {"promptTokenCount": 0, "candidatesTokenCount": 0, "totalTokenCount": 0},
+                "modelVersion": gemini.group(1),
+            })
+            return
+
+        messages = body.get("messages", [])
+        prompt = next((m.get("content", "") for m in reversed(messages) if m.get("role") == "user"), "")
+        self._send(200, {
+            "id": "chatcmpl-stub",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": body.get("model", "stub"),
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": self.server.reply(prompt)},
+                "finish_reason": "stop",
+            }],
+            "usage": {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0},
+        })
+
+    @staticmethod
+    def _error(code: int, message: str, status: str, gemini):
+        if gemini:
+            return {"error": {"code": code, "message": message, "status": status}}
+        return {"error": {"message": message, "type": status.lower()}}
+
+    def _send(self, status: int, body, headers=None):
+        payload = json.dumps(body).encode("utf-8")
+        try:
+            self.send_response(status)
+            for name, value in (headers or {}).items():
+                self.send_header(name, value)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+        except (BrokenPipeError, ConnectionResetError):
+            # Client gave up (deadline) before the injected latency elapsed
+            self.close_connection = True
+
+
+def start_stub_server(port: int = 0, **kwargs) -> Tuple[StubLLMServer, threading.Thread]:
+    """
+    Serve in a daemon thread; port 0 picks a free port (see server.base_url).
+    """
+    server = StubLLMServer(("127.0.0.1", port), **kwargs)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server, thread
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--port", type=int, default=8088)
+    ap.add_argument("--latency", default="0", help='seconds, or "uniform:a,b" / "lognormal:median,sigma"')
+    ap.add_argument("--error-rate", type=float, default=0.0)
+    ap.add_argument("--throttle-rate", type=float, default=0.0)
+    ap.add_argument("--rate-limit-rps", type=float, default=0.0)
+    ap.add_argument("--content", default=None, help="fixed reply instead of heuristic ones")
+    args = ap.parse_args()
+
+    server = StubLLMServer(("127.0.0.1", args.port), content=args.content,
+                           latency_s=args.latency, error_rate=args.error_rate,
+                           throttle_rate=args.throttle_rate, rate_limit_rps=args.rate_limit_rps)
+    print(f"🧪 Stub LLM server: OpenAI {server.base_url} | Gemini {server.gemini_url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+# sectioning/header_classifier.py
+"""
+Compiled section-header classifier.
+
+A keyword table {section: [keyword, ...]} is compiled once into a single
+regex. Every section gets its own zero-width lookahead group at each
+candidate position, so one scan reports all sections present in a line,
+including overlapping keywords ("academic projects" → education AND
+projects), exactly as a separate \\bkw\\b search per keyword would.
+
+Build new tables with HeaderClassifier(...) or .extended(...) at import /
+config time; nothing is compiled per call.
+"""
+import re
+from typing import Dict, Iterable, List, Optional, Tuple
+
+
+class HeaderClassifier:
+    def __init__(self, keywords: Dict[str, Iterable[str]],
+                 priority: Optional[List[str]] = None, flags: int = re.IGNORECASE):
+        self.keywords = {sec: list(kws) for sec, kws in keywords.items()}
+        # Sections outside the priority list are never reported
+        self.priority = list(priority) if priority is not None else list(self.keywords)
+        self.flags = flags
+
+        self._groups = {}
+        lookaheads = []
+        for i, (section, kws) in enumerate(self.keywords.items()):
+            if not kws:
+                continue
+            group = f"s{i}"
+            self._groups[group] = section
+            lookaheads.append(rf"(?:(?=(?P<{group}>{self._alternation(kws)})\b)|)")
+
+        # Gate on "some keyword starts here" so search() only stops at hits;
+        # the first-character class lets it skip other positions cheaply
+        all_kws = [kw for kws in self.keywords.values() for kw in kws]
+        # Lowercased keywords for the substring pre-check in _spans
+        # (ASCII tables only: that's where lower() and IGNORECASE agree)
+        ascii_table = all(kw.isascii() for kw in all_kws)
+        self._needles = tuple(sorted({kw.lower() for kw in all_kws})) if ascii_table else None
+        if all_kws:
+            first_chars = "".join(sorted({re.escape(kw[0]) for kw in all_kws}))
+            self._scan = re.compile(
+                rf"(?=[{first_chars}])\b(?=(?:{self._alternation(all_kws)})\b)" + "".join(lookaheads),
+                flags,
+            )
+            self._prefix = re.compile(self._alternation(all_kws), flags)
+        else:
+            self._scan = self._prefix = None
+
+    @staticmethod
+    def _alternation(kws: Iterable[str]) -> str:
+        # Keeps the table's own order: earlier keywords win at a position
+        return "|".join(re.escape(kw) for kw in kws)
+
+    def extended(self, extra: Dict[str, Iterable[str]]) -> "HeaderClassifier":
+        """
+        New classifier with extra keywords appended (new sections allowed).
+        """
+        merged = {sec: list(kws) for sec, kws in self.keywords.items()}
+        for sec, kws in extra.items():
+            merged.setdefault(sec, []).extend(kw for kw in kws if kw not in merged[sec])
+
+        priority = self.priority + [sec for sec in extra if sec not in self.priority]
+        return HeaderClassifier(merged, priority, self.flags)
+
+    def _spans(self, text: str) -> Dict[str, Tuple[int, int]]:
+        # section → span of its first (leftmost) keyword match
+        if self._scan is None:
+            return {}
+
+        # Most lines contain no keyword at all. For ASCII text, lower() folds
+        # exactly like IGNORECASE, so a missing substring rules out a match.
+        if self._needles is not None and text.isascii():
+            low = text.lower()
+            for needle in self._needles:
+                if needle in low:
+                    break
+            else:
+                return {}
+
+        m = self._scan.search(text)
+        if m is None:
+            return {}
+
+        found = {}
+        groups = self._groups
+        while m is not None:
+            for group, value in m.groupdict().items():
+                if value is not None:
+                    section = groups[group]
+                    if section not in found:
+                        found[section] = m.span(group)
+            if len(found) == len(groups):
+                break
+            m = self._scan.search(text, m.start() + 1)
+        return found
+
+    def sections(self, text: str) -> List[str]:
+        """
+        All sections with a whole-word keyword in text, in priority order.
+        """
+        found = self._spans(text)
+        return [sec for sec in self.priority if sec in found]
+
+    def first(self, text: str) -> Optional[Tuple[str, int, int]]:
+        """
+        Highest-priority section in text with the (start, end) of its first
+        keyword match, or None.
+        """
+        found = self._spans(text)
+        for sec in self.priority:
+            if sec in found:
+                return (sec, *found[sec])
+        return None
+
+    def starts_with_keyword(self, text: str) -> bool:
+        """
+        True if text begins with any keyword (no trailing word boundary).
+        """
+        return self._prefix is not None and self._prefix.match(text) is not None
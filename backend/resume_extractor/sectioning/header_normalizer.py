@@ -1,6 +1,8 @@
 # sectioning/header_normalizer.py
 import re
 
+from sectioning.header_classifier import HeaderClassifier
+
 SECTION_PRIORITY = [
     "experience",
     "projects",
@@ -63,6 +65,13 @@ SECTION_KEYWORDS = {
     ],
 }
 
+# Compiled once; use SECTION_CLASSIFIER.extended({...}) to add keywords
+SECTION_CLASSIFIER = HeaderClassifier(SECTION_KEYWORDS, SECTION_PRIORITY)
+
+_SEPARATOR_RE = re.compile(r"[|/&]")
+_NON_ALPHA_RE = re.compile(r"[^a-z\s]")
+_SPACES_RE = re.compile(r"\s+")
+
 
 def normalize_and_split_header(text: str):
     """
@@ -74,25 +83,12 @@ def normalize_and_split_header(text: str):
         "RELEVANT EXPERIENCE" -> ["experience"]
     """
     t = text.lower()
-    t = re.sub(r"[|/&]", " ", t)
-    t = re.sub(r"[^a-z\s]", " ", t)
-    t = re.sub(r"\s+", " ", t).strip()
-
-    detected = []
-
-    for section, keywords in SECTION_KEYWORDS.items():
-        for kw in keywords:
-            if re.search(rf"\b{re.escape(kw)}\b", t):
-                detected.append(section)
-                break
-
-    # Apply deterministic ordering
-    ordered = []
-    for sec in SECTION_PRIORITY:
-        if sec in detected:
-            ordered.append(sec)
+    t = _SEPARATOR_RE.sub(" ", t)
+    t = _NON_ALPHA_RE.sub(" ", t)
+    t = _SPACES_RE.sub(" ", t).strip()
 
-    return ordered
+    # Deterministic SECTION_PRIORITY ordering
+    return SECTION_CLASSIFIER.sections(t)
 
 
 def looks_like_header(line: dict) -> bool:
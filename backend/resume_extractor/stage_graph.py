@@ -0,0 +1,85 @@
+# stage_graph.py
+"""
+Tiny dependency-graph runner for pipeline stages.
+
+Each node is a function of its dependencies' results. A node is
+submitted as soon as everything it depends on has finished, so
+independent branches (an LLM round-trip and local embedding, say) run at
+the same time. Latency becomes the longest path through the graph instead
+of the sum of all stages.
+
+    graph = StageGraph()
+    graph.add("base", build_base, deps=("structured",))
+    graph.add("ai", call_llm, deps=("structured",))
+    graph.add("final", merge, deps=("base", "ai"))
+    results = graph.run({"structured": structured})
+
+Each run() gets its own thread pool, one thread per node, which suits
+I/O waits and GIL-releasing work such as torch inference. Pools are not
+shared between requests, so a node blocked on the LLM for one upload
+never holds back another upload's nodes. The first node that raises cancels
+whatever has not started, and run() re-raises that exception.
+
+stage() markers inside nodes are not profiled: StageProfiler follows a
+single call stack.
+"""
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
+
+class StageGraph:
+    def __init__(self):
+        self._nodes: Dict[str, Tuple[Callable[..., Any], Tuple[str, ...]]] = {}
+
+    def add(self, name: str, fn: Callable[..., Any], deps: Iterable[str] = ()) -> "StageGraph":
+        """
+        fn is called with the dependencies' results, in deps order.
+        """
+        if name in self._nodes:
+            raise ValueError(f"duplicate stage: {name}")
+        self._nodes[name] = (fn, tuple(deps))
+        return self
+
+    def run(self, inputs: Optional[Dict[str, Any]] = None,
+            executor: Optional[ThreadPoolExecutor] = None) -> Dict[str, Any]:
+        """
+        inputs: results that are already known (graph roots).
+        executor: pool to run nodes on; by default a private one is created
+        for this call and shut down when it returns.
+        Returns every node's result by name, inputs included.
+        """
+        results = dict(inputs or {})
+        pending = {n: spec for n, spec in self._nodes.items() if n not in results}
+
+        for name, (_, deps) in pending.items():
+            missing = [d for d in deps if d not in pending and d not in results]
+            if missing:
+                raise ValueError(f"stage {name!r} depends on unknown stage(s): {missing}")
+
+        owned = None
+        if executor is None and pending:
+            executor = owned = ThreadPoolExecutor(
+                max_workers=len(pending), thread_name_prefix="stage-graph"
+            )
+        running: Dict[Future, str] = {}
+
+        try:
+            while pending or running:
+                for name in [n for n, (_, deps) in pending.items() if all(d in results for d in deps)]:
+                    fn, deps = pending.pop(name)
+                    running[executor.submit(fn, *(results[d] for d in deps))] = name
+
+                if not running:
+                    raise ValueError(f"dependency cycle between stages: {sorted(pending)}")
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    results[running.pop(future)] = future.result()
+        finally:
+            for future in running:
+                future.cancel()
+            if owned is not None:
+                # Nodes still running after a failure finish in the
+                # background; their results are dropped
+                owned.shutdown(wait=False)
+
+        return results
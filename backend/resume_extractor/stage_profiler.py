@@ -0,0 +1,183 @@
+# stage_profiler.py
+"""
+Opt-in per-stage profiling for the extraction pipeline.
+
+Pipeline code marks its stages with `with stage("name"):`. That is a
+no-op (a shared nullcontext) unless a StageProfiler document is active,
+so production requests pay nothing. scripts/profile_pipeline.py drives
+this over a corpus and prints the per-stage breakdown.
+
+Per stage and document we record:
+  wall_s       perf_counter delta
+  cpu_s        process_time delta (this process only: LLM HTTP waits show
+               up as wall time, not CPU)
+  alloc_bytes  tracemalloc peak above the stage's starting point, i.e. the
+               most extra memory the stage held at once (0 when memory
+               tracking is off)
+
+Stages may nest ("build_final_resume" contains "parse_profile"); nested
+stages are reported under a dotted name and their parent stays inclusive.
+"""
+import contextlib
+import math
+import time
+import tracemalloc
+from contextvars import ContextVar
+from typing import Any, Dict, List, Optional
+
+_active: ContextVar[Optional["StageProfiler"]] = ContextVar("stage_profiler", default=None)
+_NULL = contextlib.nullcontext()
+
+
+def stage(name: str):
+    """
+    Context manager marking a pipeline stage (no-op when not profiling).
+    """
+    prof = _active.get()
+    if prof is None:
+        return _NULL
+    return prof._stage(name)
+
+
+def percentile(values: List[float], q: float) -> float:
+    """
+    Nearest-rank percentile, q in [0, 100].
+    """
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, math.ceil(q / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+class StageProfiler:
+    def __init__(self, track_memory: bool = True):
+        self.track_memory = track_memory
+        self.documents: List[Dict[str, Any]] = []
+        self._stack: List[Dict[str, Any]] = []
+        self._current: Optional[Dict[str, Any]] = None
+
+    # ---------------- MEMORY ----------------
+    def _mem_now(self) -> int:
+        return tracemalloc.get_traced_memory()[0] if self.track_memory else 0
+
+    def _mem_checkpoint(self) -> None:
+        # Fold the peak since the last checkpoint into every open frame,
+        # then restart peak tracking (a nested reset would otherwise hide
+        # the parent's peak)
+        if not self.track_memory:
+            return
+        peak = tracemalloc.get_traced_memory()[1]
+        for frame in self._stack:
+            frame["peak"] = max(frame["peak"], peak)
+        tracemalloc.reset_peak()
+
+    # ---------------- SCOPES ----------------
+    def _open(self, name: str) -> Dict[str, Any]:
+        self._mem_checkpoint()
+        mem = self._mem_now()
+        frame = {
+            "name": name,
+            "wall": time.perf_counter(),
+            "cpu": time.process_time(),
+            "mem": mem,
+            "peak": mem,
+        }
+        self._stack.append(frame)
+        return frame
+
+    def _close(self, frame: Dict[str, Any]) -> Dict[str, float]:
+        self._mem_checkpoint()
+        self._stack.pop()
+        return {
+            "wall_s": time.perf_counter() - frame["wall"],
+            "cpu_s": time.process_time() - frame["cpu"],
+            "alloc_bytes": max(0, frame["peak"] - frame["mem"]),
+        }
+
+    @contextlib.contextmanager
+    def document(self, name: str):
+        """
+        Profile everything inside as one document.
+        """
+        if self.track_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+        doc = {"doc": name, "stages": {}, "total": None, "error": None}
+        self._current = doc
+        token = _active.set(self)
+        frame = self._open(name)
+        try:
+            yield doc
+        except Exception as e:
+            doc["error"] = f"{type(e).__name__}: {e}"
+        finally:
+            doc["total"] = self._close(frame)
+            _active.reset(token)
+            self._current = None
+            self.documents.append(doc)
+
+    @contextlib.contextmanager
+    def _stage(self, name: str):
+        # Dotted path under the enclosing stages (the document frame is [0])
+        path = ".".join([f["name"] for f in self._stack[1:]] + [name])
+        stages = self._current["stages"]
+        stages.setdefault(path, None)   # entry order = pipeline order, parents first
+
+        frame = self._open(name)
+        try:
+            yield
+        finally:
+            result = self._close(frame)
+            prev = stages[path]
+            if prev is not None:
+                # Same stage entered again within one document: accumulate
+                result = {
+                    "wall_s": prev["wall_s"] + result["wall_s"],
+                    "cpu_s": prev["cpu_s"] + result["cpu_s"],
+                    "alloc_bytes": max(prev["alloc_bytes"], result["alloc_bytes"]),
+                }
+            stages[path] = result
+
+    # ---------------- REPORT ----------------
+    def report(self) -> Dict[str, Any]:
+        """
+        {"documents", "stages": {name: {metric: {p50, p90, p99, max, mean}}, "share"}}
+        share = stage wall time as a fraction of all documents' wall time.
+        """
+        total_wall = sum(d["total"]["wall_s"] for d in self.documents) or 1.0
+        names: List[str] = []
+        for d in self.documents:
+            names.extend(n for n in d["stages"] if n not in names)
+
+        stages = {}
+        for name in names:
+            rows = [d["stages"][name] for d in self.documents if name in d["stages"]]
+            entry = {"count": len(rows)}
+            for metric in ("wall_s", "cpu_s", "alloc_bytes"):
+                values = [r[metric] for r in rows]
+                entry[metric] = {
+                    "p50": percentile(values, 50),
+                    "p90": percentile(values, 90),
+                    "p99": percentile(values, 99),
+                    "max": max(values),
+                    "mean": sum(values) / len(values),
+                }
+            entry["share"] = sum(r["wall_s"] for r in rows) / total_wall
+            stages[name] = entry
+
+        totals = [d["total"]["wall_s"] for d in self.documents]
+        return {
+            "documents": len(self.documents),
+            "errors": sum(1 for d in self.documents if d["error"]),
+            "total_wall_s": {
+                "p50": percentile(totals, 50),
+                "p90": percentile(totals, 90),
+                "p99": percentile(totals, 99),
+                "max": max(totals) if totals else 0.0,
+            },
+            "stages": stages,
+        }
+
+    def slowest(self, n: int) -> List[Dict[str, Any]]:
+        return sorted(self.documents, key=lambda d: d["total"]["wall_s"], reverse=True)[:n]